@@ -19,7 +19,6 @@ import asyncpg
 import discord
 import humanize
 import msgspec
-from async_lru import alru_cache
 from discord import app_commands
 from discord.ext import commands, menus
 from utils.checks import (
@@ -29,9 +28,26 @@ from utils.checks import (
 )
 from utils.config import OptionsHelp
 from utils.embeds import CooldownEmbed, Embed
+from utils.notify import BlocklistChanged, GuildConfigChanged
 from utils.pages import SimplePages
 from utils.pages.paginator import RoboPages
-from utils.prefix import get_prefix
+from utils.queries import (
+    ADD_PREFIX,
+    BLOCK_ENTITY,
+    CREATE_GUILD_CONFIG,
+    DELETE_GUILD_CONFIG,
+    GET_ALL_GUILD_CONFIGS,
+    GET_BLOCKLIST,
+    GET_GUILD_CONFIG,
+    REMOVE_PREFIX,
+    REPLACE_PREFIX,
+    SET_ACCOUNT_AGE,
+    SET_GUILD_AGE,
+    UNBLOCK_ENTITY,
+    UPDATE_GUILD_SETTINGS,
+    count_rows,
+)
+from utils.rows import RowDecoder
 from utils.time import FriendlyTimeResult, UserFriendlyTime
 
 from cogs.tickets import get_cached_thread
@@ -56,6 +72,11 @@ class ConfigType(Enum):
     SET = 1
 
 
+class WebhookPurpose(Enum):
+    TICKET = 0
+    LOGGING = 1
+
+
 ### Structs
 
 
@@ -73,42 +94,15 @@ class ConfigHelpEntry(msgspec.Struct, frozen=True):
 
 
 class BlocklistEntity(msgspec.Struct, frozen=True):
-    bot: Rodhaj
     guild_id: int
     entity_id: int
 
-    def format(self) -> str:
-        user = self.bot.get_user(self.entity_id)
+    def format(self, bot: Rodhaj) -> str:
+        user = bot.get_user(self.entity_id)
         name = user.global_name if user else "Unknown"
         return f"{name} (ID: {self.entity_id})"
 
 
-# Msgspec Structs are usually extremely fast compared to slotted classes
-class GuildConfig(msgspec.Struct):
-    bot: Rodhaj
-    id: int
-    category_id: int
-    ticket_channel_id: int
-    logging_channel_id: int
-    logging_broadcast_url: str
-    ticket_broadcast_url: str
-
-    @property
-    def category_channel(self) -> Optional[discord.CategoryChannel]:
-        guild = self.bot.get_guild(self.id)
-        return guild and guild.get_channel(self.category_id)  # type: ignore
-
-    @property
-    def logging_channel(self) -> Optional[discord.TextChannel]:
-        guild = self.bot.get_guild(self.id)
-        return guild and guild.get_channel(self.logging_channel_id)  # type: ignore
-
-    @property
-    def ticket_channel(self) -> Optional[discord.ForumChannel]:
-        guild = self.bot.get_guild(self.id)
-        return guild and guild.get_channel(self.ticket_channel_id)  # type: ignore
-
-
 class GuildSettings(msgspec.Struct, frozen=True):
     account_age: datetime.timedelta = datetime.timedelta(hours=2)
     guild_age: datetime.timedelta = datetime.timedelta(days=2)
@@ -131,29 +125,44 @@ class PartialGuildSettings(msgspec.Struct, frozen=True):
         return {f: getattr(self, f) for f in self.__struct_fields__}
 
 
-class GuildWebhook(msgspec.Struct, frozen=True):
-    bot: Rodhaj
+# Msgspec Structs are usually extremely fast compared to slotted classes.
+# Fields are in the same order as the columns of guild_config,
+# so rows can be decoded positionally
+class GuildConfig(msgspec.Struct, frozen=True):
     id: int
     category_id: int
     ticket_channel_id: int
     logging_channel_id: int
     logging_broadcast_url: str
     ticket_broadcast_url: str
+    prefix: Optional[list[str]] = None
+    account_age: datetime.timedelta = datetime.timedelta(hours=2)
+    guild_age: datetime.timedelta = datetime.timedelta(days=2)
+    settings: PartialGuildSettings = msgspec.field(default_factory=PartialGuildSettings)
 
-    @property
-    def category_channel(self) -> Optional[discord.CategoryChannel]:
-        guild = self.bot.get_guild(self.id)
-        return guild and guild.get_channel(self.category_id)  # type: ignore
+    def category_channel(
+        self, guild: discord.Guild
+    ) -> Optional[discord.CategoryChannel]:
+        return guild.get_channel(self.category_id)  # type: ignore
 
-    @property
-    def logging_channel(self) -> Optional[discord.TextChannel]:
-        guild = self.bot.get_guild(self.id)
-        return guild and guild.get_channel(self.logging_channel_id)  # type: ignore
+    def logging_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        return guild.get_channel(self.logging_channel_id)  # type: ignore
+
+    def ticket_channel(self, guild: discord.Guild) -> Optional[discord.ForumChannel]:
+        return guild.get_channel(self.ticket_channel_id)  # type: ignore
 
     @property
-    def ticket_channel(self) -> Optional[discord.ForumChannel]:
-        guild = self.bot.get_guild(self.id)
-        return guild and guild.get_channel(self.ticket_channel_id)  # type: ignore
+    def guild_settings(self) -> GuildSettings:
+        return GuildSettings(
+            account_age=self.account_age,
+            guild_age=self.guild_age,
+            **msgspec.structs.asdict(self.settings),
+        )
+
+
+BLOCKLIST_ROWS = RowDecoder(BlocklistEntity)
+GUILD_CONFIG_ROWS = RowDecoder(GuildConfig)
+SETTINGS_DECODER = msgspec.json.Decoder(PartialGuildSettings)
 
 
 ### Core classes
@@ -165,20 +174,17 @@ class Blocklist:
         self._blocklist: dict[int, BlocklistEntity] = {}
 
     async def _load(self, connection: Union[asyncpg.Connection, asyncpg.Pool]):
-        query = """
-        SELECT guild_id, entity_id
-        FROM blocklist;
-        """
-        rows = await connection.fetch(query)
-        return {
-            row["entity_id"]: BlocklistEntity(bot=self.bot, **dict(row)) for row in rows
-        }
+        rows = await GET_BLOCKLIST.fetch(connection)
+        return {entity.entity_id: entity for entity in BLOCKLIST_ROWS.decode_all(rows)}
 
     async def load(self, connection: Optional[asyncpg.Connection] = None):
+        # Emptying the blocklist would unblock everyone, so the previous
+        # entries are kept and the error is raised instead
         try:
             self._blocklist = await self._load(connection or self.bot.pool)
         except Exception:
-            self._blocklist = {}
+            self.bot.logger.exception("Failed to load the blocklist")
+            raise
 
     @overload
     def get(self, key: int) -> Optional[BlocklistEntity]: ...
@@ -204,43 +210,201 @@ class Blocklist:
     def replace(self, blocklist: dict[int, BlocklistEntity]) -> None:
         self._blocklist = blocklist
 
+    def add(self, guild_id: int, entity_id: int) -> BlocklistEntity:
+        entity = BlocklistEntity(guild_id=guild_id, entity_id=entity_id)
+        self._blocklist[entity_id] = entity
+        return entity
+
+    def remove(self, entity_id: int) -> Optional[BlocklistEntity]:
+        return self._blocklist.pop(entity_id, None)
 
-class GuildWebhookDispatcher:
-    def __init__(self, bot: Rodhaj, guild_id: int):
+
+class GuildConfigStore:
+    """Single source of truth for the config of each guild
+
+    Every guild's full `guild_config` row is loaded once, and all views
+    of it (channels, webhooks, prefixes and settings) are served from memory.
+    Writes replace the guild's entry as a whole, and drop anything that
+    was derived from the previous entry.
+    """
+
+    def __init__(self, bot: Rodhaj):
         self.bot = bot
-        self.guild_id = guild_id
-        self.session = self.bot.session
-        self.pool = self.bot.pool
+        self._configs: dict[int, GuildConfig] = {}
 
-    async def get_webhook(self) -> Optional[discord.Webhook]:
-        conf = await self.get_config()
-        if conf is None:
-            return None
-        return discord.Webhook.from_url(
-            url=conf.logging_broadcast_url, session=self.session
+    async def _load(
+        self, connection: Union[asyncpg.Connection, asyncpg.Pool]
+    ) -> dict[int, GuildConfig]:
+        rows = await GET_ALL_GUILD_CONFIGS.fetch(connection)
+        return {config.id: config for config in GUILD_CONFIG_ROWS.decode_all(rows)}
+
+    async def load(self, connection: Optional[asyncpg.Connection] = None) -> None:
+        # Nothing falls back to the database, so the previous configs are kept
+        # and the error is raised instead of acting as if no guild is set up
+        try:
+            configs = await self._load(connection or self.bot.pool)
+        except Exception:
+            self.bot.logger.exception("Failed to load guild configs")
+            raise
+
+        for guild_id in self._configs.keys() | configs.keys():
+            self._invalidate(guild_id)
+        self._configs = configs
+
+    def _invalidate(self, guild_id: int) -> None:
+        self.bot.webhooks.invalidate(guild_id)
+        self.bot.prefixes.invalidate(guild_id)
+
+    def _replace(self, guild_id: int, config: Optional[GuildConfig]) -> None:
+        if config is None:
+            self._configs.pop(guild_id, None)
+        else:
+            self._configs[guild_id] = config
+        self._invalidate(guild_id)
+
+    def get(self, guild_id: int) -> Optional[GuildConfig]:
+        return self._configs.get(guild_id)
+
+    def get_settings(self, guild_id: int) -> Optional[GuildSettings]:
+        config = self._configs.get(guild_id)
+        return config and config.guild_settings
+
+    def get_partial_settings(self, guild_id: int) -> Optional[PartialGuildSettings]:
+        config = self._configs.get(guild_id)
+        return config and config.settings
+
+    def get_prefixes(self, guild_id: int) -> list[str]:
+        config = self._configs.get(guild_id)
+        if config is None or config.prefix is None:
+            return []
+        return config.prefix
+
+    async def refresh(
+        self, guild_id: int, connection: Optional[asyncpg.Connection] = None
+    ) -> Optional[GuildConfig]:
+        """Reloads the config of an guild from the database
+
+        Args:
+            guild_id (int): ID of the guild
+            connection (Optional[asyncpg.Connection]): Connection to use. Defaults to the pool
+
+        Returns:
+            Optional[GuildConfig]: The reloaded config, or `None` if the guild has no config
+        """
+        row = await GET_GUILD_CONFIG.fetchrow(connection or self.bot.pool, guild_id)
+        config = GUILD_CONFIG_ROWS.decode(row) if row is not None else None
+        self._replace(guild_id, config)
+        return config
+
+    async def update_settings(
+        self,
+        guild_id: int,
+        changes: dict[str, Any],
+        connection: Optional[asyncpg.Connection] = None,
+    ) -> Optional[PartialGuildSettings]:
+        """Atomically changes one or more settings of an guild
+
+        The changes are merged into the stored settings by the database, and the
+        merged settings are returned by the same statement.
+
+        Args:
+            guild_id (int): ID of the guild
+            changes (dict[str, Any]): The settings to change, along with their new values
+            connection (Optional[asyncpg.Connection]): Connection to use. Defaults to the pool
+
+        Raises:
+            ValueError: One of the keys is not an valid setting
+
+        Returns:
+            Optional[PartialGuildSettings]: The updated settings, or `None` if the guild has no config
+        """
+        unknown = changes.keys() - set(PartialGuildSettings.__struct_fields__)
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+
+        raw = await UPDATE_GUILD_SETTINGS.fetchval(
+            connection or self.bot.pool, guild_id, changes
         )
+        if raw is None:
+            return None
+
+        settings = SETTINGS_DECODER.decode(raw)
+        self.update(guild_id, settings=settings)
+        return settings
+
+    def update(self, guild_id: int, **changes: Any) -> Optional[GuildConfig]:
+        """Applies changes that were written to the database
+
+        Args:
+            guild_id (int): ID of the guild
+            **changes (Any): The columns that were changed, along with their new values
+
+        Returns:
+            Optional[GuildConfig]: The updated config, or `None` if the guild has no config
+        """
+        config = self._configs.get(guild_id)
+        if config is None:
+            return None
+
+        config = msgspec.structs.replace(config, **changes)
+        self._replace(guild_id, config)
+        return config
+
+    def remove(self, guild_id: int) -> None:
+        self._replace(guild_id, None)
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._configs
 
-    async def get_ticket_webhook(self) -> Optional[discord.Webhook]:
-        conf = await self.get_config()
+    def __len__(self) -> int:
+        return len(self._configs)
+
+
+class WebhookRegistry:
+    """Long-lived registry of the webhooks used by each guild
+
+    Ready-made `discord.Webhook` objects are kept per guild and purpose,
+    so relaying messages does not require rebuilding webhooks. Entries are
+    built from the `GuildConfigStore`, and are dropped whenever the guild's
+    config changes.
+    """
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self._webhooks: dict[tuple[int, WebhookPurpose], discord.Webhook] = {}
+
+    async def get(
+        self, guild_id: int, purpose: WebhookPurpose
+    ) -> Optional[discord.Webhook]:
+        webhook = self._webhooks.get((guild_id, purpose))
+        if webhook is not None:
+            return webhook
+
+        conf = self.bot.guild_configs.get(guild_id)
         if conf is None:
             return None
-        return discord.Webhook.from_url(
-            url=conf.ticket_broadcast_url, session=self.session
-        )
 
-    @alru_cache()
-    async def get_config(self) -> Optional[GuildWebhook]:
-        query = """
-        SELECT id, category_id, ticket_channel_id, logging_channel_id, logging_broadcast_url, ticket_broadcast_url
-        FROM guild_config
-        WHERE id = $1;
-        """
-        rows = await self.pool.fetchrow(query, self.guild_id)
-        if rows is None:
-            self.get_config.cache_invalidate()
+        url = (
+            conf.ticket_broadcast_url
+            if purpose is WebhookPurpose.TICKET
+            else conf.logging_broadcast_url
+        )
+        if url is None:
             return None
 
-        return GuildWebhook(bot=self.bot, **dict(rows))
+        webhook = discord.Webhook.from_url(url=url, session=self.bot.session)
+        self._webhooks[(guild_id, purpose)] = webhook
+        return webhook
+
+    async def get_webhook(self, guild_id: int) -> Optional[discord.Webhook]:
+        return await self.get(guild_id, WebhookPurpose.LOGGING)
+
+    async def get_ticket_webhook(self, guild_id: int) -> Optional[discord.Webhook]:
+        return await self.get(guild_id, WebhookPurpose.TICKET)
+
+    def invalidate(self, guild_id: int) -> None:
+        for purpose in WebhookPurpose:
+            self._webhooks.pop((guild_id, purpose), None)
 
 
 ### Embeds
@@ -265,7 +429,7 @@ class ConfigEntryEmbed(Embed):
 
 class BlocklistPages(SimplePages):
     def __init__(self, entries: list[BlocklistEntity], *, ctx: GuildContext):
-        converted = [entry.format() for entry in entries]
+        converted = [entry.format(ctx.bot) for entry in entries]
         super().__init__(converted, ctx=ctx)
 
 
@@ -418,48 +582,6 @@ class Config(commands.Cog):
 
     ### Configuration utilities
 
-    @alru_cache()
-    async def get_guild_config(self, guild_id: int) -> Optional[GuildConfig]:
-        query = """
-        SELECT id, category_id, ticket_channel_id, logging_channel_id, logging_broadcast_url, ticket_broadcast_url, prefix
-        FROM guild_config
-        WHERE id = $1;
-        """
-        rows = await self.pool.fetchrow(query, guild_id)
-        if rows is None:
-            self.get_guild_config.cache_invalidate(guild_id)
-            return None
-        config = GuildConfig(bot=self.bot, **dict(rows))
-        return config
-
-    @alru_cache()
-    async def get_guild_settings(self, guild_id: int) -> Optional[GuildSettings]:
-        query = (
-            "SELECT account_age, guild_age, settings FROM guild_config WHERE id = $1;"
-        )
-        rows = await self.pool.fetchrow(query, guild_id)
-        if rows is None:
-            self.get_guild_settings.cache_invalidate(guild_id)
-            return None
-        return GuildSettings(
-            account_age=rows["account_age"],
-            guild_age=rows["guild_age"],
-            **rows["settings"],
-        )
-
-    @alru_cache()
-    async def get_partial_guild_settings(
-        self, guild_id: int
-    ) -> Optional[PartialGuildSettings]:
-        query = "SELECT settings FROM guild_config WHERE id = $1;"
-        rows = await self.pool.fetchrow(query, guild_id)
-        if rows is None:
-            self.get_partial_guild_settings.cache_invalidate(guild_id)
-            return None
-        return PartialGuildSettings(
-            **rows["settings"],
-        )
-
     async def set_guild_settings(
         self,
         key: str,
@@ -468,30 +590,23 @@ class Config(commands.Cog):
         config_type: ConfigType,
         ctx: GuildContext,
     ):
-        current_guild_settings = await self.get_partial_guild_settings(ctx.guild.id)
+        current_guild_settings = self.bot.guild_configs.get_partial_settings(
+            ctx.guild.id
+        )
 
         # If there are no guild configurations, then we have an issue here
         # we will denote this with an error
         if not current_guild_settings:
             raise RuntimeError("Guild settings could not be found")
 
-        # There is technically an faster method
-        # of directly modifying the subscripted path...
-        # But for the reason of autonomic guarantees, the whole entire dict should be modified
-        query = """
-        UPDATE guild_config
-        SET settings = $2::jsonb
-        WHERE id = $1;
-        """
-        guild_dict = current_guild_settings.to_dict()
-        original_value = guild_dict.get(key)
+        original_value = getattr(current_guild_settings, key, None)
         if original_value and original_value is value:
             await ctx.send(f"`{key}` is already set to `{value}`!")
             return
 
-        guild_dict[key] = value
-        await self.bot.pool.execute(query, ctx.guild.id, guild_dict)
-        self.get_partial_guild_settings.cache_invalidate(ctx.guild.id)
+        # Only this key is written, so settings changed at the same time are kept
+        await self.bot.guild_configs.update_settings(ctx.guild.id, {key: value})
+        await self.bot.notifier.publish(GuildConfigChanged(guild_id=ctx.guild.id))
 
         command_type = "Toggled" if config_type == ConfigType.TOGGLE else "Set"
         await ctx.send(f"{command_type} `{key}` from `{original_value}` to `{value}`")
@@ -563,14 +678,12 @@ class Config(commands.Cog):
         """
         guild_id = ctx.guild.id
 
-        dispatcher = GuildWebhookDispatcher(self.bot, guild_id)
-        guild_settings = GuildSettings()
-        config = await dispatcher.get_config()
+        config = self.bot.guild_configs.get(guild_id)
 
         if (
             config is not None
-            and config.logging_channel is not None
-            and config.ticket_channel is not None
+            and config.logging_channel(ctx.guild) is not None
+            and config.ticket_channel(ctx.guild) is not None
         ):
             msg = (
                 "It seems like there the channels are set up already\n"
@@ -688,13 +801,9 @@ class Config(commands.Cog):
             await ctx.send(UNKNOWN_ERROR_MESSAGE)
             return
 
-        query = """
-        INSERT INTO guild_config (id, category_id, ticket_channel_id, logging_channel_id, logging_broadcast_url, ticket_broadcast_url, prefix, settings)
-        VALUES ($1, $2, $3, $4, $5, $6, $7);
-        """
         try:
-            await self.pool.execute(
-                query,
+            await CREATE_GUILD_CONFIG.execute(
+                self.pool,
                 guild_id,
                 rodhaj_category.id,
                 ticket_channel.id,
@@ -702,7 +811,7 @@ class Config(commands.Cog):
                 lgc_webhook.url,
                 tc_webhook.url,
                 [],
-                guild_settings.to_dict(),
+                PartialGuildSettings(),
             )
         except asyncpg.UniqueViolationError:
             await ticket_channel.delete(reason=delete_reason)
@@ -712,8 +821,8 @@ class Config(commands.Cog):
                 "Failed to create the channels. Please contact Noelle to figure out why (it's more than likely that the channels exist and bypassed checking the lru cache for some reason)"
             )
         else:
-            # Invalidate LRU cache just to clear it out
-            dispatcher.get_config.cache_invalidate()
+            await self.bot.guild_configs.refresh(guild_id)
+            await self.bot.notifier.publish(GuildConfigChanged(guild_id=guild_id))
             msg = f"Rodhaj channels successfully created! The ticket channel can be found under {ticket_channel.mention}"
             await ctx.send(msg)
 
@@ -726,8 +835,7 @@ class Config(commands.Cog):
         """Permanently deletes Rodhaj channels and tickets."""
         guild_id = ctx.guild.id
 
-        dispatcher = GuildWebhookDispatcher(self.bot, guild_id)
-        guild_config = await self.get_guild_config(guild_id)
+        guild_config = self.bot.guild_configs.get(guild_id)
 
         msg = "Are you really sure that you want to delete the Rodhaj channels?"
         confirm = await ctx.prompt(msg, timeout=300.0, delete_after=True)
@@ -741,15 +849,18 @@ class Config(commands.Cog):
 
             reason = f"Requested by {ctx.author.name} (ID: {ctx.author.id}) to purge Rodhaj channels"
 
+            logging_channel = guild_config.logging_channel(ctx.guild)
+            ticket_channel = guild_config.ticket_channel(ctx.guild)
+            category_channel = guild_config.category_channel(ctx.guild)
             if (
-                guild_config.logging_channel is not None
-                and guild_config.ticket_channel is not None
-                and guild_config.category_channel is not None
+                logging_channel is not None
+                and ticket_channel is not None
+                and category_channel is not None
             ):
                 try:
-                    await guild_config.logging_channel.delete(reason=reason)
-                    await guild_config.ticket_channel.delete(reason=reason)
-                    await guild_config.category_channel.delete(reason=reason)
+                    await logging_channel.delete(reason=reason)
+                    await ticket_channel.delete(reason=reason)
+                    await category_channel.delete(reason=reason)
                 except discord.Forbidden:
                     await ctx.send(
                         "\N{NO ENTRY SIGN} Rodhaj is missing permissions: Manage Channels"
@@ -759,12 +870,9 @@ class Config(commands.Cog):
                     await ctx.send(UNKNOWN_ERROR_MESSAGE)
                     return
 
-            query = """
-            DELETE FROM guild_config WHERE id = $1;
-            """
-            await self.pool.execute(query, guild_id)
-            dispatcher.get_config.cache_invalidate()
-            self.get_guild_config.cache_invalidate(guild_id)
+            await DELETE_GUILD_CONFIG.execute(self.pool, guild_id)
+            self.bot.guild_configs.remove(guild_id)
+            await self.bot.notifier.publish(GuildConfigChanged(guild_id=guild_id))
             await ctx.send("Successfully deleted channels")
         elif confirm is None:
             await ctx.send("Not removing Rodhaj channels. Canceling.")
@@ -803,7 +911,7 @@ class Config(commands.Cog):
         The active flag controls whether active settings are shown are not. For the
         purposes of simplicity, non-boolean options are not considered "active".
         """
-        guild_settings = await self.get_guild_settings(ctx.guild.id)
+        guild_settings = self.bot.guild_configs.get_settings(ctx.guild.id)
         if guild_settings is None:
             msg = (
                 "It seems like Rodhaj has not been set up\n"
@@ -865,16 +973,12 @@ class Config(commands.Cog):
         to set the minimum age required to use Rodhaj
         """
         if type in "guild":
-            clause = "SET guild_age = $2"
+            column, query = "guild_age", SET_GUILD_AGE
         else:
-            clause = "SET account_age = $2"
-        query = f"""
-        UPDATE guild_config
-        {clause}
-        WHERE id = $1;
-        """
-        await self.bot.pool.execute(query, ctx.guild.id, duration.td)
-        self.get_guild_settings.cache_invalidate(ctx.guild.id)
+            column, query = "account_age", SET_ACCOUNT_AGE
+        await query.execute(self.bot.pool, ctx.guild.id, duration.td)
+        self.bot.guild_configs.update(ctx.guild.id, **{column: duration.td})
+        await self.bot.notifier.publish(GuildConfigChanged(guild_id=ctx.guild.id))
         await ctx.send(f"Set `{type}_age` to `{duration.td}`")
 
     @is_manager()
@@ -976,7 +1080,7 @@ class Config(commands.Cog):
 
         Passing in no subcommands will effectively show the currently set prefixes.
         """
-        prefixes = await get_prefix(self.bot, ctx.message)
+        prefixes = self.bot.prefixes.get(ctx.guild.id)
         embed = Embed()
         embed.add_field(
             name="Prefixes", value=self.clean_prefixes(prefixes), inline=False
@@ -993,7 +1097,7 @@ class Config(commands.Cog):
         self, ctx: GuildContext, prefix: Annotated[str, PrefixConverter]
     ) -> None:
         """Adds an custom prefix"""
-        prefixes = await get_prefix(self.bot, ctx.message)
+        prefixes = self.bot.prefixes.get(ctx.guild.id)
 
         # 2 are the mention prefixes, which are always prepended on the list of prefixes
         if isinstance(prefixes, list) and len(prefixes) > 13:
@@ -1005,13 +1109,9 @@ class Config(commands.Cog):
             await ctx.send("The prefix you want to set already exists")
             return
 
-        query = """
-            UPDATE guild_config
-            SET prefix = ARRAY_APPEND(prefix, $1)
-            WHERE id = $2;
-        """
-        await self.pool.execute(query, prefix, ctx.guild.id)
-        get_prefix.cache_invalidate(self.bot, ctx.message)
+        updated = await ADD_PREFIX.fetchval(self.pool, prefix, ctx.guild.id)
+        self.bot.guild_configs.update(ctx.guild.id, prefix=updated)
+        await self.bot.notifier.publish(GuildConfigChanged(guild_id=ctx.guild.id))
         await ctx.send(f"Added prefix: `{prefix}`")
 
     @is_manager()
@@ -1028,17 +1128,13 @@ class Config(commands.Cog):
         new: Annotated[str, PrefixConverter],
     ) -> None:
         """Edits and replaces a prefix"""
-        query = """
-            UPDATE guild_config
-            SET prefix = ARRAY_REPLACE(prefix, $1, $2)
-            WHERE id = $3;
-        """
-        prefixes = await get_prefix(self.bot, ctx.message)
-
         guild_id = ctx.guild.id
+        prefixes = self.bot.prefixes.get(guild_id)
+
         if old in prefixes:
-            await self.pool.execute(query, old, new, guild_id)
-            get_prefix.cache_invalidate(self.bot, ctx.message)
+            updated = await REPLACE_PREFIX.fetchval(self.pool, old, new, guild_id)
+            self.bot.guild_configs.update(guild_id, prefix=updated)
+            await self.bot.notifier.publish(GuildConfigChanged(guild_id=guild_id))
             await ctx.send(f"Prefix updated to from `{old}` to `{new}`")
         else:
             await ctx.send("The prefix is not in the list of prefixes for your server")
@@ -1051,16 +1147,12 @@ class Config(commands.Cog):
         self, ctx: GuildContext, prefix: Annotated[str, PrefixConverter]
     ) -> None:
         """Deletes a set prefix"""
-        query = """
-        UPDATE guild_config
-        SET prefix = ARRAY_REMOVE(prefix, $1)
-        WHERE id=$2;
-        """
         msg = f"Do you want to delete the following prefix: {prefix}"
         confirm = await ctx.prompt(msg, timeout=120.0, delete_after=True)
         if confirm:
-            await self.pool.execute(query, prefix, ctx.guild.id)
-            get_prefix.cache_invalidate(self.bot, ctx.message)
+            updated = await REMOVE_PREFIX.fetchval(self.pool, prefix, ctx.guild.id)
+            self.bot.guild_configs.update(ctx.guild.id, prefix=updated)
+            await self.bot.notifier.publish(GuildConfigChanged(guild_id=ctx.guild.id))
             await ctx.send(f"The prefix `{prefix}` has been successfully deleted")
         elif confirm is None:
             await ctx.send("Confirmation timed out. Cancelled deletion...")
@@ -1108,24 +1200,20 @@ class Config(commands.Cog):
 
         blocklist = self.bot.blocklist.all().copy()
         blocklist[entity.id] = BlocklistEntity(
-            bot=self.bot, guild_id=ctx.guild.id, entity_id=entity.id
-        )
-        query = """
-        WITH blocklist_insert AS (
-            INSERT INTO blocklist (guild_id, entity_id)
-            VALUES ($1, $2)
-            RETURNING entity_id
+            guild_id=ctx.guild.id, entity_id=entity.id
         )
-        UPDATE tickets
-        SET locked = true
-        WHERE owner_id = (SELECT entity_id FROM blocklist_insert);
-        """
         lock_reason = f"{entity.global_name} is blocked from using Rodhaj"
-        async with self.bot.pool.acquire() as connection:
+        async with self.bot.pool_supervisor.acquire() as connection:
             tr = connection.transaction()
             await tr.start()
             try:
-                await connection.execute(query, ctx.guild.id, entity.id)
+                status = await BLOCK_ENTITY.execute(connection, ctx.guild.id, entity.id)
+                await self.bot.notifier.publish(
+                    BlocklistChanged(
+                        guild_id=ctx.guild.id, entity_id=entity.id, blocked=True
+                    ),
+                    connection,
+                )
             except asyncpg.UniqueViolationError:
                 del blocklist[entity.id]
                 await tr.rollback()
@@ -1135,9 +1223,10 @@ class Config(commands.Cog):
                 await tr.rollback()
                 await ctx.send("Unable to block user")
             else:
-                self.bot.metrics.features.blocked_users.inc()
                 await tr.commit()
                 self.bot.blocklist.replace(blocklist)
+                self.bot.ticket_index.set_locked(entity.id, True)
+                self.bot.counters.blocked_user(locked=count_rows("execute", status))
 
                 await block_ticket.cog.soft_lock_ticket(
                     block_ticket.thread, lock_reason
@@ -1174,29 +1263,26 @@ class Config(commands.Cog):
         # it doesn't really matter whether it's deleted or not actually.
         # it would return the same thing - DELETE 0
         # Note: An timer would have to delete this technically
-        query = """
-        WITH blocklist_delete AS (
-            DELETE FROM blocklist
-            WHERE entity_id = $1
-            RETURNING entity_id
-        )
-        UPDATE tickets
-        SET locked = false
-        WHERE owner_id = (SELECT entity_id FROM blocklist_delete);
-        """
         unlock_reason = f"{entity.global_name} is unblocked from using Rodhaj"
-        async with self.bot.pool.acquire() as connection:
+        async with self.bot.pool_supervisor.acquire() as connection:
             tr = connection.transaction()
             await tr.start()
             try:
-                await connection.execute(query, entity.id)
+                status = await UNBLOCK_ENTITY.execute(connection, entity.id)
+                await self.bot.notifier.publish(
+                    BlocklistChanged(
+                        guild_id=ctx.guild.id, entity_id=entity.id, blocked=False
+                    ),
+                    connection,
+                )
             except Exception:
                 await tr.rollback()
                 await ctx.send("Unable to block user")
             else:
-                self.bot.metrics.features.blocked_users.dec()
                 await tr.commit()
                 self.bot.blocklist.replace(blocklist)
+                self.bot.ticket_index.set_locked(entity.id, False)
+                self.bot.counters.unblocked_user(unlocked=count_rows("execute", status))
                 await block_ticket.cog.soft_unlock_ticket(
                     block_ticket.thread, unlock_reason
                 )
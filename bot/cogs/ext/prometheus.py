@@ -5,10 +5,11 @@ from typing import TYPE_CHECKING
 
 import discord
 from discord.ext import commands, tasks
+from utils.queries import catalog
 
 try:
     from prometheus_async.aio.web import start_http_server
-    from prometheus_client import Counter, Enum, Gauge, Info, Summary
+    from prometheus_client import Counter, Enum, Gauge, Histogram, Info, Summary
 except ImportError:
     raise RuntimeError(
         "Prometheus libraries are required to be installed. "
@@ -41,13 +42,195 @@ class FeatureCollector:
         )
         self.locked_tickets = Gauge(
             f"{METRIC_PREFIX}locked_tickets",
-            "Number of soft locked tickets in this session",
+            "Number of soft locked tickets",
         )
         self.blocked_users = Gauge(
             f"{METRIC_PREFIX}blocked_users", "Number of currently blocked users"
         )
 
 
+class CacheCollector:
+    __slots__ = ("bot", "negative_hits", "negative_misses")
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self.negative_hits = Counter(
+            f"{METRIC_PREFIX}ticket_negative_cache_hits",
+            "Number of ticket lookups answered by the negative cache",
+        )
+        self.negative_misses = Counter(
+            f"{METRIC_PREFIX}ticket_negative_cache_misses",
+            "Number of ticket lookups that had to query the database",
+        )
+
+
+class RelayCollector:
+    __slots__ = ("bot", "queue_depth", "wait_time", "rejected", "coalesced")
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self.queue_depth = Gauge(
+            f"{METRIC_PREFIX}relay_queue_depth",
+            "Number of DM relays waiting to be sent",
+        )
+        self.wait_time = Histogram(
+            f"{METRIC_PREFIX}relay_wait_seconds",
+            "Time DM relays spent queued before being sent",
+        )
+        self.rejected = Counter(
+            f"{METRIC_PREFIX}relay_rejected",
+            "Number of DM relays rejected due to backpressure",
+        )
+        self.coalesced = Counter(
+            f"{METRIC_PREFIX}relay_coalesced",
+            "Number of DM relays merged into a preceding relay",
+        )
+
+
+class OutboundCollector:
+    __slots__ = ("bot", "queued", "latency", "retries")
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self.queued = Gauge(
+            f"{METRIC_PREFIX}outbound_queued",
+            "Number of outbound requests waiting to be sent",
+            ["priority"],
+        )
+        self.latency = Histogram(
+            f"{METRIC_PREFIX}outbound_latency_seconds",
+            "Time taken from scheduling an outbound request to it being sent",
+            ["priority"],
+        )
+        self.retries = Counter(
+            f"{METRIC_PREFIX}outbound_retries",
+            "Number of outbound requests retried after being rate limited",
+        )
+
+
+class CloseCollector:
+    __slots__ = ("bot", "stages", "latency", "failures")
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self.stages = Histogram(
+            f"{METRIC_PREFIX}close_stage_seconds",
+            "Time taken by each stage of closing a ticket",
+            ["stage"],
+        )
+        self.latency = Histogram(
+            f"{METRIC_PREFIX}close_latency_seconds",
+            "Time taken to close a ticket from start to finish",
+        )
+        self.failures = Counter(
+            f"{METRIC_PREFIX}close_stage_failures",
+            "Number of failed stages while closing tickets",
+            ["stage"],
+        )
+
+
+class QueryCollector:
+    __slots__ = ("bot", "latency", "rows", "errors", "timeouts")
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self.latency = Histogram(
+            f"{METRIC_PREFIX}query_latency_seconds",
+            "Time taken by each database query",
+            ["query"],
+        )
+        self.rows = Histogram(
+            f"{METRIC_PREFIX}query_rows",
+            "Number of rows returned or affected by each database query",
+            ["query"],
+            buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000),
+        )
+        self.errors = Counter(
+            f"{METRIC_PREFIX}query_errors",
+            "Number of database queries that failed",
+            ["query", "error"],
+        )
+        self.timeouts = Counter(
+            f"{METRIC_PREFIX}query_timeouts",
+            "Number of database queries that exceeded the command timeout",
+            ["query"],
+        )
+
+
+class PoolCollector:
+    __slots__ = ("bot", "size", "idle", "in_use", "limit", "acquire_wait")
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self.size = Gauge(
+            f"{METRIC_PREFIX}pool_size",
+            "Number of open connections in the pool",
+            ["pool"],
+        )
+        self.idle = Gauge(
+            f"{METRIC_PREFIX}pool_idle",
+            "Number of idle connections in the pool",
+            ["pool"],
+        )
+        self.in_use = Gauge(
+            f"{METRIC_PREFIX}pool_in_use",
+            "Number of connections in use",
+            ["pool"],
+        )
+        self.limit = Gauge(
+            f"{METRIC_PREFIX}pool_limit",
+            "Maximum number of connections that can currently be in use",
+            ["pool"],
+        )
+        self.acquire_wait = Histogram(
+            f"{METRIC_PREFIX}pool_acquire_wait_seconds",
+            "Time spent waiting to acquire a connection",
+            ["pool"],
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+        )
+
+
+class ReplicaCollector:
+    __slots__ = ("bot", "lag", "healthy", "routed")
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self.lag = Gauge(
+            f"{METRIC_PREFIX}replica_lag_seconds",
+            "Replication lag of the replica",
+            ["replica"],
+        )
+        self.healthy = Gauge(
+            f"{METRIC_PREFIX}replica_healthy",
+            "Whether the replica is used for reads",
+            ["replica"],
+        )
+        self.routed = Counter(
+            f"{METRIC_PREFIX}replica_routed",
+            "Number of reads routed to each replica, or to the primary",
+            ["replica"],
+        )
+
+
+class DraftCollector:
+    __slots__ = ("bot", "active", "opened", "closed")
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self.active = Gauge(
+            f"{METRIC_PREFIX}ticket_drafts",
+            "Number of ticket drafts awaiting confirmation",
+        )
+        self.opened = Counter(
+            f"{METRIC_PREFIX}ticket_drafts_opened", "Number of ticket drafts opened"
+        )
+        self.closed = Counter(
+            f"{METRIC_PREFIX}ticket_drafts_closed",
+            "Number of ticket drafts closed, by reason",
+            ["reason"],
+        )
+
+
 # Maybe load all of these from an json file next time
 class Metrics:
     __slots__ = (
@@ -57,6 +240,14 @@ class Metrics:
         "commands",
         "version",
         "features",
+        "cache",
+        "relay",
+        "outbound",
+        "closing",
+        "queries",
+        "pool",
+        "replicas",
+        "drafts",
     )
 
     def __init__(self, bot: Rodhaj):
@@ -71,6 +262,17 @@ class Metrics:
         self.commands = Summary(f"{METRIC_PREFIX}commands", "Total commands executed")
         self.version = Info(f"{METRIC_PREFIX}version", "Versions of the bot")
         self.features = FeatureCollector(self.bot)
+        self.cache = CacheCollector(self.bot)
+        self.relay = RelayCollector(self.bot)
+        self.outbound = OutboundCollector(self.bot)
+        self.closing = CloseCollector(self.bot)
+        self.queries = QueryCollector(self.bot)
+        self.pool = PoolCollector(self.bot)
+        self.replicas = ReplicaCollector(self.bot)
+        self.drafts = DraftCollector(self.bot)
+
+        # Every statement in the catalog reports to this collector
+        catalog.collector = self.queries
 
     def get_commands(self) -> int:
         total_commands = 0
@@ -2,31 +2,63 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import time
 import uuid
-from typing import TYPE_CHECKING, Annotated, Optional, TypedDict, Union
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Awaitable,
+    Generator,
+    Optional,
+    TypedDict,
+    TypeVar,
+    Union,
+)
 
 import asyncpg
 import discord
 import msgspec
-from async_lru import alru_cache
 from discord.ext import commands
 from discord.utils import format_dt, utcnow
 from utils import ErrorEmbed
+from utils.attachments import DM_FILESIZE_LIMIT
 from utils.checks import bot_check_permissions
 from utils.embeds import CooldownEmbed, Embed
 from utils.modals import RoboModal
+from utils.outbound import Priority
+from utils.queries import (
+    CLOSE_TICKET_BY_OWNER,
+    CLOSE_TICKET_BY_THREAD,
+    CREATE_TICKET,
+    GET_ALL_TICKETS,
+    GET_TICKET_BY_OWNER,
+    GET_TICKET_BY_THREAD,
+)
 from utils.views import RoboView
 
-from .config import GuildWebhookDispatcher
-
 if TYPE_CHECKING:
     from rodhaj import Rodhaj
     from utils import GuildContext, RoboContext
 
     from .config import Config
 
+T = TypeVar("T")
 
 TICKET_EMOJI = "\U0001f3ab"  # U+1F3AB Ticket
+NEGATIVE_CACHE_SIZE = 4096
+NEGATIVE_CACHE_TTL = 30.0
+# Drafts live for as long as their confirmation prompt
+DRAFT_TIMEOUT = 300.0
+MAX_DRAFTS = 1000
+MAX_DRAFT_ATTACHMENTS = 10
+# Leaves room for the header that is added to the first message of the ticket
+MAX_DRAFT_LENGTH = 1900
+RESOLVED_TAG = "Resolved"
+LOCKED_TAG = "Locked"
 
 ### Command checks
 
@@ -59,30 +91,6 @@ def is_ticket_thread():
 ### Public ticket utilities
 
 
-async def register_user(
-    user_id: int, connection: Union[asyncpg.Pool, asyncpg.Connection]
-):
-    """Registers the user into the database
-
-    Args:
-        user_id (int): ID of the user
-        connection (Union[asyncpg.Pool, asyncpg.Connection]): A connection (can be a pool) to the PostgreSQL server (through asyncpg)
-
-    Returns:
-        bool: `True` if the user has been successfully registered into the database,
-        `False` if the user is already in the database
-    """
-    query = """
-    INSERT INTO user_config (id)
-    VALUES ($1) ON CONFLICT (id) DO NOTHING; 
-    """
-    status = await connection.execute(query, user_id)
-    if status[-1] == "0":
-        return False
-    return True
-
-
-@alru_cache(maxsize=256)
 async def get_partial_ticket(
     bot: Rodhaj, user_id: int, pool: Optional[asyncpg.Pool] = None
 ) -> PartialTicket:
@@ -95,6 +103,11 @@ async def get_partial_ticket(
     that there is no ticket found. If an ticket is found, then the partial information
     of it is filled.
 
+    Lookups are served from the bot's `TicketIndex`. The database is only
+    consulted when the index does not know about the user, and any ticket found
+    that way is added to the index. Users without a ticket are remembered for a short
+    period of time, so repeated DMs from them do not query the database.
+
     Args:
         bot (Rodhaj): An instance of `Rodhaj`
         user_id (int): ID of the user
@@ -103,60 +116,76 @@ async def get_partial_ticket(
     Returns:
         PartialTicket: An representation of a "partial" ticket
     """
-    query = """
-    SELECT id, thread_id, owner_id, location_id, locked
-    FROM tickets
-    WHERE owner_id = $1;
-    """
+    ticket = bot.ticket_index.get(user_id)
+    if ticket is not None:
+        return ticket
+
+    if bot.ticket_index.is_missing(user_id):
+        bot.metrics.cache.negative_hits.inc()
+        return PartialTicket()
+
     pool = pool or bot.pool
-    rows = await pool.fetchrow(query, user_id)
+    bot.metrics.cache.negative_misses.inc()
+    rows = await GET_TICKET_BY_OWNER.fetchrow(pool, user_id)
     if rows is None:
-        # In order to prevent caching invalid tickets, we need to invalidate the cache.
-        # By invalidating the cache, we basically "ignore" the invalid
-        # ticket. This essentially still leaves us with the performance boosts
-        # of the LRU cache, while also properly invalidating invalid tickets
-        get_partial_ticket.cache_invalidate(bot, user_id, pool)
+        bot.ticket_index.mark_missing(user_id)
         return PartialTicket()
-    return PartialTicket(rows)
+
+    ticket = PartialTicket(rows)
+    bot.ticket_index.add(ticket)
+    return ticket
 
 
-@alru_cache(maxsize=64)
 async def get_cached_thread(
-    bot: Rodhaj, user_id: int, connection: Optional[asyncpg.Pool] = None
+    bot: Rodhaj,
+    user_id: int,
+    connection: Optional[asyncpg.Pool] = None,
+    *,
+    unarchive: bool = False,
 ) -> Optional[ThreadWithGuild]:
     """Obtains an cached thread from the tickets channel
 
-    This has a small LRU cache (size of 64) so the cache is forced to refresh its
-    internal data.
+    The ticket is resolved through the `TicketIndex`, and the thread
+    itself is obtained through the `ThreadResolver`.
 
     Args:
         bot (Rodhaj): Instance of `RodHaj`
         user_id (int): ID of the user
         connection (Optional[asyncpg.Pool]): Pool of connections from asyncpg. Defaults to `None`
+        unarchive (bool): Whether to unarchive the thread if it is archived. Defaults to `False`
 
     Returns:
         Optional[ThreadWithGuild]: The thread with the guild the thread belongs to.
         `None` if not found.
     """
-    query = """
-    SELECT guild_config.ticket_channel_id, tickets.thread_id, tickets.location_id
-    FROM tickets
-    INNER JOIN guild_config ON guild_config.id = tickets.location_id
-    WHERE tickets.owner_id  = $1;
+    ticket = await get_partial_ticket(bot, user_id, connection)
+    if ticket.id is None:
+        return None
+    return await get_ticket_thread(bot, ticket, unarchive=unarchive)
+
+
+async def get_ticket_thread(
+    bot: Rodhaj, ticket: PartialTicket, *, unarchive: bool = False
+) -> Optional[ThreadWithGuild]:
+    """Obtains the thread of an ticket
+
+    Args:
+        bot (Rodhaj): Instance of `RodHaj`
+        ticket (PartialTicket): The ticket to obtain the thread of
+        unarchive (bool): Whether to unarchive the thread if it is archived. Defaults to `False`
+
+    Returns:
+        Optional[ThreadWithGuild]: The thread with the guild the thread belongs to.
+        `None` if not found.
     """
-    connection = connection or bot.pool
-    record = await connection.fetchrow(query, user_id)
-    if record is None:
+    guild = bot.get_guild(ticket.location_id)
+    if guild is None:
         return None
-    forum_channel = bot.get_channel(record["ticket_channel_id"]) or (
-        await bot.fetch_channel(record["ticket_channel_id"])
-    )
-    if isinstance(forum_channel, discord.ForumChannel):
-        thread = forum_channel.get_thread(record["thread_id"])
-        if thread is None:
-            get_cached_thread.cache_invalidate(bot, user_id, connection)
-            return None
-        return ThreadWithGuild(thread, thread.guild)
+
+    thread = await bot.threads.resolve(guild, ticket.thread_id, unarchive=unarchive)
+    if thread is None:
+        return None
+    return ThreadWithGuild(thread, guild)
 
 
 def safe_content(content: str, amount: int = 4000) -> str:
@@ -195,8 +224,8 @@ class ThreadWithGuild(msgspec.Struct, frozen=True):
 
 
 class StatusChecklist(msgspec.Struct, frozen=True):
-    title: asyncio.Event = asyncio.Event()
-    tags: asyncio.Event = asyncio.Event()
+    title: asyncio.Event = msgspec.field(default_factory=asyncio.Event)
+    tags: asyncio.Event = msgspec.field(default_factory=asyncio.Event)
 
 
 class TicketThread(msgspec.Struct, frozen=True):
@@ -210,6 +239,63 @@ class TicketThread(msgspec.Struct, frozen=True):
     created_at: datetime.datetime
 
 
+class DraftSession:
+    __slots__ = (
+        "owner_id",
+        "tags",
+        "status",
+        "messages",
+        "attachments",
+        "expires_at",
+    )
+
+    def __init__(self, owner_id: int, expires_at: float):
+        self.owner_id = owner_id
+        self.tags = ReservedTags(question=False, serious=False, private=False)
+        self.status = StatusChecklist()
+        self.messages: list[str] = []
+        self.attachments: list[discord.Attachment] = []
+        self.expires_at = expires_at
+
+    @property
+    def content(self) -> str:
+        return "\n".join(self.messages)
+
+    def append(self, content: str, attachments: list[discord.Attachment]) -> bool:
+        """Adds a message to the draft
+
+        Args:
+            content (str): Content of the message
+            attachments (list[discord.Attachment]): Attachments of the message
+
+        Returns:
+            bool: Whether the message fits in the draft
+        """
+        # The first message is always taken as-is, so only follow-ups are limited
+        if self.messages and (
+            len(self.content) + len(content) + 1 > MAX_DRAFT_LENGTH
+            or len(self.attachments) + len(attachments) > MAX_DRAFT_ATTACHMENTS
+        ):
+            return False
+
+        self.messages.append(content)
+        self.attachments.extend(attachments)
+        return True
+
+
+class ForumMetadata:
+    __slots__ = ("channel", "tags", "resolved_tag", "locked_tag")
+
+    def __init__(self, channel: discord.ForumChannel):
+        self.channel = channel
+        self.tags = {tag.name: tag for tag in channel.available_tags}
+        self.resolved_tag = self.tags.get(RESOLVED_TAG)
+        self.locked_tag = self.tags.get(LOCKED_TAG)
+
+    def get_tags(self, names: list[str]) -> list[discord.ForumTag]:
+        return [self.tags[name] for name in names if name in self.tags]
+
+
 class PartialTicket:
     __slots__ = ("id", "thread_id", "owner_id", "location_id", "locked")
 
@@ -224,16 +310,416 @@ class PartialTicket:
             self.locked = record["locked"]
 
 
-class PartialConfig:
-    __slots__ = ("id", "ticket_channel_id", "logging_channel_id")
+### Core classes
 
-    def __init__(self, record: Optional[asyncpg.Record] = None):
-        self.id = None
 
-        if record:
-            self.id = record["id"]
-            self.ticket_channel_id = record["ticket_channel_id"]
-            self.logging_channel_id = record["logging_channel_id"]
+class TicketIndex:
+    """An in-memory index of all active tickets
+
+    The index is loaded in bulk when the bot starts up, and is updated in place
+    whenever a ticket is created, closed or locked. This allows the DM relay path
+    to resolve tickets without any database round trips.
+
+    In addition, the index keeps a bounded negative cache of users that are known
+    to not have an active ticket. Entries expire after a short TTL.
+    """
+
+    def __init__(
+        self,
+        bot: Rodhaj,
+        *,
+        max_missing: int = NEGATIVE_CACHE_SIZE,
+        missing_ttl: float = NEGATIVE_CACHE_TTL,
+    ):
+        self.bot = bot
+        self.max_missing = max_missing
+        self.missing_ttl = missing_ttl
+        self._owners: dict[int, PartialTicket] = {}
+        self._threads: dict[int, int] = {}
+        self._missing: OrderedDict[int, float] = OrderedDict()
+
+    async def _load(
+        self, connection: Union[asyncpg.Connection, asyncpg.Pool]
+    ) -> list[PartialTicket]:
+        rows = await GET_ALL_TICKETS.fetch(connection)
+        return [PartialTicket(row) for row in rows]
+
+    async def load(self, connection: Optional[asyncpg.Connection] = None) -> None:
+        try:
+            tickets = await self._load(connection or self.bot.pool)
+        except Exception:
+            self.bot.logger.exception("Failed to load the ticket index")
+            raise
+
+        self.replace(tickets)
+
+    def replace(self, tickets: list[PartialTicket]) -> None:
+        self._owners = {}
+        self._threads = {}
+        self._missing.clear()
+        for ticket in tickets:
+            self.add(ticket)
+
+    def add(self, ticket: PartialTicket) -> None:
+        # Handles the case where the owner has a stale entry with an older thread
+        self.remove(ticket.owner_id)
+        self.invalidate_missing(ticket.owner_id)
+
+        self._owners[ticket.owner_id] = ticket
+        self._threads[ticket.thread_id] = ticket.owner_id
+
+    def remove(self, owner_id: int) -> Optional[PartialTicket]:
+        ticket = self._owners.pop(owner_id, None)
+        if ticket is None:
+            return None
+
+        self._threads.pop(ticket.thread_id, None)
+        return ticket
+
+    def set_locked(self, owner_id: int, locked: bool) -> None:
+        ticket = self._owners.get(owner_id)
+        if ticket is not None:
+            ticket.locked = locked
+
+    def get(self, owner_id: int) -> Optional[PartialTicket]:
+        return self._owners.get(owner_id)
+
+    def get_by_thread(self, thread_id: int) -> Optional[PartialTicket]:
+        owner_id = self._threads.get(thread_id)
+        if owner_id is None:
+            return None
+        return self._owners.get(owner_id)
+
+    ### Negative cache
+
+    def is_missing(self, owner_id: int) -> bool:
+        expires_at = self._missing.get(owner_id)
+        if expires_at is None:
+            return False
+
+        if expires_at < time.monotonic():
+            del self._missing[owner_id]
+            return False
+        return True
+
+    def mark_missing(self, owner_id: int) -> None:
+        self._missing[owner_id] = time.monotonic() + self.missing_ttl
+        self._missing.move_to_end(owner_id)
+
+        while len(self._missing) > self.max_missing:
+            self._missing.popitem(last=False)
+
+    def invalidate_missing(self, owner_id: int) -> None:
+        self._missing.pop(owner_id, None)
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._owners
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+
+class ForumMetadataCache:
+    """Caches the ticket forums, along with their tags
+
+    Tags are mapped by name when a forum is first resolved, so looking up
+    tags does not have to scan the forum's tags every time. The forum itself is
+    kept as well, so creating a ticket does not need to fetch the channel when
+    it is missing from discord.py's cache.
+
+    Entries are rebuilt whenever the forum is updated, and are dropped once
+    the forum is deleted.
+    """
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self._forums: dict[int, ForumMetadata] = {}
+
+    def build(self, channel: discord.ForumChannel) -> ForumMetadata:
+        metadata = self._forums[channel.id] = ForumMetadata(channel)
+        return metadata
+
+    def get(self, channel_id: int) -> Optional[ForumMetadata]:
+        return self._forums.get(channel_id)
+
+    def get_metadata(
+        self, channel: Optional[Union[discord.ForumChannel, discord.TextChannel]]
+    ) -> Optional[ForumMetadata]:
+        if not isinstance(channel, discord.ForumChannel):
+            return None
+
+        metadata = self._forums.get(channel.id)
+        if metadata is None:
+            metadata = self.build(channel)
+        return metadata
+
+    async def resolve(self, channel_id: int) -> Optional[ForumMetadata]:
+        """Resolves a forum, fetching it if it is not cached
+
+        Args:
+            channel_id (int): ID of the forum
+
+        Returns:
+            Optional[ForumMetadata]: The forum's metadata, or `None` if the channel
+            is not a forum
+        """
+        metadata = self._forums.get(channel_id)
+        if metadata is not None:
+            return metadata
+
+        channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(
+            channel_id
+        )
+        if not isinstance(channel, discord.ForumChannel):
+            return None
+        return self.build(channel)
+
+    def refresh(self, channel: discord.abc.GuildChannel) -> None:
+        # Only forums that have been resolved before are kept up to date
+        if channel.id not in self._forums:
+            return
+
+        if isinstance(channel, discord.ForumChannel):
+            self.build(channel)
+        else:
+            self.invalidate(channel.id)
+
+    def invalidate(self, channel_id: int) -> None:
+        self._forums.pop(channel_id, None)
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        for channel_id, forum in list(self._forums.items()):
+            if forum.channel.guild.id == guild_id:
+                del self._forums[channel_id]
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._forums
+
+    def __len__(self) -> int:
+        return len(self._forums)
+
+
+class ThreadResolver:
+    """Resolves and caches the threads of tickets
+
+    discord.py only caches active threads, so tickets that have been auto archived
+    can not be found in the guild's thread cache. Threads missing from the cache
+    are fetched through the API instead, and can be unarchived so messages can be
+    relayed into them again. Concurrent lookups of the same thread share a
+    single fetch.
+
+    Resolved threads are kept by ID, and are refreshed on thread updates. They
+    are dropped once the thread is deleted or the ticket is closed.
+    """
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self._threads: dict[int, discord.Thread] = {}
+        self._fetching: dict[int, asyncio.Task[Optional[discord.Thread]]] = {}
+
+    async def _fetch(
+        self, guild: discord.Guild, thread_id: int
+    ) -> Optional[discord.Thread]:
+        thread = guild.get_thread(thread_id)
+        if thread is None:
+            try:
+                channel = await guild.fetch_channel(thread_id)
+            except discord.NotFound:
+                return None
+            except discord.HTTPException:
+                self.bot.logger.exception("Failed to fetch thread %d", thread_id)
+                return None
+
+            if not isinstance(channel, discord.Thread):
+                return None
+            thread = channel
+
+        self._threads[thread_id] = thread
+        return thread
+
+    async def _unarchive(self, thread: discord.Thread) -> discord.Thread:
+        try:
+            thread = await thread.edit(archived=False)
+        except discord.HTTPException:
+            self.bot.logger.exception("Failed to unarchive thread %d", thread.id)
+            return thread
+
+        self._threads[thread.id] = thread
+        return thread
+
+    async def resolve(
+        self, guild: discord.Guild, thread_id: int, *, unarchive: bool = False
+    ) -> Optional[discord.Thread]:
+        """Resolves a thread, fetching it if it is not cached
+
+        Args:
+            guild (discord.Guild): The guild the thread belongs to
+            thread_id (int): ID of the thread
+            unarchive (bool): Whether to unarchive the thread if it is archived.
+                Locked threads are never unarchived. Defaults to `False`
+
+        Returns:
+            Optional[discord.Thread]: The thread, or `None` if it no longer exists
+        """
+        thread = self._threads.get(thread_id)
+        if thread is None:
+            task = self._fetching.get(thread_id)
+            if task is None:
+                task = self._fetching[thread_id] = asyncio.create_task(
+                    self._fetch(guild, thread_id)
+                )
+                task.add_done_callback(lambda _: self._fetching.pop(thread_id, None))
+            thread = await asyncio.shield(task)
+
+        if thread is not None and unarchive and thread.archived and not thread.locked:
+            thread = await self._unarchive(thread)
+        return thread
+
+    def refresh(self, thread: discord.Thread) -> None:
+        # Only threads that have been resolved before are kept up to date
+        if thread.id in self._threads:
+            self._threads[thread.id] = thread
+
+    def invalidate(self, thread_id: int) -> None:
+        self._threads.pop(thread_id, None)
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._threads
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+
+class DraftStore:
+    """Holds the ticket drafts that are waiting to be confirmed
+
+    A draft is opened whenever a user without a ticket DMs Rodhaj, and holds the
+    tags and checklist of the confirmation prompt. Drafts are closed once the
+    prompt is confirmed, cancelled or times out. Drafts that are never closed
+    expire after the prompt's timeout, and the oldest drafts are evicted once
+    the store is full.
+    """
+
+    def __init__(
+        self,
+        bot: Rodhaj,
+        *,
+        ttl: float = DRAFT_TIMEOUT,
+        max_size: int = MAX_DRAFTS,
+    ):
+        self.bot = bot
+        self.ttl = ttl
+        self.max_size = max_size
+        self._sessions: OrderedDict[int, DraftSession] = OrderedDict()
+        # Locks are only kept alive for as long as someone holds or waits on them
+        self._locks: weakref.WeakValueDictionary[int, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def _discard(self, owner_id: int, reason: str) -> None:
+        del self._sessions[owner_id]
+        self.bot.metrics.drafts.closed.labels(reason).inc()
+
+    def _expire(self) -> None:
+        # Sessions are kept in order of expiry, so only the oldest have to be checked
+        now = time.monotonic()
+        while self._sessions:
+            owner_id, session = next(iter(self._sessions.items()))
+            if session.expires_at >= now:
+                break
+            self._discard(owner_id, "expired")
+
+    def _sync(self) -> None:
+        self.bot.metrics.drafts.active.set(len(self._sessions))
+
+    def open(self, owner_id: int) -> tuple[DraftSession, bool]:
+        """Opens a draft for the user, or gets the one they already have
+
+        This should be called while holding the user's `lock`, so only
+        one prompt is ever sent for each draft.
+
+        Args:
+            owner_id (int): ID of the user
+
+        Returns:
+            tuple[DraftSession, bool]: The user's draft, and whether it was just opened.
+            The expiry of existing drafts is left alone, as it follows their prompt
+        """
+        self._expire()
+
+        session = self._sessions.get(owner_id)
+        if session is not None:
+            return session, False
+
+        session = self._sessions[owner_id] = DraftSession(
+            owner_id, time.monotonic() + self.ttl
+        )
+        self.bot.metrics.drafts.opened.inc()
+
+        while len(self._sessions) > self.max_size:
+            self._discard(next(iter(self._sessions)), "evicted")
+
+        self._sync()
+        return session, True
+
+    def extend(self, session: DraftSession) -> None:
+        """Pushes back the expiry of a draft while its prompt is being used
+
+        Args:
+            session (DraftSession): The draft to extend. Nothing is done if it has
+                already been closed
+        """
+        if self._sessions.get(session.owner_id) is not session:
+            return
+
+        session.expires_at = time.monotonic() + self.ttl
+        self._sessions.move_to_end(session.owner_id)
+
+    def lock(self, owner_id: int) -> asyncio.Lock:
+        """Gets the lock that serializes ticket creation for an user
+
+        Confirming a draft holds this lock while the ticket is created, so
+        only one ticket thread can ever be created at a time for each user.
+
+        Args:
+            owner_id (int): ID of the user
+
+        Returns:
+            asyncio.Lock: The user's lock
+        """
+        lock = self._locks.get(owner_id)
+        if lock is None:
+            lock = self._locks[owner_id] = asyncio.Lock()
+        return lock
+
+    def get(self, owner_id: int) -> Optional[DraftSession]:
+        self._expire()
+        self._sync()
+        return self._sessions.get(owner_id)
+
+    def close(
+        self, owner_id: int, session: Optional[DraftSession] = None, *, reason: str
+    ) -> None:
+        """Closes the draft of an user
+
+        Args:
+            owner_id (int): ID of the user
+            session (Optional[DraftSession]): Only close the draft if it is this session.
+                This keeps an old prompt from closing a draft that was opened after it
+            reason (str): Why the draft was closed
+        """
+        current = self._sessions.get(owner_id)
+        if current is None or (session is not None and current is not session):
+            return
+
+        self._discard(owner_id, reason)
+        self._sync()
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
 
 
 ### Embeds
@@ -271,7 +757,7 @@ class LoggingEmbed(discord.Embed):
 # \U00002705 - U+2705 White Heavy Check Mark
 # \U0000274c - U+274c Cross Mark
 class TicketTitleModal(RoboModal, title="Ticket Title"):
-    def __init__(self, ctx: RoboContext, ticket_cog: Tickets, *args, **kwargs):
+    def __init__(self, ctx: RoboContext, session: DraftSession, *args, **kwargs):
         super().__init__(ctx=ctx, *args, **kwargs)
 
         self.title_input = discord.ui.TextInput(
@@ -282,14 +768,14 @@ class TicketTitleModal(RoboModal, title="Ticket Title"):
             max_length=100,
         )
         self.input: Optional[str] = None
-        self.ticket_cog = ticket_cog
+        self.session = session
         self.add_item(self.title_input)
 
     async def on_submit(
         self, interaction: discord.Interaction[Rodhaj]
     ) -> Optional[str]:
         self.input = self.title_input.value
-        self.ticket_cog.in_progress_tickets[interaction.user.id].title.set()
+        self.session.status.title.set()
         await interaction.response.send_message(
             f"The title of the ticket is set to:\n`{self.title_input.value}`",
             ephemeral=True,
@@ -298,7 +784,7 @@ class TicketTitleModal(RoboModal, title="Ticket Title"):
 
 
 class TicketTagsSelect(discord.ui.Select):
-    def __init__(self, tickets_cog: Tickets):
+    def __init__(self, session: DraftSession):
         options = [
             discord.SelectOption(
                 label="Question",
@@ -326,7 +812,7 @@ class TicketTagsSelect(discord.ui.Select):
             options=options,
             row=0,
         )
-        self.tickets_cog = tickets_cog
+        self.session = session
         self.prev_selected: Optional[set] = None
 
     def tick(self, status) -> str:
@@ -336,17 +822,8 @@ class TicketTagsSelect(discord.ui.Select):
 
     async def callback(self, interaction: discord.Interaction[Rodhaj]) -> None:
         values = self.values
-        in_progress_tag = self.tickets_cog.reserved_tags.get(interaction.user.id)
-        if in_progress_tag is None:
-            await interaction.response.send_message(
-                "Are there really any tags cached?", ephemeral=True
-            )
-            return
-
-        output_tag = ReservedTags(question=False, serious=False, private=False)
-
-        if interaction.user.id in self.tickets_cog.reserved_tags:
-            output_tag = in_progress_tag
+        in_progress_tag = self.session.tags
+        output_tag = in_progress_tag
 
         current_selected = set(self.values)
 
@@ -362,8 +839,8 @@ class TicketTagsSelect(discord.ui.Select):
             for tag in values:
                 output_tag[tag] = not in_progress_tag[tag]
 
-        self.tickets_cog.reserved_tags[interaction.user.id] = output_tag
-        self.tickets_cog.in_progress_tickets[interaction.user.id].tags.set()
+        self.session.tags = output_tag
+        self.session.status.tags.set()
         self.prev_selected = set(self.values)
         formatted_str = "\n".join(
             f"{self.tick(v)} - {k.title()}" for k, v in output_tag.items()
@@ -379,34 +856,39 @@ class TicketTagsSelect(discord.ui.Select):
 class TicketConfirmView(RoboView):
     def __init__(
         self,
-        attachments: list[discord.Attachment],
         bot: Rodhaj,
         ctx: RoboContext,
         cog: Tickets,
         config_cog: Config,
-        content: str,
         guild: discord.Guild,
+        session: DraftSession,
         delete_after: bool = True,
     ) -> None:
-        super().__init__(ctx=ctx, timeout=300.0)
-        self.attachments = attachments
+        super().__init__(ctx=ctx, timeout=DRAFT_TIMEOUT)
         self.bot = bot
         self.ctx = ctx
         self.cog = cog
         self.config_cog = config_cog
-        self.content = content
         self.guild = guild
+        self.session = session
         self.delete_after = delete_after
         self.triggered = asyncio.Event()
         self.pool = self.bot.pool
         self._modal = None
-        self.add_item(TicketTagsSelect(cog))
+        self.add_item(TicketTagsSelect(session))
 
     def tick(self, status) -> str:
         if status is True:
             return "\U00002705"
         return "\U0000274c"
 
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        allowed = await super().interaction_check(interaction)
+        if allowed:
+            # The view's timeout restarts on every interaction, so the draft follows it
+            self.bot.drafts.extend(self.session)
+        return allowed
+
     async def delete_response(self, interaction: discord.Interaction):
         await interaction.response.defer()
         if self.delete_after:
@@ -435,14 +917,7 @@ class TicketConfirmView(RoboView):
     async def see_checklist(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ) -> None:
-        status = self.cog.in_progress_tickets.get(interaction.user.id)
-
-        if status is None:
-            await interaction.response.send_message(
-                "Unable to view checklist", ephemeral=True
-            )
-            return
-
+        status = self.session.status
         dict_status = {"title": status.title, "tags": status.tags}
         formatted_status = "\n".join(
             f"{self.tick(v.is_set())} - {k.title()}" for k, v in dict_status.items()
@@ -463,7 +938,7 @@ class TicketConfirmView(RoboView):
     async def set_title(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ) -> None:
-        self._modal = TicketTitleModal(self.ctx, self.cog)
+        self._modal = TicketTitleModal(self.ctx, self.session)
         await interaction.response.send_modal(self._modal)
 
     @discord.ui.button(
@@ -475,25 +950,17 @@ class TicketConfirmView(RoboView):
     async def confirm(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ) -> None:
-        await register_user(self.ctx.author.id, self.pool)
         author = self.ctx.author
 
         thread_display_id = uuid.uuid4()
         thread_name = f"{author.display_name} | {thread_display_id}"
         title = self._modal.input if self._modal and self._modal.input else thread_name
 
-        tags = self.cog.reserved_tags.get(interaction.user.id)
-        status = self.cog.in_progress_tickets.get(interaction.user.id)
-        if tags is None or status is None:
-            await interaction.response.send_message(
-                "Unable to obtain reserved tags and in progress tags",
-                ephemeral=True,
-            )
-            return
-
+        tags = self.session.tags
+        status = self.session.status
         applied_tags = [k for k, v in tags.items() if v is True]
 
-        guild_settings = await self.config_cog.get_guild_settings(self.guild.id)
+        guild_settings = self.bot.guild_configs.get_settings(self.guild.id)
         potential_member = await self.get_or_fetch_member(author.id)
 
         if not guild_settings:
@@ -539,37 +1006,54 @@ class TicketConfirmView(RoboView):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        files = [await attachment.to_file() for attachment in self.attachments]
-        ticket = TicketThread(
-            title=title,
-            user=author,
-            location_id=self.guild.id,
-            mention=guild_settings.mention,
-            content=self.content,
-            tags=applied_tags,
-            files=files,
-            created_at=discord.utils.utcnow(),
-        )
-        created_ticket = await self.cog.create_ticket(ticket)
+        # Held until the ticket is created, so confirming more than once (or from
+        # more than one prompt) can not create more than one thread
+        async with self.bot.drafts.lock(author.id):
+            # The index may not know about every ticket (for example, after another
+            # process changed it). Users are only remembered as having no ticket
+            # for a short while, after which this is checked against the database
+            existing = await get_partial_ticket(self.bot, author.id)
+            if existing.id is not None:
+                self.bot.drafts.close(author.id, self.session, reason="confirmed")
+                await interaction.response.send_message(
+                    "You already have an open ticket", ephemeral=True
+                )
+                self.stop()
+                return
 
-        if created_ticket is None:
-            await interaction.response.send_message(
-                "Rodhaj is not set up yet. Please contact the admin or staff",
-                ephemeral=True,
-            )
-            return
+            content = self.session.content
+            with await self.bot.attachments.fetch(
+                author.id, self.session.attachments, limit=self.guild.filesize_limit
+            ) as spooled:
+                ticket = TicketThread(
+                    title=title,
+                    user=author,
+                    location_id=self.guild.id,
+                    mention=guild_settings.mention,
+                    content=content,
+                    tags=applied_tags,
+                    files=spooled.to_files(),
+                    created_at=discord.utils.utcnow(),
+                )
+                created_ticket = await self.cog.create_ticket(ticket)
+
+            if created_ticket is None:
+                await interaction.response.send_message(
+                    "Rodhaj is not set up yet. Please contact the admin or staff",
+                    ephemeral=True,
+                )
+                return
+
+            self.bot.drafts.close(author.id, self.session, reason="confirmed")
 
         self.bot.dispatch(
             "ticket_create",
             self.guild,
             self.ctx.author,
             created_ticket.ticket,
-            safe_content(self.content),
+            safe_content(content),
         )
 
-        self.cog.reserved_tags.pop(self.ctx.author.id, None)
-        self.cog.in_progress_tickets.pop(self.ctx.author.id, None)
-
         if self.message:
             self.triggered.set()
 
@@ -578,6 +1062,8 @@ class TicketConfirmView(RoboView):
                 color=discord.Color.from_rgb(124, 252, 0),
             )
             embed.description = "The ticket has been successfully created. Please continue to DM Rodhaj in order to send the message to the ticket, where an assigned staff will help you."
+            if spooled.skipped:
+                embed.description += f"\n\nNote: {len(spooled.skipped)} attachment(s) could not be added, as they are too large or could not be downloaded"
             await self.message.edit(embed=embed, view=None, delete_after=15.0)
 
     @discord.ui.button(
@@ -591,9 +1077,12 @@ class TicketConfirmView(RoboView):
     ) -> None:
         await interaction.response.defer()
         await interaction.delete_original_response()
+        self.bot.drafts.close(self.ctx.author.id, self.session, reason="cancelled")
         self.stop()
 
     async def on_timeout(self) -> None:
+        self.bot.drafts.close(self.ctx.author.id, self.session, reason="timeout")
+
         # This is the only way you can really edit the original message
         # There is a bug here, where the message first gets edited and the timeout gets called
         # thus editing an unknown message
@@ -623,41 +1112,13 @@ class Tickets(commands.Cog):
         self.bot = bot
         self.pool = self.bot.pool
         self.logger = self.bot.logger
-        self.reserved_tags: dict[int, ReservedTags] = {}
-        self.in_progress_tickets: dict[int, StatusChecklist] = {}
 
     @property
     def display_emoji(self) -> discord.PartialEmoji:
         return discord.PartialEmoji(name="\U0001f3ab")
 
-    ### Tag selection utils
-
-    def add_in_progress_tag(self, author_id: int, tags: ReservedTags) -> ReservedTags:
-        reserved = self.reserved_tags.setdefault(author_id, tags)
-        return reserved
-
-    def add_status_checklist(
-        self, author_id: int, status: StatusChecklist
-    ) -> StatusChecklist:
-        return self.in_progress_tickets.setdefault(author_id, status)
-
     ### Conditions for closing tickets
 
-    async def can_close_ticket(self, ctx: RoboContext):
-        partial_ticket = await get_partial_ticket(self.bot, ctx.author.id)
-
-        if partial_ticket.id is None:
-            return False
-
-        if (
-            ctx.guild is None
-            and partial_ticket.owner_id == ctx.author.id
-            or await self.can_admin_close_ticket(ctx)
-        ):
-            return True
-
-        return False
-
     async def can_admin_close_ticket(self, ctx: RoboContext) -> bool:
         # More than likely it will be closed through the threads
         # That means, it must be done in a guild. Thus, we know that
@@ -684,6 +1145,11 @@ class Tickets(commands.Cog):
         if solved_tag is not None and not any(tag.id == solved_tag.id for tag in tags):
             tags.append(solved_tag)
 
+        # Tags can not be changed while a thread is archived, and this edit has to
+        # archive it again, so it has to be unarchived beforehand
+        if thread.archived:
+            thread = await thread.edit(archived=False, reason=reason)
+
         locked_thread = await thread.edit(
             applied_tags=tags, archived=True, locked=True, reason=reason
         )
@@ -692,97 +1158,125 @@ class Tickets(commands.Cog):
     async def soft_lock_ticket(
         self, thread: discord.Thread, reason: Optional[str] = None
     ) -> discord.Thread:
-        self.bot.metrics.features.locked_tickets.inc()
         tags = thread.applied_tags
         locked_tag = self.get_locked_tag(thread.parent)
 
         if locked_tag is not None and not any(tag.id == locked_tag.id for tag in tags):
             tags.insert(0, locked_tag)
 
-        return await thread.edit(applied_tags=tags, locked=True, reason=reason)
+        # Tags can only be changed on archived threads when they are unarchived as well
+        return await thread.edit(
+            applied_tags=tags, archived=False, locked=True, reason=reason
+        )
 
     async def soft_unlock_ticket(
         self, thread: discord.Thread, reason: Optional[str] = None
     ) -> discord.Thread:
-        self.bot.metrics.features.locked_tickets.dec()
         tags = thread.applied_tags
         locked_tag = self.get_locked_tag(thread.parent)
 
         if locked_tag is not None and any(tag.id == locked_tag.id for tag in tags):
             tags.remove(locked_tag)
 
-        return await thread.edit(applied_tags=tags, locked=False, reason=reason)
+        return await thread.edit(
+            applied_tags=tags, archived=False, locked=False, reason=reason
+        )
 
     async def close_ticket(
         self,
-        user: Union[discord.User, discord.Member, int],
-        connection: Union[asyncpg.Pool, asyncpg.Connection],
+        thread: discord.Thread,
+        owner: Optional[Union[discord.User, discord.Member]],
         author: Optional[Union[discord.User, discord.Member]] = None,
-    ) -> Optional[discord.Thread]:
-        self.bot.metrics.features.closed_tickets.inc()
-        self.bot.metrics.features.active_tickets.dec()
-        if isinstance(user, int):
-            user = self.bot.get_user(user) or (await self.bot.fetch_user(user))
-
-        connection = connection or self.pool
-        owned_ticket = await get_cached_thread(self.bot, user.id, connection)
-        if owned_ticket is None:
-            return None
-        thread = owned_ticket.thread
-
-        reason = f"Ticket closed by {user.name} (ID: {user.id})"
-        await self.lock_ticket(thread, reason)
-        self.bot.dispatch("ticket_close", thread.guild, user, thread, author)
-
-        return thread
+    ) -> discord.Thread:
+        closer = author or owner
+        reason = "Ticket closed"
+        if closer is not None:
+            reason = f"Ticket closed by {closer.name} (ID: {closer.id})"
+        return await self.lock_ticket(thread, reason)
 
-    async def notify_finished_ticket(self, ctx: RoboContext, owner_id: int):
+    async def notify_finished_ticket(
+        self,
+        ctx: RoboContext,
+        owner: Union[discord.User, discord.Member],
+        *,
+        admin: bool,
+    ) -> None:
         # We know that an admin must have closed it
-        if await self.can_admin_close_ticket(ctx):
-            user = self.bot.get_user(owner_id) or (await self.bot.fetch_user(owner_id))
+        if admin:
             user_description = f"The ticket is now closed. In order to make a new one, please DM Rodhaj with a new message to make a new ticket. (Hint: You can check if you have an active ticket by using the `{ctx.prefix}is_active` command)"
-            await user.send(embed=ClosedEmbed(description=user_description))
+            await self.bot.outbound.send(
+                ("dm", owner.id),
+                partial(owner.send, embed=ClosedEmbed(description=user_description)),
+            )
             return
         closed_embed = ClosedEmbed(description="You have closed the ticket")
         closed_embed.set_footer(
             text="In order to make a new one, please DM Rodhaj with a new message to make a new ticket."
         )
-        await ctx.author.send(embed=closed_embed)
+        await self.bot.outbound.send(
+            ("dm", owner.id), partial(owner.send, embed=closed_embed)
+        )
+
+    @contextmanager
+    def time_close_stage(self, stage: str) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.bot.metrics.closing.stages.labels(stage).observe(
+                time.perf_counter() - start
+            )
+
+    async def run_close_stage(self, stage: str, coro: Awaitable[T]) -> Optional[T]:
+        # Side effects of closing a ticket are isolated from each other,
+        # so a failed DM does not prevent the thread from being locked
+        with self.time_close_stage(stage):
+            try:
+                return await coro
+            except Exception:
+                self.bot.metrics.closing.failures.labels(stage).inc()
+                self.logger.exception("Failed to run the %r close stage", stage)
+                return None
+
+    async def resolve_owner(
+        self, owner_id: int
+    ) -> Optional[Union[discord.User, discord.Member]]:
+        return self.bot.get_user(owner_id) or await self.bot.fetch_user(owner_id)
 
-    ### Creation of tickets
+    async def lock_closed_ticket(
+        self,
+        ctx: RoboContext,
+        owned_ticket: Optional[ThreadWithGuild],
+        owner: Optional[Union[discord.User, discord.Member]],
+        author: Optional[Union[discord.User, discord.Member]],
+    ) -> None:
+        # Discord refuses reactions on archived threads,
+        # so the tick has to land before the thread is locked
+        await self.run_close_stage("tick", self.tick_post(ctx))
+        if owned_ticket is not None:
+            await self.run_close_stage(
+                "lock", self.close_ticket(owned_ticket.thread, owner, author)
+            )
 
     async def create_ticket(self, ticket: TicketThread) -> Optional[TicketOutput]:
-        query = """
-        SELECT ticket_channel_id
-        FROM guild_config
-        WHERE id = $1;
-        """
-        ticket_query = """
-        INSERT INTO tickets (thread_id, owner_id, location_id)
-        VALUES ($1, $2, $3);
-        """
-        ticket_channel_id = await self.pool.fetchval(query, ticket.location_id)
-        if ticket_channel_id is None:
+        # The user is about to own a ticket, so they can no longer be considered missing
+        self.bot.ticket_index.invalidate_missing(ticket.user.id)
+
+        guild_config = self.bot.guild_configs.get(ticket.location_id)
+        if guild_config is None or guild_config.ticket_channel_id is None:
             self.logger.error(
                 "No tickets channel found for server with ID %d. Cannot make ticket",
                 ticket.location_id,
             )
             return
 
-        # Should fetch channel and add to cache if not found
-        tc = self.bot.get_channel(ticket_channel_id) or await self.bot.fetch_channel(
-            ticket_channel_id
-        )
-
         # It should be a forum channel....
-        if not isinstance(tc, discord.ForumChannel):
+        forum = await self.bot.forums.resolve(guild_config.ticket_channel_id)
+        if forum is None:
             return
 
-        all_tags = tc.available_tags
-        applied_tags = [
-            discord.utils.get(all_tags, name=tag.title()) for tag in ticket.tags
-        ]
-        processed_tags = [tag for tag in applied_tags if tag is not None]
+        tc = forum.channel
+        processed_tags = forum.get_tags([tag.title() for tag in ticket.tags])
 
         content = f"({ticket.mention} - {ticket.user.display_name}, {discord.utils.format_dt(ticket.created_at)})\n\n{ticket.content}"
         created_ticket = await tc.create_thread(
@@ -793,99 +1287,85 @@ class Tickets(commands.Cog):
             reason=f"Ticket submitted by {ticket.user.global_name} (ID: {ticket.user.id})",
         )
 
-        async with self.pool.acquire() as conn:
-            tr = conn.transaction()
-            await tr.start()
+        try:
+            row = await CREATE_TICKET.fetchrow(
+                self.pool,
+                created_ticket.thread.id,
+                ticket.user.id,
+                ticket.location_id,
+                *self.bot.notifier.target,
+            )
+        except asyncpg.UniqueViolationError:
+            await self.lock_ticket(
+                created_ticket.thread,
+                reason=f"Attempted to create duplicate ticket (User ID: {ticket.user.id})",
+            )
+            return TicketOutput(
+                status=False,
+                ticket=created_ticket,
+                msg="You already have an ticket. Please ensure that you have closed all tickets before creating a new one.",
+            )
+        except Exception:
+            await self.lock_ticket(
+                created_ticket.thread,
+                reason=f"Failed to create ticket (User ID: {ticket.user.id})",
+            )
+            return TicketOutput(
+                status=False,
+                ticket=created_ticket,
+                msg="Could not create ticket",
+            )
 
-            try:
-                await conn.execute(
-                    ticket_query,
-                    created_ticket.thread.id,
-                    ticket.user.id,
-                    ticket.location_id,
-                )
-            except asyncpg.UniqueViolationError:
-                await tr.rollback()
-                await self.lock_ticket(
-                    created_ticket.thread,
-                    reason=f"Attempted to create duplicate ticket (User ID: {ticket.user.id})",
-                )
-                return TicketOutput(
-                    status=False,
-                    ticket=created_ticket,
-                    msg="You already have an ticket. Please ensure that you have closed all tickets before creating a new one.",
-                )
-            except Exception:
-                await tr.rollback()
-                await self.lock_ticket(
-                    created_ticket.thread,
-                    reason=f"Failed to create ticket (User ID: {ticket.user.id})",
-                )
-                return TicketOutput(
-                    status=False,
-                    ticket=created_ticket,
-                    msg="Could not create ticket",
-                )
-            else:
-                self.bot.metrics.features.active_tickets.inc()
-                await tr.commit()
-                return TicketOutput(
-                    status=True,
-                    ticket=created_ticket,
-                    msg="Ticket successfully created. In order to use this ticket, please continue sending messages to Rodhaj. The messages will be directed towards the appropriate ticket.",
-                )
+        self.bot.counters.opened()
+        self.bot.ticket_index.add(PartialTicket(row))
+        return TicketOutput(
+            status=True,
+            ticket=created_ticket,
+            msg="Ticket successfully created. In order to use this ticket, please continue sending messages to Rodhaj. The messages will be directed towards the appropriate ticket.",
+        )
 
     ### Obtaining owner of tickets
-    @alru_cache()
+
+    async def get_ticket_by_thread(self, thread_id: int) -> Optional[PartialTicket]:
+        ticket = self.bot.ticket_index.get_by_thread(thread_id)
+        if ticket is None:
+            row = await GET_TICKET_BY_THREAD.fetchrow(self.pool, thread_id)
+            if row is None:
+                return None
+            ticket = PartialTicket(row)
+            self.bot.ticket_index.add(ticket)
+        return ticket
+
     async def get_ticket_owner_id(self, thread_id: int) -> Optional[discord.User]:
-        query = """
-        SELECT owner_id
-        FROM tickets
-        WHERE thread_id = $1;
-        """
-        owner_id = await self.pool.fetchval(query, thread_id)
-        if owner_id is None:
-            self.get_ticket_owner_id.cache_invalidate(thread_id)
+        ticket = await self.get_ticket_by_thread(thread_id)
+        if ticket is None:
             return None
+
+        owner_id = ticket.owner_id
         user = self.bot.get_user(owner_id) or (await self.bot.fetch_user(owner_id))
         return user
 
     ### Misc Utils
 
-    async def obtain_webhook(self, guild_id: int) -> Optional[discord.Webhook]:
-        dispatcher = GuildWebhookDispatcher(self.bot, guild_id)
-        return await dispatcher.get_webhook()
-
     async def tick_post(self, ctx: RoboContext) -> None:
-        await ctx.message.add_reaction(discord.PartialEmoji(name="\U00002705"))
+        await self.bot.outbound.send(
+            ("reaction", ctx.channel.id),
+            partial(ctx.message.add_reaction, discord.PartialEmoji(name="\U00002705")),
+        )
 
     def get_solved_tag(
         self,
         channel: Optional[Union[discord.ForumChannel, discord.TextChannel]],
-    ):
-        if not isinstance(channel, discord.ForumChannel):
-            return None
-
-        all_tags = channel.available_tags
-
-        solved_tag = discord.utils.get(all_tags, name="Resolved")
-        if solved_tag is None:
-            return None
-        return solved_tag
+    ) -> Optional[discord.ForumTag]:
+        forum = self.bot.forums.get_metadata(channel)
+        return forum and forum.resolved_tag
 
     def get_locked_tag(
         self,
         channel: Optional[Union[discord.ForumChannel, discord.TextChannel]],
-    ):
-        if not isinstance(channel, discord.ForumChannel):
-            return None
-
-        all_tags = channel.available_tags
-
-        locked_tag = discord.utils.get(all_tags, name="Locked")
-        if locked_tag is None:
-            return None
-        return locked_tag
+    ) -> Optional[discord.ForumTag]:
+        forum = self.bot.forums.get_metadata(channel)
+        return forum and forum.locked_tag
 
     ### Feature commands
 
@@ -901,38 +1381,66 @@ class Tickets(commands.Cog):
         and has Manage Threads permissions, then they can
         also close the ticket.
         """
-        query = """
-        DELETE FROM tickets
-        WHERE thread_id = $1 AND owner_id = $2;
-        """
-        get_owner_id_query = """
-        SELECT owner_id
-        FROM tickets
-        WHERE thread_id = $1 AND location_id = $2;
-        """
+        start = time.perf_counter()
+
+        # Finding, authorizing and removing the ticket is done in one statement.
+        # Staff can close the ticket they are in, while owners can only close their
+        # own ticket through DMs. No connection is held past this point,
+        # so slow Discord requests can not starve the pool
+        with self.time_close_stage("commit"):
+            admin = await self.can_admin_close_ticket(ctx)
+            row = None
+            if admin and ctx.guild is not None:
+                row = await CLOSE_TICKET_BY_THREAD.fetchrow(
+                    self.pool, ctx.channel.id, ctx.guild.id, *self.bot.notifier.target
+                )
+            elif ctx.guild is None:
+                row = await CLOSE_TICKET_BY_OWNER.fetchrow(
+                    self.pool, ctx.author.id, *self.bot.notifier.target
+                )
 
-        async with self.pool.acquire() as conn:
-            if await self.can_close_ticket(ctx):
-                owner_id = ctx.author.id
-                if await self.can_admin_close_ticket(ctx):
-                    owner_id = await conn.fetchval(
-                        get_owner_id_query,
-                        ctx.channel.id,
-                        self.bot.transprogrammer_guild_id,
-                    )
-
-                await self.tick_post(ctx)
-                closed_ticket = await self.close_ticket(ctx.author, conn)
-                if closed_ticket is None:
-                    await ctx.send(
-                        "The ticket can not be found. Are you sure you have an open ticket?"
-                    )
-                    return
-                await conn.execute(query, closed_ticket.id, owner_id)
-                get_cached_thread.cache_invalidate(self.bot, owner_id, self.pool)
-                get_partial_ticket.cache_invalidate(self.bot, owner_id, self.pool)
-                self.get_ticket_owner_id.cache_invalidate(closed_ticket.id)
-                await self.notify_finished_ticket(ctx, owner_id)
+        if row is None:
+            await ctx.send(
+                "The ticket can not be found. Are you sure you have an open ticket?"
+            )
+            return
+
+        ticket = PartialTicket(row)
+        self.bot.ticket_index.remove(ticket.owner_id)
+        self.bot.ticket_index.mark_missing(ticket.owner_id)
+        self.bot.metrics.features.closed_tickets.inc()
+        self.bot.counters.closed(locked=ticket.locked)
+
+        # The ticket is already gone from the database at this point, so failing
+        # to find the thread or the owner must not stop the rest of the stages
+        owned_ticket, owner = await asyncio.gather(
+            self.run_close_stage("resolve", get_ticket_thread(self.bot, ticket)),
+            self.run_close_stage("owner", self.resolve_owner(ticket.owner_id)),
+        )
+        self.bot.threads.invalidate(ticket.thread_id)
+
+        author = ctx.author if admin else None
+        stages = [self.lock_closed_ticket(ctx, owned_ticket, owner, author)]
+        if owner is not None:
+            stages.append(
+                self.run_close_stage(
+                    "notify", self.notify_finished_ticket(ctx, owner, admin=admin)
+                )
+            )
+        if owned_ticket is not None:
+            thread = owned_ticket.thread
+            self.bot.dispatch(
+                "ticket_close", thread.guild, owner, ticket.owner_id, thread, author
+            )
+        else:
+            self.logger.warning(
+                "Closed ticket %d, but its thread (ID: %d) could not be found",
+                ticket.id,
+                ticket.thread_id,
+            )
+
+        await asyncio.gather(*stages)
+        self.bot.metrics.closing.latency.observe(time.perf_counter() - start)
 
     # 10 command invocations per 12 seconds for each member
     # These values should not be tripped unless someone is spamming
@@ -954,8 +1462,7 @@ class Tickets(commands.Cog):
             return
         partial_ticket_owner = await get_partial_ticket(self.bot, ticket_owner.id)
 
-        dispatcher = GuildWebhookDispatcher(self.bot, ctx.guild.id)
-        tw = await dispatcher.get_ticket_webhook()
+        tw = await self.bot.webhooks.get_ticket_webhook(ctx.guild.id)
         if tw is None:
             await ctx.send("Could not find webhook")
             return
@@ -973,15 +1480,39 @@ class Tickets(commands.Cog):
                 await ctx.send("This ticket is locked. You cannot reply in this ticket")
                 return
 
-            # May hit the ratelimit hard. Note this
-            await ctx.message.delete(delay=30.0)
-            await tw.send(
-                content=message,
-                username=f"[REPLY] {ctx.author.display_name}",
-                avatar_url=ctx.author.display_avatar.url,
-                thread=ctx.channel,
+        # The command message is deleted, so its attachments have to be uploaded again
+        # The files are sent to both the ticket and the owner's DMs
+        with await self.bot.attachments.fetch(
+            ticket_owner.id,
+            ctx.message.attachments,
+            limit=min(ctx.guild.filesize_limit, DM_FILESIZE_LIMIT),
+        ) as spooled:
+            if isinstance(ctx.channel, discord.Thread):
+                # May hit the ratelimit hard. Note this
+                await ctx.message.delete(delay=30.0)
+                # Files are made on every attempt, as an upload consumes them
+                await self.bot.outbound.send(
+                    ("webhook", tw.id),
+                    lambda: tw.send(
+                        content=message,
+                        username=f"[REPLY] {ctx.author.display_name}",
+                        avatar_url=ctx.author.display_avatar.url,
+                        thread=ctx.channel,  # type: ignore
+                        files=spooled.to_files(),
+                    ),
+                    priority=Priority.HIGH,
+                )
+            await self.bot.outbound.send(
+                ("dm", ticket_owner.id),
+                lambda: ticket_owner.send(embed=embed, files=spooled.to_files()),
+                priority=Priority.HIGH,
+            )
+
+        if spooled.skipped:
+            await ctx.send(
+                f"{len(spooled.skipped)} attachment(s) could not be sent, "
+                "as they are too large or could not be downloaded"
             )
-        await ticket_owner.send(embed=embed)
 
     ### Ticket information
 
@@ -1038,8 +1569,29 @@ class Tickets(commands.Cog):
     # we need to invalidate it if a guild goes
     @commands.Cog.listener()
     async def on_guild_remove(self, guild: discord.Guild) -> None:
-        dispatcher = GuildWebhookDispatcher(self.bot, guild.id)
-        dispatcher.get_config.cache_invalidate()
+        self.bot.webhooks.invalidate(guild.id)
+        self.bot.forums.invalidate_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ) -> None:
+        self.bot.forums.refresh(after)
+
+    @commands.Cog.listener()
+    async def on_thread_update(
+        self, before: discord.Thread, after: discord.Thread
+    ) -> None:
+        self.bot.threads.refresh(after)
+
+    @commands.Cog.listener()
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent) -> None:
+        # The raw event is used, as the thread may not be in discord.py's cache
+        self.bot.threads.invalidate(payload.thread_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self.bot.forums.invalidate(channel.id)
 
     @commands.Cog.listener()
     async def on_ticket_create(
@@ -1049,36 +1601,33 @@ class Tickets(commands.Cog):
         ticket: discord.channel.ThreadWithMessage,
         init_message: str,
     ) -> None:
-        webhook = await self.obtain_webhook(guild.id)
-
-        if webhook is not None:
-            embed = LoggingEmbed(title=f"{TICKET_EMOJI} New Ticket")
-            embed.description = init_message
-            embed.add_field(name="Owner", value=user.mention)
-            embed.add_field(name="Link", value=ticket.thread.mention)
-            await webhook.send(embed=embed)
+        embed = LoggingEmbed(title=f"{TICKET_EMOJI} New Ticket")
+        embed.description = init_message
+        embed.add_field(name="Owner", value=user.mention)
+        embed.add_field(name="Link", value=ticket.thread.mention)
+        self.bot.logs.submit(guild.id, embed)
 
     @commands.Cog.listener()
     async def on_ticket_close(
         self,
         guild: discord.Guild,
-        user: Union[discord.User, discord.Member],
+        user: Optional[Union[discord.User, discord.Member]],
+        owner_id: int,
         ticket: discord.Thread,
         author: Optional[Union[discord.User, discord.Member]] = None,
     ) -> None:
-        webhook = await self.obtain_webhook(guild.id)
-
-        if webhook is not None:
-            embed = LoggingEmbed(
-                title="\U0001f512 Ticket Closed",
-                color=discord.Color.from_rgb(194, 163, 255),
-            )
-            embed.description = f"The ticket has closed at {format_dt(utcnow())}"
-            if author is not None:
-                embed.add_field(name="Closed By", value=author.mention)
-            embed.add_field(name="Owner", value=user.mention)
-            embed.add_field(name="Link", value=ticket.mention)
-            await webhook.send(embed=embed)
+        embed = LoggingEmbed(
+            title="\U0001f512 Ticket Closed",
+            color=discord.Color.from_rgb(194, 163, 255),
+        )
+        embed.description = f"The ticket has closed at {format_dt(utcnow())}"
+        if author is not None:
+            embed.add_field(name="Closed By", value=author.mention)
+        embed.add_field(
+            name="Owner", value=user.mention if user is not None else f"<@{owner_id}>"
+        )
+        embed.add_field(name="Link", value=ticket.mention)
+        self.bot.logs.submit(guild.id, embed)
 
     @reply.error
     async def on_reply_error(
@@ -13,6 +13,7 @@ from discord.ext import commands
 from pygit2.enums import SortMode
 from utils.checks import is_docker
 from utils.embeds import Embed
+from utils.queries import PING
 from utils.time import human_timedelta
 
 if TYPE_CHECKING:
@@ -67,13 +68,6 @@ class Utilities(commands.Cog):
         repo = pygit2.Repository(".git")  # type: ignore
         return repo.head.shorthand
 
-    async def fetch_num_active_tickets(self) -> int:
-        query = "SELECT COUNT(*) FROM tickets;"
-        value = await self.bot.pool.fetchval(query)
-        if value is None:
-            return 0
-        return value
-
     ### Commands
 
     @commands.hybrid_command(name="about")
@@ -129,9 +123,7 @@ class Utilities(commands.Cog):
             name="Process",
             value=f"{memory_usage:.2f} MiB\n{cpu_usage:.2f}% CPU",
         )
-        embed.add_field(
-            name="Active Tickets", value=await self.fetch_num_active_tickets()
-        )
+        embed.add_field(name="Active Tickets", value=self.bot.counters.active)
         embed.add_field(name="Version", value=str(self.bot.version))
         embed.add_field(name="Uptime", value=self.get_bot_uptime(brief=True))
         await ctx.send(embed=embed)
@@ -140,7 +132,7 @@ class Utilities(commands.Cog):
     async def ping(self, ctx: RoboContext) -> None:
         """Obtains ping information"""
         start = perf_counter()
-        await self.bot.pool.fetchrow("SELECT 1")
+        await PING.fetchrow(self.bot.pool)
         end = perf_counter()
         db_ping = end - start
 
@@ -1,11 +1,13 @@
 import os
 import signal
+from contextlib import AsyncExitStack
 from pathlib import Path
 
 import asyncpg
 from aiohttp import ClientSession
 from rodhaj import KeyboardInterruptHandler, Rodhaj, RodhajLogger, init
 from utils.config import RodhajConfig
+from utils.queries import CatalogConnection
 
 if os.name == "nt":
     from winloop import run
@@ -17,20 +19,36 @@ config = RodhajConfig(config_path)
 
 TOKEN = config["rodhaj"]["token"]
 POSTGRES_URI = config["postgres_uri"]
+POOL = config.get("pool", {})
+REPLICA_URIS = config.get("replicas", {}).get("uris", [])
+
+
+def create_pool(dsn: str) -> asyncpg.Pool:
+    return asyncpg.create_pool(
+        dsn=dsn,
+        min_size=POOL.get("min_size", 25),
+        max_size=POOL.get("max_size", 25),
+        max_inactive_connection_lifetime=POOL.get(
+            "max_inactive_connection_lifetime", 300.0
+        ),
+        init=init,
+        connection_class=CatalogConnection,
+        command_timeout=POOL.get("command_timeout", 30),
+    )
 
 
 async def main() -> None:
     async with (
         ClientSession() as session,
-        asyncpg.create_pool(
-            dsn=POSTGRES_URI,
-            min_size=25,
-            max_size=25,
-            init=init,
-            command_timeout=30,
-        ) as pool,
+        create_pool(POSTGRES_URI) as pool,
+        AsyncExitStack() as stack,
     ):
-        async with Rodhaj(config=config, session=session, pool=pool) as bot:
+        replicas = [
+            await stack.enter_async_context(create_pool(uri)) for uri in REPLICA_URIS
+        ]
+        async with Rodhaj(
+            config=config, session=session, pool=pool, replicas=replicas
+        ) as bot:
             bot.loop.add_signal_handler(signal.SIGTERM, KeyboardInterruptHandler(bot))
             bot.loop.add_signal_handler(signal.SIGINT, KeyboardInterruptHandler(bot))
             await bot.start(TOKEN)
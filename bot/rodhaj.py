@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from functools import partial
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from types import TracebackType
@@ -9,41 +10,54 @@ from typing import TYPE_CHECKING, Optional, Type, TypeVar, Union
 
 import asyncpg
 import discord
-import orjson
+import msgspec
 from aiohttp import ClientSession
 from cogs import EXTENSIONS, VERSION
-from cogs.config import Blocklist, GuildWebhookDispatcher
+from cogs.config import Blocklist, GuildConfigStore, WebhookRegistry
 from cogs.ext.prometheus import Metrics
 from cogs.tickets import (
-    PartialConfig,
-    ReservedTags,
-    StatusChecklist,
+    DraftStore,
+    ForumMetadataCache,
+    ThreadResolver,
     TicketConfirmView,
+    TicketIndex,
     get_cached_thread,
     get_partial_ticket,
 )
 from discord import app_commands
 from discord.ext import commands
 from utils import RoboContext, RodhajCommandTree, RodhajHelp
+from utils.attachments import AttachmentPipeline
 from utils.config import RodhajConfig
-from utils.prefix import get_prefix
+from utils.counters import TicketCounters
+from utils.logsink import LogSink
+from utils.notify import InvalidationNotifier
+from utils.outbound import OutboundDispatcher, Priority
+from utils.pool import PoolSupervisor
+from utils.prefix import PrefixResolver, get_prefix
+from utils.queries import CatalogConnection, catalog
+from utils.relay import RelayMessage, RelayScheduler
 from utils.reloader import Reloader
+from utils.replicas import Replica, ReplicaRouter
 
 if TYPE_CHECKING:
-    from cogs.config import Config
+    from cogs.config import Config, GuildConfig
     from cogs.tickets import Tickets
     from utils.context import RoboContext
 
 BE = TypeVar("BE", bound=BaseException)
 
 
-async def init(conn: asyncpg.Connection):
+async def init(conn: CatalogConnection):
     # Refer to https://github.com/MagicStack/asyncpg/issues/140#issuecomment-301477123
+    # Values can be dicts or msgspec structs
     def _encode_jsonb(value):
-        return b"\x01" + orjson.dumps(value)
+        return b"\x01" + msgspec.json.encode(value)
 
+    # The raw JSON (without the version byte) is handed over as-is, so it can be
+    # decoded straight into the right type. See utils.rows.RowDecoder
     def _decode_jsonb(value):
-        return orjson.loads(value[1:].decode("utf-8"))
+        return memoryview(value)[1:]
 
     await conn.set_type_codec(
         "jsonb",
@@ -52,6 +66,7 @@ async def init(conn: asyncpg.Connection):
         decoder=_decode_jsonb,
         format="binary",
     )
+    await catalog.prepare(conn)
 
 
 class KeyboardInterruptHandler:
@@ -111,6 +126,7 @@ class Rodhaj(commands.Bot):
         session: ClientSession,
         pool: asyncpg.Pool,
         *args,
+        replicas: Optional[list[asyncpg.Pool]] = None,
         **kwargs,
     ):
         intents = discord.Intents(
@@ -140,9 +156,45 @@ class Rodhaj(commands.Bot):
         self.default_prefix = "r>"
         self.logger = logging.getLogger("rodhaj")
         self.metrics = Metrics(self)
+        self.counters = TicketCounters(self)
         self.session = session
-        self.partial_config: Optional[PartialConfig] = None
+        self.ticket_index = TicketIndex(self)
+        self.drafts = DraftStore(self)
+        self.forums = ForumMetadataCache(self)
+        self.threads = ThreadResolver(self)
+        self.webhooks = WebhookRegistry(self)
+        self.guild_configs = GuildConfigStore(self)
+        self.notifier = InvalidationNotifier(self, config["postgres_uri"])
         self.pool = pool
+        adaptive = config.get("pool", {}).get("adaptive", {})
+        self.pool_supervisor = PoolSupervisor(
+            self,
+            pool,
+            adaptive=adaptive.get("enabled", False),
+            interval=adaptive.get("interval", 15.0),
+            grow_wait=adaptive.get("grow_wait", 0.05),
+            step=adaptive.get("step", 2),
+        )
+        catalog.supervise(self.pool_supervisor)
+        replica_config = config.get("replicas", {})
+        self.replicas = ReplicaRouter(
+            self,
+            pool,
+            [
+                Replica(f"replica-{idx}", replica_pool)
+                for idx, replica_pool in enumerate(replicas or [])
+            ],
+            max_lag=replica_config.get("max_lag", 5.0),
+            interval=replica_config.get("interval", 10.0),
+        )
+        self.replica_supervisors = [
+            PoolSupervisor(self, replica.pool, name=replica.name)
+            for replica in self.replicas.replicas
+        ]
+        for supervisor in self.replica_supervisors:
+            catalog.supervise(supervisor)
+        catalog.router = self.replicas
+        self.prefixes = PrefixResolver(self)
         self.version = str(VERSION)
         self.transprogrammer_guild_id = config.rodhaj.get(
             "guild_id", 1183302385020436480
@@ -150,18 +202,95 @@ class Rodhaj(commands.Bot):
         self._dev_mode = config.rodhaj.get("dev_mode", False)
         self._reloader = Reloader(self, Path(__file__).parent)
         self._prometheus = config.rodhaj.get("prometheus", {})
+        self._logs = config.rodhaj.get("logs", {})
+        self._outbound = config.rodhaj.get("outbound", {})
+        self._relay = config.rodhaj.get("relay", {})
+        self._attachments = config.rodhaj.get("attachments", {})
+        self.logs = LogSink(self, window=self._logs.get("window", 2.0))
+        self.outbound = OutboundDispatcher(
+            self,
+            workers=self._outbound.get("workers", 4),
+            max_retries=self._outbound.get("max_retries", 3),
+        )
+        coalesce = self._relay.get("coalesce", {})
+        self.relay = RelayScheduler(
+            self,
+            self.relay_message,
+            workers=self._relay.get("workers", 4),
+            max_queue_size=self._relay.get("max_queue_size", 25),
+            max_pending=self._relay.get("max_pending", 1000),
+            coalesce_window=(
+                coalesce.get("window", 1.0) if coalesce.get("enabled", False) else 0.0
+            ),
+            coalesce_max_messages=coalesce.get("max_messages", 10),
+            coalesce_max_length=coalesce.get("max_length", 2000),
+        )
+        self.attachments = AttachmentPipeline(
+            self,
+            concurrency=self._attachments.get("concurrency", 4),
+            spool_threshold=self._attachments.get("spool_threshold", 1024 * 1024),
+            spool_dir=self._attachments.get("spool_dir"),
+            max_ticket_bytes=self._attachments.get(
+                "max_ticket_size", 100 * 1024 * 1024
+            ),
+        )
 
     ### Ticket related utils
-    async def fetch_partial_config(self) -> Optional[PartialConfig]:
-        query = """
-        SELECT id, ticket_channel_id, logging_channel_id
-        FROM guild_config
-        WHERE id = $1;
+    @property
+    def partial_config(self) -> Optional[GuildConfig]:
+        return self.guild_configs.get(self.transprogrammer_guild_id)
+
+    async def relay_message(self, message: RelayMessage) -> None:
+        webhook = await self.webhooks.get_ticket_webhook(message.thread.guild.id)
+        if webhook is None:
+            return
+
+        with await self.attachments.fetch(
+            message.author.id,
+            message.attachments,
+            limit=message.thread.guild.filesize_limit,
+        ) as spooled:
+            # Files are made on every attempt, as an upload consumes them
+            await self.outbound.send(
+                ("webhook", webhook.id),
+                lambda: webhook.send(
+                    message.content,
+                    username=f"[RESPONSE] {message.author.display_name}",
+                    avatar_url=message.author.display_avatar.url,
+                    thread=message.thread,
+                    files=spooled.to_files(),
+                ),
+                priority=Priority.HIGH,
+            )
+
+        if spooled.skipped:
+            await self.outbound.send(
+                ("dm", message.author.id),
+                partial(
+                    message.author.send,
+                    f"{len(spooled.skipped)} attachment(s) could not be sent to your ticket, "
+                    "as they are too large or could not be downloaded",
+                ),
+            )
+
+    async def acknowledge_draft(self, message: discord.Message, appended: bool) -> None:
+        """Lets the author know whether their DM was added to their ticket draft
+
+        Args:
+            message (discord.Message): The DM that was added
+            appended (bool): Whether the DM fit in the draft
         """
-        rows = await self.pool.fetchrow(query, self.transprogrammer_guild_id)
-        if rows is None:
-            return None
-        return PartialConfig(rows)
+        if not appended:
+            await message.author.send(
+                "Your ticket draft is full. "
+                "Please confirm it first, and then send the rest of your message"
+            )
+            return
+
+        await self.outbound.send(
+            ("reaction", message.channel.id),
+            partial(message.add_reaction, discord.PartialEmoji(name="\U00002705")),
+        )
 
     ### Bot-related overrides
 
@@ -252,6 +381,8 @@ class Rodhaj(commands.Bot):
             potential_ticket = await get_partial_ticket(self, author.id, self.pool)
 
             # Represents that there is no active ticket
+            session = None
+            opened = appended = False
             if potential_ticket.id is None:
                 # We might want to validate the content type here...
                 if len(message.attachments) > 10:
@@ -262,14 +393,27 @@ class Rodhaj(commands.Bot):
                     await author.send(over_msg)
                     return
 
+                # Finding and opening the draft is done under the user's lock, so
+                # DMs that arrive at once can not each prompt the user. The lock is
+                # also held while confirming, which may have created the ticket
+                async with self.drafts.lock(author.id):
+                    if author.id not in self.drafts:
+                        potential_ticket = await get_partial_ticket(
+                            self, author.id, self.pool
+                        )
+                    if potential_ticket.id is None:
+                        session, opened = self.drafts.open(author.id)
+                        appended = session.append(message.content, message.attachments)
+
+            if session is not None:
+                # Follow-up messages are added to the draft that is awaiting
+                # confirmation, instead of prompting the user again
+                if not opened:
+                    await self.acknowledge_draft(message, appended)
+                    return
+
                 tickets_cog: Tickets = self.get_cog("Tickets")  # type: ignore
                 config_cog: Config = self.get_cog("Config")  # type: ignore
-                default_tags = ReservedTags(
-                    question=False, serious=False, private=False
-                )
-                status_checklist = StatusChecklist()
-                tickets_cog.add_in_progress_tag(author.id, default_tags)
-                tickets_cog.add_status_checklist(author.id, status_checklist)
                 guild = self.get_guild(self.transprogrammer_guild_id) or (
                     await self.fetch_guild(self.transprogrammer_guild_id)
                 )
@@ -288,30 +432,39 @@ class Rodhaj(commands.Bot):
                 )
 
                 view = TicketConfirmView(
-                    message.attachments,
-                    self,
-                    ctx,
-                    tickets_cog,
-                    config_cog,
-                    message.content,
-                    guild,
+                    self, ctx, tickets_cog, config_cog, guild, session
                 )
                 view.message = await author.send(embed=embed, view=view)
                 return
 
-            # The thread is cached within an LRU cache to heavily speedup performance
-            cached_thread = await get_cached_thread(self, author.id, self.pool)
+            # The ticket is resolved through the in-memory ticket index,
+            # so relaying a message does not require any database round trips
+            cached_thread = await get_cached_thread(
+                self, author.id, self.pool, unarchive=True
+            )
 
             if cached_thread is not None:
-                dispatcher = GuildWebhookDispatcher(self, cached_thread.source_guild.id)
-                webhook = await dispatcher.get_ticket_webhook()
-                if webhook is not None:
-                    await webhook.send(
-                        message.content,
-                        username=f"[RESPONSE] {author.display_name}",
-                        avatar_url=author.display_avatar.url,
+                # Relays are handed off to the scheduler, which keeps the messages
+                # of each ticket in order without blocking on slow webhook sends
+                relayed = self.relay.submit(
+                    RelayMessage(
+                        ticket_id=potential_ticket.id,
                         thread=cached_thread.thread,
+                        author=author,
+                        content=message.content,
+                        attachments=message.attachments,
                     )
+                )
+                if not relayed:
+                    await author.send(
+                        "You are sending messages too quickly. "
+                        "Please wait a moment and try again"
+                    )
+            else:
+                await author.send(
+                    "Your message could not be sent, as the thread of your ticket "
+                    "could not be found. Please contact the staff team"
+                )
 
             return
         await self.process_commands(message, ctx)
@@ -327,7 +480,17 @@ class Rodhaj(commands.Bot):
         await self.load_extension("jishaku")
 
         await self.blocklist.load()
-        self.partial_config = await self.fetch_partial_config()
+        await self.ticket_index.load()
+        await self.guild_configs.load()
+        await self.counters.load()
+        self.notifier.start()
+        self.pool_supervisor.start()
+        for supervisor in self.replica_supervisors:
+            supervisor.start()
+        self.replicas.start()
+        self.counters.start()
+        self.outbound.start()
+        self.relay.start()
 
         if self._prometheus.get("enabled", False):
             await self.load_extension("cogs.ext.prometheus")
@@ -343,6 +506,20 @@ class Rodhaj(commands.Bot):
             self.logger.info("Dev mode is enabled. Loading Reloader")
             self._reloader.start()
 
+    async def close(self) -> None:
+        # Relays and logs are sent through the outbound dispatcher,
+        # so these need to be drained before the dispatcher is stopped
+        await self.relay.stop()
+        await self.logs.flush()
+        await self.outbound.stop()
+        await self.notifier.stop()
+        await self.counters.stop()
+        await self.pool_supervisor.stop()
+        await self.replicas.stop()
+        for supervisor in self.replica_supervisors:
+            await supervisor.stop()
+        await super().close()
+
     async def on_ready(self):
         if not hasattr(self, "uptime"):
             self.uptime = discord.utils.utcnow()
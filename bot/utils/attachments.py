@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import tempfile
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import aiohttp
+import discord
+
+if TYPE_CHECKING:
+    from bot.rodhaj import Rodhaj
+
+CHUNK_SIZE = 64 * 1024
+# Discord's upload limit for DMs, which have no boosts to raise it
+DM_FILESIZE_LIMIT = 10 * 1024 * 1024
+
+
+class SpooledFile(io.BufferedIOBase):
+    """A `tempfile.SpooledTemporaryFile` that is always an `io.IOBase`
+
+    Before Python 3.11, spooled files are not an `io.IOBase`, which `discord.File`
+    requires in order to treat them as a file object rather than as a path.
+    """
+
+    def __init__(self, max_size: int, dir: Optional[str] = None):
+        super().__init__()
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_size, dir=dir)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self._file.read(-1 if size is None else size)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def write(self, data) -> int:
+        return self._file.write(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class SpooledAttachment:
+    """A downloaded attachment that can be uploaded again
+
+    The contents are kept in memory while they are small, and are moved to a
+    temporary file once they grow past the spooling threshold. A new
+    `discord.File` is made for every upload, so requests that are retried
+    can read the contents again.
+    """
+
+    __slots__ = ("filename", "spoiler", "description", "size", "fp")
+
+    def __init__(self, attachment: discord.Attachment, fp: SpooledFile, size: int):
+        self.filename = attachment.filename
+        self.spoiler = attachment.is_spoiler()
+        self.description = attachment.description
+        self.size = size
+        self.fp = fp
+
+    def to_file(self) -> discord.File:
+        self.fp.seek(0)
+        return discord.File(
+            self.fp,
+            filename=self.filename,
+            spoiler=self.spoiler,
+            description=self.description,
+        )
+
+    def close(self) -> None:
+        # discord.File stubs out close() on the files it is given until it is closed
+        # itself, which is not the case for files that were never sent
+        SpooledFile.close(self.fp)
+
+
+class SpooledAttachments:
+    """The attachments of a single message, along with the ones that were skipped
+
+    Closing these releases the budget that was reserved for them.
+    """
+
+    __slots__ = ("pipeline", "owner_id", "attachments", "skipped", "_reserved")
+
+    def __init__(
+        self,
+        pipeline: AttachmentPipeline,
+        owner_id: int,
+        attachments: list[SpooledAttachment],
+        skipped: list[discord.Attachment],
+        reserved: int,
+    ):
+        self.pipeline = pipeline
+        self.owner_id = owner_id
+        self.attachments = attachments
+        self.skipped = skipped
+        self._reserved = reserved
+
+    def to_files(self) -> list[discord.File]:
+        return [attachment.to_file() for attachment in self.attachments]
+
+    def close(self) -> None:
+        for attachment in self.attachments:
+            attachment.close()
+
+        if self._reserved:
+            self.pipeline._unreserve(self.owner_id, self._reserved)
+            self._reserved = 0
+
+    def __enter__(self) -> SpooledAttachments:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[SpooledAttachment]:
+        return iter(self.attachments)
+
+    def __len__(self) -> int:
+        return len(self.attachments)
+
+
+class AttachmentPipeline:
+    """Downloads attachments so they can be relayed into (or out of) tickets
+
+    Attachments are streamed concurrently, with a limit on how many downloads run
+    at once. Small attachments stay in memory, while larger ones are spooled to a
+    temporary directory, so relaying large files does not grow the process.
+
+    Every ticket has a budget for the total size of the attachments that are being
+    relayed through it at once, keyed by the ticket's owner. This is an in-flight
+    budget rather than a lifetime quota: attachments that would go over it are
+    skipped, and their share of it is released once they have been sent.
+
+    Attachments that would not fit within the upload limit of where they are sent
+    to are skipped as well, so the rest of the message can still be sent.
+    """
+
+    def __init__(
+        self,
+        bot: Rodhaj,
+        *,
+        concurrency: int = 4,
+        spool_threshold: int = 1024 * 1024,
+        spool_dir: Optional[str] = None,
+        max_ticket_bytes: int = 100 * 1024 * 1024,
+    ):
+        self.bot = bot
+        self.spool_threshold = spool_threshold
+        self.spool_dir = spool_dir
+        self.max_ticket_bytes = max_ticket_bytes
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._usage: dict[int, int] = {}
+
+    def _reserve(self, owner_id: int, size: int) -> bool:
+        used = self._usage.get(owner_id, 0)
+        if used + size > self.max_ticket_bytes:
+            return False
+
+        self._usage[owner_id] = used + size
+        return True
+
+    def _unreserve(self, owner_id: int, size: int) -> None:
+        used = self._usage.get(owner_id, 0) - size
+        if used > 0:
+            self._usage[owner_id] = used
+        else:
+            self._usage.pop(owner_id, None)
+
+    async def _download(self, attachment: discord.Attachment) -> SpooledAttachment:
+        fp = SpooledFile(self.spool_threshold, dir=self.spool_dir)
+        try:
+            async with self._semaphore:
+                async with self.bot.session.get(attachment.url) as resp:
+                    resp.raise_for_status()
+                    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                        fp.write(chunk)
+        except BaseException:
+            fp.close()
+            raise
+
+        return SpooledAttachment(attachment, fp, fp.tell())
+
+    async def fetch(
+        self,
+        owner_id: int,
+        attachments: list[discord.Attachment],
+        *,
+        limit: Optional[int] = None,
+    ) -> SpooledAttachments:
+        """Downloads the attachments of a message
+
+        Args:
+            owner_id (int): ID of the owner of the ticket the attachments are relayed through
+            attachments (list[discord.Attachment]): The attachments to download
+            limit (Optional[int]): The upload limit of where the attachments are sent to,
+                such as `discord.Guild.filesize_limit`. Defaults to no limit
+
+        Returns:
+            SpooledAttachments: The downloaded attachments, in their original order.
+            This must be closed once the attachments have been sent, which also
+            releases their share of the budget
+        """
+        accepted: list[discord.Attachment] = []
+        skipped: list[discord.Attachment] = []
+        total = 0
+        for attachment in attachments:
+            # Uploads over the limit are rejected as a whole, along with the message
+            if limit is not None and total + attachment.size > limit:
+                skipped.append(attachment)
+            elif self._reserve(owner_id, attachment.size):
+                accepted.append(attachment)
+                total += attachment.size
+            else:
+                skipped.append(attachment)
+
+        results = await asyncio.gather(
+            *(self._download(attachment) for attachment in accepted),
+            return_exceptions=True,
+        )
+
+        downloaded: list[SpooledAttachment] = []
+        reserved = 0
+        error: Optional[BaseException] = None
+        for attachment, result in zip(accepted, results):
+            if isinstance(result, SpooledAttachment):
+                downloaded.append(result)
+                reserved += attachment.size
+                continue
+
+            self._unreserve(owner_id, attachment.size)
+            skipped.append(attachment)
+            if isinstance(result, (aiohttp.ClientError, asyncio.TimeoutError)):
+                self.bot.logger.warning(
+                    "Failed to download attachment %s: %s", attachment.url, result
+                )
+            elif error is None:
+                error = result
+
+        spooled = SpooledAttachments(self, owner_id, downloaded, skipped, reserved)
+        if error is not None:
+            spooled.close()
+            raise error
+        return spooled
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Optional, Union
+
+import asyncpg
+
+from .queries import COUNT_TICKET_STATS
+
+if TYPE_CHECKING:
+    from bot.rodhaj import Rodhaj
+
+
+class TicketCounters:
+    """In-memory counts of active tickets, locked tickets and blocked users
+
+    The counts are seeded from the database at startup, and are then kept up to
+    date by the code paths that create, close, lock or unlock tickets. This allows
+    `about` and the metrics to read them without querying the database.
+
+    Changes made by other processes, along with anything missed by the incremental
+    updates, are picked up by a background task that periodically reconciles the
+    counts with the database.
+    """
+
+    def __init__(self, bot: Rodhaj, *, interval: float = 900.0):
+        self.bot = bot
+        self.interval = interval
+        self.active = 0
+        self.locked = 0
+        self.blocked = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _load(
+        self, connection: Union[asyncpg.Connection, asyncpg.Pool]
+    ) -> tuple[int, int, int]:
+        row = await COUNT_TICKET_STATS.fetchrow(connection)
+        if row is None:
+            return 0, 0, 0
+        return row["active"], row["locked"], row["blocked"]
+
+    async def load(self, connection: Optional[asyncpg.Connection] = None) -> None:
+        try:
+            self.active, self.locked, self.blocked = await self._load(
+                connection or self.bot.pool
+            )
+        except Exception:
+            self.bot.logger.exception("Failed to load ticket counters")
+            raise
+        self._sync()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._reconcile_loop(), name="rodhaj-counters"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _sync(self) -> None:
+        metrics = self.bot.metrics.features
+        metrics.active_tickets.set(self.active)
+        metrics.locked_tickets.set(self.locked)
+        metrics.blocked_users.set(self.blocked)
+
+    def opened(self) -> None:
+        self.active += 1
+        self._sync()
+
+    def closed(self, *, locked: bool = False) -> None:
+        self.active = max(self.active - 1, 0)
+        if locked:
+            self.locked = max(self.locked - 1, 0)
+        self._sync()
+
+    def blocked_user(self, *, locked: int = 0) -> None:
+        self.blocked += 1
+        self.locked += locked
+        self._sync()
+
+    def unblocked_user(self, *, unlocked: int = 0) -> None:
+        self.blocked = max(self.blocked - 1, 0)
+        self.locked = max(self.locked - unlocked, 0)
+        self._sync()
+
+    async def reconcile(self) -> None:
+        counts = await self._load(self.bot.pool)
+        if counts != (self.active, self.locked, self.blocked):
+            self.bot.logger.debug(
+                "Reconciled ticket counters from %s to %s",
+                (self.active, self.locked, self.blocked),
+                counts,
+            )
+            self.active, self.locked, self.blocked = counts
+            self._sync()
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reconcile()
+            except Exception:
+                self.bot.logger.exception("Failed to reconcile ticket counters")
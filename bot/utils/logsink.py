@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import TYPE_CHECKING
+
+import discord
+
+from .outbound import Priority
+
+if TYPE_CHECKING:
+    from bot.rodhaj import Rodhaj
+
+# Limits for a single webhook message, as documented by Discord
+MAX_EMBEDS = 10
+MAX_EMBED_CHARACTERS = 6000
+
+
+class LogSink:
+    """Buffered sink for logging channel embeds
+
+    Embeds are collected per guild for a short window, and are then flushed
+    through the guild's logging webhook as multi-embed messages. A buffer is flushed
+    early once it holds enough embeds to fill an entire message.
+    """
+
+    def __init__(self, bot: Rodhaj, *, window: float = 2.0):
+        self.bot = bot
+        self.window = window
+        self._buffers: dict[int, list[discord.Embed]] = {}
+        self._handles: dict[int, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, guild_id: int, embed: discord.Embed) -> None:
+        buffer = self._buffers.setdefault(guild_id, [])
+        buffer.append(embed)
+
+        if len(buffer) >= MAX_EMBEDS:
+            self._flush(guild_id)
+        elif guild_id not in self._handles:
+            self._handles[guild_id] = asyncio.get_running_loop().call_later(
+                self.window, self._flush, guild_id
+            )
+
+    async def flush(self) -> None:
+        """Flushes all buffered embeds and waits for them to be sent"""
+        for guild_id in list(self._buffers):
+            self._flush(guild_id)
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self, guild_id: int) -> None:
+        handle = self._handles.pop(guild_id, None)
+        if handle is not None:
+            handle.cancel()
+
+        embeds = self._buffers.pop(guild_id, None)
+        if not embeds:
+            return
+
+        task = asyncio.create_task(self._send(guild_id, embeds))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _batch(self, embeds: list[discord.Embed]) -> list[list[discord.Embed]]:
+        batches: list[list[discord.Embed]] = []
+        current: list[discord.Embed] = []
+        characters = 0
+
+        for embed in embeds:
+            size = len(embed)
+            if current and (
+                len(current) >= MAX_EMBEDS or characters + size > MAX_EMBED_CHARACTERS
+            ):
+                batches.append(current)
+                current = []
+                characters = 0
+
+            current.append(embed)
+            characters += size
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _send(self, guild_id: int, embeds: list[discord.Embed]) -> None:
+        webhook = await self.bot.webhooks.get_webhook(guild_id)
+        if webhook is None:
+            return
+
+        for batch in self._batch(embeds):
+            try:
+                await self.bot.outbound.send(
+                    ("webhook", webhook.id),
+                    partial(webhook.send, embeds=batch),
+                    priority=Priority.LOW,
+                )
+            except discord.HTTPException:
+                self.bot.logger.exception(
+                    "Failed to send %d logging embeds for guild %d",
+                    len(batch),
+                    guild_id,
+                )
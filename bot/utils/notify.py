@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from typing import TYPE_CHECKING, Optional, Union
+
+import asyncpg
+import msgspec
+
+from .queries import NOTIFY
+from .replicas import pin
+
+if TYPE_CHECKING:
+    from bot.rodhaj import Rodhaj
+
+CHANNEL = "rodhaj_invalidations"
+
+### Invalidation events
+
+
+class GuildConfigChanged(msgspec.Struct, frozen=True, tag="guild_config"):
+    guild_id: int
+
+
+class BlocklistChanged(msgspec.Struct, frozen=True, tag="blocklist"):
+    guild_id: int
+    entity_id: int
+    blocked: bool
+
+
+# The ticket queries build this event in SQL, so changes have to be mirrored there
+class TicketChanged(msgspec.Struct, frozen=True, tag="ticket"):
+    owner_id: int
+
+
+InvalidationEvent = Union[GuildConfigChanged, BlocklistChanged, TicketChanged]
+
+
+class InvalidationMessage(msgspec.Struct, frozen=True):
+    origin: str
+    event: InvalidationEvent
+
+
+### Core classes
+
+
+class InvalidationNotifier:
+    """Keeps the caches of multiple processes in sync through `LISTEN`/`NOTIFY`
+
+    Writers publish typed events after changing the database, which are delivered
+    to every other process once the write commits. A dedicated connection (outside
+    of the pool) listens for these events, and applies them to the local caches.
+    Events published by this process are ignored, as the writer has already updated
+    its own caches.
+
+    Notifications are not delivered while the listener is disconnected, so all
+    caches are reloaded once the listener reconnects.
+    """
+
+    def __init__(self, bot: Rodhaj, dsn: str, *, reconnect_delay: float = 5.0):
+        self.bot = bot
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.origin = uuid.uuid4().hex
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder(InvalidationMessage)
+        self._task: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(), name="rodhaj-notify")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def target(self) -> tuple[str, str]:
+        """The channel and origin for queries that publish their own events"""
+        return CHANNEL, self.origin
+
+    async def publish(
+        self,
+        event: InvalidationEvent,
+        connection: Optional[Union[asyncpg.Connection, asyncpg.Pool]] = None,
+    ) -> None:
+        """Publishes an invalidation event to the other processes
+
+        Args:
+            event (InvalidationEvent): The event to publish
+            connection (Optional[Union[asyncpg.Connection, asyncpg.Pool]]): Connection to publish with.
+                If this connection is within a transaction, the event is only delivered once
+                the transaction commits. Defaults to the pool
+
+        Raises:
+            asyncpg.PostgresError: Publishing failed on the given connection. This aborts
+                any transaction it is in, so the caller has to roll it back
+        """
+        payload = self._encoder.encode(
+            InvalidationMessage(origin=self.origin, event=event)
+        )
+        try:
+            await NOTIFY.execute(connection or self.bot.pool, CHANNEL, payload.decode())
+        except asyncpg.PostgresError:
+            self.bot.logger.exception("Failed to publish invalidation event %r", event)
+            # Postgres turns the commit of an aborted transaction into a rollback,
+            # so the caller must not carry on as if its writes went through
+            if connection is not None and not isinstance(connection, asyncpg.Pool):
+                raise
+
+    async def _listen(self) -> None:
+        connected_before = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(CHANNEL, self._on_notification)
+
+                # Anything published while we were disconnected has been missed
+                if connected_before:
+                    await self._resync()
+                connected_before = True
+
+                await lost.wait()
+                self.bot.logger.warning("Lost the invalidation listener connection")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.bot.logger.exception("Invalidation listener failed")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _resync(self) -> None:
+        # Replicas may not have caught up with what we missed yet. If reloading
+        # fails, the listener reconnects and the caches are reloaded again
+        pin()
+        await self.bot.guild_configs.load()
+        await self.bot.blocklist.load()
+        await self.bot.ticket_index.load()
+
+    def _on_notification(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        try:
+            message = self._decoder.decode(payload)
+        except msgspec.DecodeError:
+            self.bot.logger.warning("Ignoring malformed invalidation event %r", payload)
+            return
+
+        if message.origin == self.origin:
+            return
+        self.apply(message.event)
+
+    async def _refresh_guild_config(self, guild_id: int) -> None:
+        # The event is sent on commit, so replicas may still be behind
+        pin()
+        try:
+            await self.bot.guild_configs.refresh(guild_id)
+        except Exception:
+            self.bot.logger.exception("Failed to refresh config for guild %d", guild_id)
+
+    def apply(self, event: InvalidationEvent) -> None:
+        if isinstance(event, GuildConfigChanged):
+            task = asyncio.create_task(self._refresh_guild_config(event.guild_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif isinstance(event, BlocklistChanged):
+            if event.blocked:
+                self.bot.blocklist.add(event.guild_id, event.entity_id)
+            else:
+                self.bot.blocklist.remove(event.entity_id)
+            self.bot.ticket_index.set_locked(event.entity_id, event.blocked)
+        elif isinstance(event, TicketChanged):
+            # The ticket is loaded again on the next lookup
+            ticket = self.bot.ticket_index.remove(event.owner_id)
+            if ticket is not None:
+                self.bot.threads.invalidate(ticket.thread_id)
+            self.bot.ticket_index.invalidate_missing(event.owner_id)
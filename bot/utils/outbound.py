@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from enum import IntEnum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Hashable,
+    Optional,
+    TypeVar,
+)
+
+import discord
+import msgspec
+
+if TYPE_CHECKING:
+    from bot.rodhaj import Rodhaj
+
+T = TypeVar("T")
+
+# Static limits for each kind of route, in the form of (requests, per seconds).
+# These are kept conservative, as discord.py does not expose the rate limit
+# headers of successful responses to learn from
+ROUTE_LIMITS: dict[str, tuple[int, float]] = {
+    "webhook": (5, 2.0),
+    "dm": (5, 5.0),
+    "reaction": (1, 0.25),
+}
+DEFAULT_ROUTE_LIMIT = (5, 5.0)
+
+
+class Priority(IntEnum):
+    # Traffic between users and staff (DM relays, replies)
+    HIGH = 0
+    # Traffic that users see, but is not time sensitive (reactions, notices)
+    NORMAL = 1
+    # Traffic that can absorb delays (logging embeds)
+    LOW = 2
+
+
+class TokenBucket:
+    """A token bucket for a single route
+
+    Tokens are refilled continuously at the rate of `limit` tokens per `per` seconds.
+    The limits are static, and the bucket can only be blocked for a while after
+    a request is rate limited.
+    """
+
+    __slots__ = ("limit", "per", "tokens", "updated_at", "blocked_until")
+
+    def __init__(self, limit: int, per: float):
+        self.limit = limit
+        self.per = per
+        self.tokens = float(limit)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.tokens = min(self.limit, self.tokens + elapsed * (self.limit / self.per))
+        self.updated_at = now
+
+    def acquire(self) -> float:
+        """Attempts to take a token from the bucket
+
+        Returns:
+            float: `0` if a token was taken, otherwise the amount
+            of seconds until a token would be available
+        """
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) * (self.per / self.limit)
+
+    def block(self, retry_after: float) -> None:
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+
+# The priority and sequence are the first fields, so requests are ordered by
+# priority first, and then in the order they were submitted
+class OutboundRequest(msgspec.Struct, order=True):
+    priority: Priority
+    sequence: int
+    route: Hashable
+    factory: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    enqueued_at: float
+    attempts: int = 0
+
+
+class OutboundDispatcher:
+    """Central dispatcher for outbound Discord traffic
+
+    All webhook sends, DMs and reactions that should be scheduled go through
+    this dispatcher. Requests are served in order of priority, so staff replies and
+    user relays are sent ahead of logging embeds. Each route has its own token bucket
+    with static limits (see `ROUTE_LIMITS`), and requests for routes that are out of
+    tokens are parked until a token frees up, which keeps the workers available for
+    other routes.
+
+    discord.py already tracks Discord's rate limits and retries rate limited requests
+    internally, so the buckets only smooth out bursts before they reach discord.py.
+    Whenever a 429 does surface (for example, as `discord.RateLimited`), the route's
+    bucket is blocked for the retry delay and the request is rescheduled.
+    """
+
+    def __init__(self, bot: Rodhaj, *, workers: int = 4, max_retries: int = 3):
+        self.bot = bot
+        self.workers = workers
+        self.max_retries = max_retries
+        self._queue: asyncio.PriorityQueue[OutboundRequest] = asyncio.PriorityQueue()
+        self._buckets: dict[Hashable, TokenBucket] = {}
+        self._sequence = itertools.count()
+        self._inflight: set[asyncio.Future] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"rodhaj-outbound-worker-{idx}")
+            for idx in range(self.workers)
+        ]
+
+    async def stop(self, *, timeout: float = 10.0) -> None:
+        if self._tasks and self._inflight:
+            await asyncio.wait(set(self._inflight), timeout=timeout)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        for future in self._inflight:
+            future.cancel()
+        self._inflight.clear()
+
+    def get_bucket(self, route: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            kind = route[0] if isinstance(route, tuple) else route
+            limit, per = ROUTE_LIMITS.get(kind, DEFAULT_ROUTE_LIMIT)  # type: ignore
+            bucket = self._buckets[route] = TokenBucket(limit, per)
+        return bucket
+
+    async def send(
+        self,
+        route: Hashable,
+        factory: Callable[[], Awaitable[T]],
+        *,
+        priority: Priority = Priority.NORMAL,
+    ) -> T:
+        """Schedules an outbound request and waits for its result
+
+        Args:
+            route (Hashable): The route the request is sent to. This is usually
+                an tuple in the form of `(kind, id)`, such as `("webhook", webhook.id)`
+            factory (Callable[[], Awaitable[T]]): Creates the coroutine that sends the request.
+                This may be called more than once if the request is retried
+            priority (Priority): The priority of the request. Defaults to `Priority.NORMAL`
+
+        Returns:
+            T: The result of the request
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._inflight.add(future)
+        future.add_done_callback(self._inflight.discard)
+
+        self._put(
+            OutboundRequest(
+                priority=priority,
+                sequence=next(self._sequence),
+                route=route,
+                factory=factory,
+                future=future,
+                enqueued_at=time.monotonic(),
+            )
+        )
+        return await future
+
+    def _put(self, request: OutboundRequest) -> None:
+        self._queue.put_nowait(request)
+        self.bot.metrics.outbound.queued.labels(request.priority.name).inc()
+
+    def _defer(self, request: OutboundRequest, delay: float) -> None:
+        asyncio.get_running_loop().call_later(delay, self._put, request)
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        if isinstance(error, discord.RateLimited):
+            return error.retry_after
+
+        if isinstance(error, discord.HTTPException) and error.status == 429:
+            headers = getattr(error.response, "headers", {})
+            retry_after = headers.get("Retry-After") or headers.get(
+                "X-RateLimit-Reset-After"
+            )
+            try:
+                return float(retry_after) if retry_after is not None else 1.0
+            except ValueError:
+                return 1.0
+        return None
+
+    async def _process(self, request: OutboundRequest) -> None:
+        future: asyncio.Future = request.future
+        if future.done():
+            return
+
+        bucket = self.get_bucket(request.route)
+        delay = bucket.acquire()
+        if delay > 0:
+            # Park the request instead of sleeping, so the worker can serve other routes
+            self._defer(request, delay)
+            return
+
+        try:
+            result = await request.factory()
+        except Exception as e:
+            retry_after = self._retry_after(e)
+            if retry_after is None or request.attempts >= self.max_retries:
+                if not future.done():
+                    future.set_exception(e)
+                return
+
+            bucket.block(retry_after)
+
+            self.bot.metrics.outbound.retries.inc()
+            request.attempts += 1
+            self._defer(request, retry_after)
+            return
+
+        self.bot.metrics.outbound.latency.labels(request.priority.name).observe(
+            time.monotonic() - request.enqueued_at
+        )
+        if not future.done():
+            future.set_result(result)
+
+    async def _worker(self) -> None:
+        while True:
+            request = await self._queue.get()
+            self.bot.metrics.outbound.queued.labels(request.priority.name).dec()
+            try:
+                await self._process(request)
+            except Exception:
+                self.bot.logger.exception("Unhandled error in outbound dispatcher")
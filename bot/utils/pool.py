@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+import asyncpg
+
+if TYPE_CHECKING:
+    from bot.rodhaj import Rodhaj
+
+
+class PoolSupervisor:
+    """Watches over an asyncpg pool
+
+    Every acquisition made through `acquire` is timed, and a background task
+    periodically samples the pool's size and idle connections. Sampling only reads
+    the pool's counters, so it never takes a connection itself.
+
+    asyncpg pools can not be resized once created. Instead, the pool is created with
+    the largest allowed size, and the supervisor limits how many connections can be
+    in use at once. When adaptive sizing is enabled, this limit grows while
+    acquisitions are waiting, and shrinks while connections sit idle. Connections
+    above the limit are closed by the pool once they pass
+    `max_inactive_connection_lifetime`.
+    """
+
+    def __init__(
+        self,
+        bot: Rodhaj,
+        pool: asyncpg.Pool,
+        *,
+        name: str = "primary",
+        adaptive: bool = False,
+        interval: float = 15.0,
+        grow_wait: float = 0.05,
+        step: int = 2,
+    ):
+        self.bot = bot
+        self.pool = pool
+        self.name = name
+        self.adaptive = adaptive
+        self.interval = interval
+        self.grow_wait = grow_wait
+        self.step = step
+        self.min_size = pool.get_min_size()
+        self.max_size = pool.get_max_size()
+        self._limit = self.min_size if adaptive else self.max_size
+        self._in_use = 0
+        self._condition = asyncio.Condition()
+        self._waits = 0
+        self._wait_time = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._sample_loop(), name=f"rodhaj-pool-{self.name}"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """Acquires a connection from the pool, while respecting the current limit
+
+        Yields:
+            asyncpg.Connection: The acquired connection
+        """
+        start = time.perf_counter()
+        if not self.adaptive:
+            # The limit is fixed at max_size, which the pool already enforces
+            self._in_use += 1
+            try:
+                async with self.pool.acquire() as connection:
+                    self._record_wait(time.perf_counter() - start)
+                    yield connection
+            finally:
+                self._in_use -= 1
+            return
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_use < self._limit)
+            self._in_use += 1
+
+        try:
+            async with self.pool.acquire() as connection:
+                self._record_wait(time.perf_counter() - start)
+                yield connection
+        finally:
+            async with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+
+    def _record_wait(self, elapsed: float) -> None:
+        self._waits += 1
+        self._wait_time += elapsed
+        self.bot.metrics.pool.acquire_wait.labels(self.name).observe(elapsed)
+
+    async def _set_limit(self, limit: int) -> None:
+        limit = max(self.min_size, min(self.max_size, limit))
+        if limit == self._limit:
+            return
+
+        self.bot.logger.info(
+            "Resizing %s pool limit from %d to %d", self.name, self._limit, limit
+        )
+        async with self._condition:
+            self._limit = limit
+            self._condition.notify_all()
+
+    async def _adjust(self, idle: int) -> None:
+        mean_wait = self._wait_time / self._waits if self._waits else 0.0
+        self._waits = 0
+        self._wait_time = 0.0
+
+        if mean_wait >= self.grow_wait:
+            await self._set_limit(self._limit + self.step)
+        elif mean_wait < self.grow_wait / 10 and idle >= self.step * 2:
+            await self._set_limit(self._limit - self.step)
+
+    def sample(self) -> int:
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+
+        metrics = self.bot.metrics.pool
+        metrics.size.labels(self.name).set(size)
+        metrics.idle.labels(self.name).set(idle)
+        metrics.in_use.labels(self.name).set(size - idle)
+        metrics.limit.labels(self.name).set(self._limit)
+        return idle
+
+    async def _sample_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                idle = self.sample()
+                if self.adaptive:
+                    await self._adjust(idle)
+            except Exception:
+                self.bot.logger.exception("Failed to sample the %s pool", self.name)
@@ -1,47 +1,85 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union
+import re
+from typing import TYPE_CHECKING, Optional, Union
 
 import discord
-from async_lru import alru_cache
 
 if TYPE_CHECKING:
     from bot.rodhaj import Rodhaj
 
 
-@alru_cache(maxsize=1024)
-async def get_prefix(bot: Rodhaj, message: discord.Message) -> Union[str, list[str]]:
-    """Obtains the prefix for the guild
+class PrefixResolver:
+    """Matches messages against the prefixes of each guild
+
+    Custom prefixes are served from the bot's `GuildConfigStore`. Matching is done
+    through a single compiled alternation per guild. Both the list of prefixes and
+    the pattern are built lazily and dropped whenever the guild's config changes.
+    """
+
+    def __init__(self, bot: Rodhaj):
+        self.bot = bot
+        self._prefixes: dict[Optional[int], list[str]] = {}
+        self._patterns: dict[Optional[int], re.Pattern[str]] = {}
+
+    @property
+    def base(self) -> list[str]:
+        user_id = self.bot.user.id  # type: ignore # Already logged in by this time
+
+        # By putting the base with the mentions, we are effectively
+        # doing the exact same thing as commands.when_mentioned
+        return [f"<@!{user_id}> ", f"<@{user_id}> ", self.bot.default_prefix]
+
+    def get(self, guild_id: Optional[int]) -> list[str]:
+        # The cached list is shared, so callers must not mutate it
+        prefixes = self._prefixes.get(guild_id)
+        if prefixes is None:
+            prefixes = self.base
+            if guild_id is not None:
+                prefixes.extend(self.bot.guild_configs.get_prefixes(guild_id))
+            self._prefixes[guild_id] = prefixes
+        return prefixes
 
-    This coroutine is heavily cached in order to reduce database calls
-    and improved performance
+    def invalidate(self, guild_id: int) -> None:
+        self._prefixes.pop(guild_id, None)
+        self._patterns.pop(guild_id, None)
 
+    def match(self, guild_id: Optional[int], content: str) -> Optional[str]:
+        pattern = self._patterns.get(guild_id)
+        if pattern is None:
+            # Longer prefixes are tried first, so a prefix that is a substring
+            # of another one never shadows it
+            prefixes = sorted(
+                (prefix for prefix in self.get(guild_id) if prefix),
+                key=len,
+                reverse=True,
+            )
+            pattern = re.compile("|".join(re.escape(prefix) for prefix in prefixes))
+            self._patterns[guild_id] = pattern
+
+        matched = pattern.match(content)
+        if matched is None:
+            return None
+        return matched.group(0)
+
+
+def get_prefix(bot: Rodhaj, message: discord.Message) -> Union[str, list[str]]:
+    """Obtains the prefix for the guild
+
+    Prefixes are served from the bot's `PrefixResolver`, so this never
+    queries the database. If one of the prefixes matches the message,
+    only that prefix is returned.
 
     Args:
         bot (Rodhaj): An instance of `Rodhaj`
         message (discord.Message): The message that is processed
 
     Returns:
-        Union[str, List[str]]: The default prefix or
+        Union[str, List[str]]: The matched prefix or
         a list of prefixes (including the default)
     """
-    user_id = bot.user.id  # type: ignore
-
-    # By putting the base with the mentions, we are effectively
-    # doing the exact same thing as commands.when_mentioned
-    base = [f"<@!{user_id}> ", f"<@{user_id}> ", bot.default_prefix]
-    if message.guild is None:
-        get_prefix.cache_invalidate(bot, message)
-        return base
-
-    query = """
-    SELECT prefix
-    FROM guild_config
-    WHERE id = $1;
-    """
-    prefixes = await bot.pool.fetchval(query, message.guild.id)
-    if prefixes is None:
-        get_prefix.cache_invalidate(bot, message)
-        return base
-    base.extend(item for item in prefixes)
-    return base
+    guild_id = message.guild.id if message.guild is not None else None
+    prefix = bot.prefixes.match(guild_id, message.content)
+    if prefix is not None:
+        return prefix
+    return bot.prefixes.get(guild_id)
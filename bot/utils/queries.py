@@ -0,0 +1,490 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Union
+
+import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
+
+if TYPE_CHECKING:
+    from cogs.ext.prometheus import QueryCollector
+
+    from .pool import PoolSupervisor
+    from .replicas import ReplicaRouter
+
+Connection = Union[asyncpg.Connection, asyncpg.Pool]
+
+log = logging.getLogger("rodhaj")
+
+
+class QueryKind(Enum):
+    # Reads that can be served by a replica. Results that are cached must not
+    # come from here, as a lagging replica would leave stale entries behind
+    READ = 0
+    # Writes, which pin the rest of the task's queries to the primary
+    WRITE = 1
+    # Statements that must run on the primary, but do not change any data
+    PRIMARY = 2
+
+
+class CatalogConnection(asyncpg.Connection):
+    """A connection that keeps the statements the query catalog prepared on it
+
+    Pools have to be created with this as their `connection_class`, so that
+    statements prepared by `QueryCatalog.prepare` can be used by the catalog.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.statements: dict[str, PreparedStatement] = {}
+
+
+class Query:
+    """A named SQL statement from the query catalog
+
+    Statements are executed through the usual asyncpg methods, and keep
+    track of how often they are called and how long they take.
+    """
+
+    __slots__ = ("catalog", "name", "sql", "kind", "calls", "total_time")
+
+    def __init__(
+        self,
+        catalog: QueryCatalog,
+        name: str,
+        sql: str,
+        kind: QueryKind = QueryKind.WRITE,
+    ):
+        self.catalog = catalog
+        self.name = name
+        self.sql = sql
+        self.kind = kind
+        self.calls = 0
+        self.total_time = 0.0
+
+    def __repr__(self) -> str:
+        return f"<Query name={self.name!r} calls={self.calls}>"
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    async def _run(self, method: str, connection: Connection, args: tuple) -> Any:
+        router = self.catalog.router
+        if router is not None:
+            if self.kind is QueryKind.WRITE:
+                router.pin()
+            elif self.kind is QueryKind.READ and isinstance(connection, asyncpg.Pool):
+                replica = router.route(connection)
+                if replica is not None:
+                    try:
+                        return await self._execute(method, replica.pool, args)
+                    except router.errors:
+                        router.mark_unhealthy(replica)
+
+        return await self._execute(method, connection, args)
+
+    async def _execute(self, method: str, connection: Connection, args: tuple) -> Any:
+        if isinstance(connection, asyncpg.Pool):
+            supervisor = self.catalog.supervisors.get(connection)
+            if supervisor is not None:
+                async with supervisor.acquire() as acquired:
+                    return await self._execute(method, acquired, args)
+
+        collector = self.catalog.collector
+        start = time.perf_counter()
+        try:
+            result = await self._call(method, connection, args)
+        except asyncio.TimeoutError:
+            # Raised once the pool's command_timeout is exceeded
+            if collector is not None:
+                collector.timeouts.labels(self.name).inc()
+            raise
+        except Exception as e:
+            if collector is not None:
+                collector.errors.labels(self.name, type(e).__name__).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.calls += 1
+            self.total_time += elapsed
+            if collector is not None:
+                collector.latency.labels(self.name).observe(elapsed)
+
+        if collector is not None:
+            collector.rows.labels(self.name).observe(count_rows(method, result))
+        return result
+
+    async def _call(self, method: str, connection: Connection, args: tuple) -> Any:
+        # Pooled connections forward unknown attributes to the connection they wrap
+        statements: dict[str, PreparedStatement] = getattr(connection, "statements", {})
+        statement = statements.get(self.name)
+        if statement is not None:
+            try:
+                if method != "execute":
+                    return await getattr(statement, method)(*args)
+
+                # Prepared statements have no execute(), but keep the
+                # command tag of their last run instead
+                await statement.fetch(*args)
+                return statement.get_statusmsg()
+            except asyncpg.InvalidCachedStatementError:
+                # The schema changed since the statement was prepared, so asyncpg's
+                # statement cache takes over for this connection
+                statements.pop(self.name, None)
+
+        return await getattr(connection, method)(self.sql, *args)
+
+    async def fetch(self, connection: Connection, *args: Any) -> list[asyncpg.Record]:
+        return await self._run("fetch", connection, args)
+
+    async def fetchrow(
+        self, connection: Connection, *args: Any
+    ) -> Optional[asyncpg.Record]:
+        return await self._run("fetchrow", connection, args)
+
+    async def fetchval(self, connection: Connection, *args: Any) -> Any:
+        return await self._run("fetchval", connection, args)
+
+    async def execute(self, connection: Connection, *args: Any) -> str:
+        return await self._run("execute", connection, args)
+
+
+def count_rows(method: str, result: Any) -> int:
+    """Counts the rows returned or affected by a statement
+
+    Args:
+        method (str): The asyncpg method that ran the statement
+        result (Any): The result of the statement
+
+    Returns:
+        int: The amount of rows
+    """
+    if method == "fetch":
+        return len(result)
+    if method == "execute":
+        # Command tags are in the form of "UPDATE 3" or "INSERT 0 1"
+        count = result.rpartition(" ")[2]
+        return int(count) if count.isdigit() else 0
+    return 0 if result is None else 1
+
+
+class QueryCatalog:
+    """Registry of every statement used by Rodhaj
+
+    All statements are prepared on each new pooled connection through `prepare`,
+    which is called from the pool's `init` hook. The prepared statements are kept on
+    the connection and used by every query ran on it, so the first use of a statement
+    on a connection does not have to wait on a parse and plan round trip.
+    """
+
+    def __init__(self):
+        self._queries: dict[str, Query] = {}
+        self.collector: Optional[QueryCollector] = None
+        self.supervisors: dict[asyncpg.Pool, PoolSupervisor] = {}
+        self.router: Optional[ReplicaRouter] = None
+
+    def register(
+        self, name: str, sql: str, *, kind: QueryKind = QueryKind.WRITE
+    ) -> Query:
+        if name in self._queries:
+            raise ValueError(f"Query {name!r} is already registered")
+
+        query = self._queries[name] = Query(self, name, sql, kind)
+        return query
+
+    def supervise(self, supervisor: PoolSupervisor) -> None:
+        """Routes queries ran against the supervisor's pool through the supervisor"""
+        self.supervisors[supervisor.pool] = supervisor
+
+    def get(self, name: str) -> Optional[Query]:
+        return self._queries.get(name)
+
+    def __iter__(self) -> Iterator[Query]:
+        return iter(self._queries.values())
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    async def prepare(self, connection: CatalogConnection) -> None:
+        for query in self._queries.values():
+            try:
+                statement = await connection.prepare(query.sql)
+            except asyncpg.PostgresError:
+                log.warning("Failed to prepare query %r", query.name, exc_info=True)
+                continue
+            connection.statements[query.name] = statement
+
+
+catalog = QueryCatalog()
+
+### Tickets
+
+# Ticket, guild config and blocklist lookups fill caches that are only corrected
+# through invalidations, so they are always read from the primary
+
+GET_TICKET_BY_OWNER = catalog.register(
+    "get_ticket_by_owner",
+    """
+    SELECT id, thread_id, owner_id, location_id, locked
+    FROM tickets
+    WHERE owner_id = $1;
+    """,
+    kind=QueryKind.PRIMARY,
+)
+
+GET_TICKET_BY_THREAD = catalog.register(
+    "get_ticket_by_thread",
+    """
+    SELECT id, thread_id, owner_id, location_id, locked
+    FROM tickets
+    WHERE thread_id = $1;
+    """,
+    kind=QueryKind.PRIMARY,
+)
+
+GET_ALL_TICKETS = catalog.register(
+    "get_all_tickets",
+    """
+    SELECT id, thread_id, owner_id, location_id, locked
+    FROM tickets;
+    """,
+    kind=QueryKind.PRIMARY,
+)
+
+COUNT_TICKET_STATS = catalog.register(
+    "count_ticket_stats",
+    """
+    SELECT COUNT(*) AS active,
+        COUNT(*) FILTER (WHERE locked) AS locked,
+        (SELECT COUNT(*) FROM blocklist) AS blocked
+    FROM tickets;
+    """,
+    kind=QueryKind.READ,
+)
+
+# The user is registered and the ticket is inserted in a single statement.
+# Foreign keys are checked at the end of the statement,
+# so the ticket can reference the user that was just inserted.
+#
+# Ticket writes publish their own `TicketChanged` invalidation event, so no
+# extra round trip is needed for NOTIFY. The payload has to match the
+# `InvalidationMessage` the notifier decodes, with the channel and the
+# origin of the process passed in as the last two parameters
+CREATE_TICKET = catalog.register(
+    "create_ticket",
+    """
+    WITH registered AS (
+        INSERT INTO user_config (id)
+        VALUES ($2) ON CONFLICT (id) DO NOTHING
+    ), created AS (
+        INSERT INTO tickets (thread_id, owner_id, location_id)
+        VALUES ($1, $2, $3)
+        RETURNING id, thread_id, owner_id, location_id, locked
+    )
+    SELECT created.*, pg_notify(
+        $4,
+        json_build_object(
+            'origin', $5::text,
+            'event', json_build_object('type', 'ticket', 'owner_id', owner_id)
+        )::text
+    ) AS notified
+    FROM created;
+    """,
+)
+
+CLOSE_TICKET_BY_THREAD = catalog.register(
+    "close_ticket_by_thread",
+    """
+    WITH closed AS (
+        DELETE FROM tickets
+        WHERE thread_id = $1 AND location_id = $2
+        RETURNING id, thread_id, owner_id, location_id, locked
+    )
+    SELECT closed.*, pg_notify(
+        $3,
+        json_build_object(
+            'origin', $4::text,
+            'event', json_build_object('type', 'ticket', 'owner_id', owner_id)
+        )::text
+    ) AS notified
+    FROM closed;
+    """,
+)
+
+CLOSE_TICKET_BY_OWNER = catalog.register(
+    "close_ticket_by_owner",
+    """
+    WITH closed AS (
+        DELETE FROM tickets
+        WHERE owner_id = $1
+        RETURNING id, thread_id, owner_id, location_id, locked
+    )
+    SELECT closed.*, pg_notify(
+        $2,
+        json_build_object(
+            'origin', $3::text,
+            'event', json_build_object('type', 'ticket', 'owner_id', owner_id)
+        )::text
+    ) AS notified
+    FROM closed;
+    """,
+)
+
+### Guild configs
+
+GET_ALL_GUILD_CONFIGS = catalog.register(
+    "get_all_guild_configs",
+    """
+    SELECT id, category_id, ticket_channel_id, logging_channel_id, logging_broadcast_url, ticket_broadcast_url, prefix, account_age, guild_age, settings
+    FROM guild_config;
+    """,
+    kind=QueryKind.PRIMARY,
+)
+
+GET_GUILD_CONFIG = catalog.register(
+    "get_guild_config",
+    """
+    SELECT id, category_id, ticket_channel_id, logging_channel_id, logging_broadcast_url, ticket_broadcast_url, prefix, account_age, guild_age, settings
+    FROM guild_config
+    WHERE id = $1;
+    """,
+    kind=QueryKind.PRIMARY,
+)
+
+CREATE_GUILD_CONFIG = catalog.register(
+    "create_guild_config",
+    """
+    INSERT INTO guild_config (id, category_id, ticket_channel_id, logging_channel_id, logging_broadcast_url, ticket_broadcast_url, prefix, settings)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8);
+    """,
+)
+
+DELETE_GUILD_CONFIG = catalog.register(
+    "delete_guild_config",
+    """
+    DELETE FROM guild_config WHERE id = $1;
+    """,
+)
+
+# Only the given keys are merged into the stored settings, so concurrent
+# updates to different keys do not overwrite each other
+UPDATE_GUILD_SETTINGS = catalog.register(
+    "update_guild_settings",
+    """
+    UPDATE guild_config
+    SET settings = settings || $2::jsonb
+    WHERE id = $1
+    RETURNING settings;
+    """,
+)
+
+SET_GUILD_AGE = catalog.register(
+    "set_guild_age",
+    """
+    UPDATE guild_config
+    SET guild_age = $2
+    WHERE id = $1;
+    """,
+)
+
+SET_ACCOUNT_AGE = catalog.register(
+    "set_account_age",
+    """
+    UPDATE guild_config
+    SET account_age = $2
+    WHERE id = $1;
+    """,
+)
+
+ADD_PREFIX = catalog.register(
+    "add_prefix",
+    """
+    UPDATE guild_config
+    SET prefix = ARRAY_APPEND(prefix, $1)
+    WHERE id = $2
+    RETURNING prefix;
+    """,
+)
+
+REPLACE_PREFIX = catalog.register(
+    "replace_prefix",
+    """
+    UPDATE guild_config
+    SET prefix = ARRAY_REPLACE(prefix, $1, $2)
+    WHERE id = $3
+    RETURNING prefix;
+    """,
+)
+
+REMOVE_PREFIX = catalog.register(
+    "remove_prefix",
+    """
+    UPDATE guild_config
+    SET prefix = ARRAY_REMOVE(prefix, $1)
+    WHERE id = $2
+    RETURNING prefix;
+    """,
+)
+
+### Blocklist
+
+GET_BLOCKLIST = catalog.register(
+    "get_blocklist",
+    """
+    SELECT guild_id, entity_id
+    FROM blocklist;
+    """,
+    kind=QueryKind.PRIMARY,
+)
+
+BLOCK_ENTITY = catalog.register(
+    "block_entity",
+    """
+    WITH blocklist_insert AS (
+        INSERT INTO blocklist (guild_id, entity_id)
+        VALUES ($1, $2)
+        RETURNING entity_id
+    )
+    UPDATE tickets
+    SET locked = true
+    WHERE owner_id = (SELECT entity_id FROM blocklist_insert);
+    """,
+)
+
+# Unblocking an entity that is not blocked is a no-op (DELETE 0)
+UNBLOCK_ENTITY = catalog.register(
+    "unblock_entity",
+    """
+    WITH blocklist_delete AS (
+        DELETE FROM blocklist
+        WHERE entity_id = $1
+        RETURNING entity_id
+    )
+    UPDATE tickets
+    SET locked = false
+    WHERE owner_id = (SELECT entity_id FROM blocklist_delete);
+    """,
+)
+
+### Misc
+
+PING = catalog.register("ping", "SELECT 1;", kind=QueryKind.PRIMARY)
+
+NOTIFY = catalog.register("notify", "SELECT pg_notify($1, $2);", kind=QueryKind.PRIMARY)
+
+# Replicas that are fully caught up report no lag, even if the primary has been idle
+REPLICA_LAG = catalog.register(
+    "replica_lag",
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END;
+    """,
+    kind=QueryKind.PRIMARY,
+)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Union
+
+import discord
+import msgspec
+
+if TYPE_CHECKING:
+    from bot.rodhaj import Rodhaj
+
+WEBHOOK_CONTENT_LIMIT = 2000
+WEBHOOK_ATTACHMENT_LIMIT = 10
+
+
+class RelayMessage(msgspec.Struct, frozen=True):
+    ticket_id: int
+    thread: discord.Thread
+    author: Union[discord.User, discord.Member]
+    content: str
+    attachments: list[discord.Attachment] = msgspec.field(default_factory=list)
+    enqueued_at: float = msgspec.field(default_factory=time.monotonic)
+
+
+class RelayScheduler:
+    """Schedules DM relays into ticket threads
+
+    Every ticket gets its own FIFO queue, and a pool of workers drains these
+    queues in parallel. A ticket is only ever handled by one worker at a time,
+    which keeps the messages of a ticket in order while allowing many tickets
+    to be relayed concurrently.
+
+    Backpressure is applied by limiting both the size of each queue and the
+    total number of pending messages.
+
+    Optionally, bursts of messages can be coalesced. When enabled, a ticket is only
+    scheduled once the coalescing window has passed, and consecutive messages from
+    the same author are then merged into a single relay, within the given limits.
+    """
+
+    def __init__(
+        self,
+        bot: Rodhaj,
+        handler: Callable[[RelayMessage], Awaitable[None]],
+        *,
+        workers: int = 4,
+        max_queue_size: int = 25,
+        max_pending: int = 1000,
+        coalesce_window: float = 0.0,
+        coalesce_max_messages: int = 10,
+        coalesce_max_length: int = WEBHOOK_CONTENT_LIMIT,
+    ):
+        self.bot = bot
+        self.handler = handler
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.max_pending = max_pending
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_messages = coalesce_max_messages
+        self.coalesce_max_length = min(coalesce_max_length, WEBHOOK_CONTENT_LIMIT)
+        self._queues: dict[int, deque[RelayMessage]] = {}
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._pending = 0
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def coalescing(self) -> bool:
+        return self.coalesce_window > 0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"rodhaj-relay-worker-{idx}")
+            for idx in range(self.workers)
+        ]
+
+    async def stop(self, *, timeout: float = 10.0) -> None:
+        # Give the pending relays a chance to go through before shutting down
+        if self._tasks and not self._idle.is_set():
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.bot.logger.warning(
+                    "Dropping %d pending relays on shutdown", self._pending
+                )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def submit(self, message: RelayMessage) -> bool:
+        """Submits a message to be relayed
+
+        Args:
+            message (RelayMessage): The message to relay
+
+        Returns:
+            bool: `True` if the message was queued, `False` if it was
+            rejected due to backpressure
+        """
+        queue = self._queues.get(message.ticket_id)
+        if self._pending >= self.max_pending or (
+            queue is not None and len(queue) >= self.max_queue_size
+        ):
+            self.bot.metrics.relay.rejected.inc()
+            return False
+
+        if queue is None:
+            queue = self._queues[message.ticket_id] = deque()
+            if self.coalescing:
+                # Wait out the window before scheduling, so the rest
+                # of the burst has a chance to be queued
+                asyncio.get_running_loop().call_later(
+                    self.coalesce_window, self._ready.put_nowait, message.ticket_id
+                )
+            else:
+                self._ready.put_nowait(message.ticket_id)
+
+        queue.append(message)
+        self._pending += 1
+        self._idle.clear()
+        self.bot.metrics.relay.queue_depth.set(self._pending)
+        return True
+
+    def _pop(self, ticket_id: int) -> Optional[RelayMessage]:
+        queue = self._queues.get(ticket_id)
+        if not queue:
+            return None
+
+        self._pending -= 1
+        self.bot.metrics.relay.queue_depth.set(self._pending)
+        return queue.popleft()
+
+    def _coalesce(self, ticket_id: int, message: RelayMessage) -> RelayMessage:
+        queue = self._queues[ticket_id]
+        parts = [message.content]
+        attachments = list(message.attachments)
+        length = len(message.content)
+
+        while queue and len(parts) < self.coalesce_max_messages:
+            upcoming = queue[0]
+            if upcoming.author.id != message.author.id:
+                break
+
+            # Account for the newline used to join the messages
+            new_length = length + len(upcoming.content) + 1
+            if new_length > self.coalesce_max_length or (
+                len(attachments) + len(upcoming.attachments) > WEBHOOK_ATTACHMENT_LIMIT
+            ):
+                break
+
+            queue.popleft()
+            self._pending -= 1
+            parts.append(upcoming.content)
+            attachments.extend(upcoming.attachments)
+            length = new_length
+
+        if len(parts) == 1:
+            return message
+
+        self.bot.metrics.relay.coalesced.inc(len(parts) - 1)
+        self.bot.metrics.relay.queue_depth.set(self._pending)
+        return msgspec.structs.replace(
+            message,
+            content="\n".join(part for part in parts if part),
+            attachments=attachments,
+        )
+
+    def _release(self, ticket_id: int) -> None:
+        queue = self._queues.get(ticket_id)
+        if queue:
+            # Requeue the ticket instead of draining it completely,
+            # so busy tickets can not starve the other ones
+            self._ready.put_nowait(ticket_id)
+            return
+
+        self._queues.pop(ticket_id, None)
+        if not self._queues:
+            self._idle.set()
+
+    async def _worker(self) -> None:
+        while True:
+            ticket_id = await self._ready.get()
+            try:
+                message = self._pop(ticket_id)
+                if message is None:
+                    continue
+
+                self.bot.metrics.relay.wait_time.observe(
+                    time.monotonic() - message.enqueued_at
+                )
+                if self.coalescing:
+                    message = self._coalesce(ticket_id, message)
+                try:
+                    await self.handler(message)
+                except Exception:
+                    self.bot.logger.exception(
+                        "Failed to relay message to ticket %d", ticket_id
+                    )
+            finally:
+                self._release(ticket_id)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+from typing import TYPE_CHECKING, Optional
+
+import asyncpg
+
+from .queries import REPLICA_LAG
+
+if TYPE_CHECKING:
+    from bot.rodhaj import Rodhaj
+
+# Set once the current task writes to the primary. Each command and event runs in its own
+# task, so this keeps reads-after-writes on the primary for the rest of that command
+_pinned: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "rodhaj_pinned_to_primary", default=False
+)
+
+# Errors that mean the replica itself is unreachable, rather than the query being wrong
+REPLICA_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.InterfaceError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+)
+
+
+def pin() -> None:
+    """Pins the remaining queries of the current task to the primary"""
+    _pinned.set(True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+class Replica:
+    __slots__ = ("name", "pool", "lag", "healthy")
+
+    def __init__(self, name: str, pool: asyncpg.Pool):
+        self.name = name
+        self.pool = pool
+        self.lag: Optional[float] = None
+        # Replicas are only used once their lag has been checked
+        self.healthy = False
+
+    def __repr__(self) -> str:
+        return f"<Replica name={self.name!r} lag={self.lag} healthy={self.healthy}>"
+
+
+class ReplicaRouter:
+    """Routes read-only queries to read replicas
+
+    Queries declared as reads in the query catalog are sent to a healthy replica in
+    a round-robin fashion, while everything else goes to the primary. Once a task
+    writes to the primary, its reads stay on the primary, so a command always sees
+    its own writes.
+
+    The replication lag of every replica is checked periodically. Replicas that fall
+    too far behind, or can not be reached, are skipped until they catch up again.
+    Whenever no replica is available, reads fall back to the primary.
+    """
+
+    def __init__(
+        self,
+        bot: Rodhaj,
+        primary: asyncpg.Pool,
+        replicas: list[Replica],
+        *,
+        max_lag: float = 5.0,
+        interval: float = 10.0,
+    ):
+        self.bot = bot
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.interval = interval
+        self._cycle = itertools.cycle(replicas)
+        self._task: Optional[asyncio.Task] = None
+
+    errors = REPLICA_ERRORS
+    pin = staticmethod(pin)
+
+    def start(self) -> None:
+        if self._task is None and self.replicas:
+            self._task = asyncio.create_task(
+                self._check_loop(), name="rodhaj-replica-lag"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def route(self, pool: asyncpg.Pool) -> Optional[Replica]:
+        """Picks the replica to send a read to
+
+        Args:
+            pool (asyncpg.Pool): The pool the read was issued against
+
+        Returns:
+            Optional[Replica]: The replica to use, or `None` if the read
+            should stay on the given pool
+        """
+        if pool is not self.primary or is_pinned():
+            return None
+
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                self.bot.metrics.replicas.routed.labels(replica.name).inc()
+                return replica
+
+        self.bot.metrics.replicas.routed.labels("primary").inc()
+        return None
+
+    def mark_unhealthy(self, replica: Replica) -> None:
+        if replica.healthy:
+            self.bot.logger.warning(
+                "Replica %s is unavailable, falling back to the primary", replica.name
+            )
+        replica.healthy = False
+        self.bot.metrics.replicas.healthy.labels(replica.name).set(0)
+
+    async def check(self, replica: Replica) -> None:
+        try:
+            lag = await REPLICA_LAG.fetchval(replica.pool)
+        except REPLICA_ERRORS:
+            self.mark_unhealthy(replica)
+            return
+        except Exception:
+            self.bot.logger.exception("Failed to check lag of replica %s", replica.name)
+            self.mark_unhealthy(replica)
+            return
+
+        replica.lag = float(lag or 0.0)
+        self.bot.metrics.replicas.lag.labels(replica.name).set(replica.lag)
+        if replica.lag > self.max_lag:
+            self.mark_unhealthy(replica)
+            return
+
+        replica.healthy = True
+        self.bot.metrics.replicas.healthy.labels(replica.name).set(1)
+
+    async def _check_loop(self) -> None:
+        while True:
+            await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+            await asyncio.sleep(self.interval)
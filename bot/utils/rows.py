@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Generic, Iterable, TypeVar
+
+import asyncpg
+import msgspec
+
+S = TypeVar("S", bound=msgspec.Struct)
+
+
+class RowDecoder(Generic[S]):
+    """Decodes records straight into msgspec structs
+
+    Records are passed to the struct positionally, so no intermediate dict is
+    built per row. This requires the query to select its columns in the same order
+    as the struct's fields, which is checked against the record's keys.
+
+    Fields typed as structs are expected to come from `jsonb` columns. The jsonb
+    codec hands these over as raw JSON, which is then decoded directly into the
+    field's type.
+    """
+
+    __slots__ = ("struct", "_fields", "_json")
+
+    def __init__(self, struct: type[S]):
+        self.struct = struct
+        self._fields = struct.__struct_fields__
+        self._json = {
+            idx: msgspec.json.Decoder(field.type)
+            for idx, field in enumerate(msgspec.structs.fields(struct))
+            if isinstance(field.type, type) and issubclass(field.type, msgspec.Struct)
+        }
+
+    def _check(self, record: asyncpg.Record) -> None:
+        keys = tuple(record.keys())
+        if keys != self._fields[: len(keys)]:
+            raise TypeError(
+                f"Columns {keys} do not match the fields of {self.struct.__name__}"
+            )
+
+    def _decode(self, record: asyncpg.Record) -> S:
+        if not self._json:
+            return self.struct(*record.values())
+
+        values = list(record.values())
+        for idx, decoder in self._json.items():
+            if idx < len(values) and values[idx] is not None:
+                values[idx] = decoder.decode(values[idx])
+        return self.struct(*values)
+
+    def decode(self, record: asyncpg.Record) -> S:
+        self._check(record)
+        return self._decode(record)
+
+    def decode_all(self, records: Iterable[asyncpg.Record]) -> list[S]:
+        # Every record of a result shares the same columns, so only the first is checked
+        decoded = []
+        for record in records:
+            if not decoded:
+                self._check(record)
+            decoded.append(self._decode(record))
+        return decoded
@@ -0,0 +1,145 @@
+import logging
+import os
+import re
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import asyncpg
+import pytest
+from rodhaj import init
+from utils.outbound import Priority
+from utils.queries import CatalogConnection
+
+# Tests that need an actual database are skipped unless this is set.
+# The schema is created within a transaction, and is rolled back after each test
+POSTGRES_URI = os.environ.get("RODHAJ_TEST_POSTGRES_URI")
+MIGRATIONS_PATH = Path(__file__).parents[1] / "bot" / "migrations"
+REVISION_FILE = re.compile(r"V(?P<version>[0-9]+)__.+\.sql")
+
+
+class FakeClock:
+    """A stand-in for `time.monotonic` that only moves when told to"""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeRecord(dict):
+    """A dictionary that can be used in place of an `asyncpg.Record`"""
+
+    def values(self):
+        return list(super().values())
+
+
+class FakeConnection:
+    """Records the statements it is given, and answers them with canned results
+
+    Results are looked up by the SQL of the statement, falling back to `default`.
+    """
+
+    def __init__(self, results: dict[str, object] | None = None, default=None):
+        self.results = results or {}
+        self.default = default
+        self.calls: list[tuple[str, str, tuple]] = []
+
+    def _result(self, method: str, sql: str, args: tuple):
+        self.calls.append((method, sql, args))
+        result = self.results.get(sql, self.default)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def fetch(self, sql: str, *args, timeout=None):
+        return self._result("fetch", sql, args) or []
+
+    async def fetchrow(self, sql: str, *args, timeout=None):
+        return self._result("fetchrow", sql, args)
+
+    async def fetchval(self, sql: str, *args, timeout=None):
+        return self._result("fetchval", sql, args)
+
+    async def execute(self, sql: str, *args, timeout=None):
+        return self._result("execute", sql, args) or "SELECT 0"
+
+
+class FakeOutbound:
+    """Sends requests straight away, while recording their routes"""
+
+    def __init__(self):
+        self.routes: list[tuple] = []
+
+    async def send(self, route, factory, *, priority=Priority.NORMAL):
+        self.routes.append((route, priority))
+        return await factory()
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    """Replaces `time.monotonic` within the modules given to `clock.install`
+
+    Only the given modules are patched, so the event loop keeps its own clock.
+    """
+    fake = FakeClock()
+
+    def install(*modules) -> None:
+        for module in modules:
+            monkeypatch.setattr(
+                module, "time", SimpleNamespace(monotonic=fake, perf_counter=fake)
+            )
+
+    fake.install = install  # type: ignore
+    return fake
+
+
+def get_revisions() -> list[Path]:
+    revisions = {}
+    for file in MIGRATIONS_PATH.glob("*.sql"):
+        match = REVISION_FILE.match(file.name)
+        if match is not None:
+            revisions[int(match.group("version"))] = file
+    return [revisions[version] for version in sorted(revisions)]
+
+
+@pytest.fixture
+def postgres_uri() -> str:
+    if POSTGRES_URI is None:
+        pytest.skip("RODHAJ_TEST_POSTGRES_URI is not set")
+    return POSTGRES_URI
+
+
+@pytest.fixture
+async def database(postgres_uri: str):
+    """A connection to a migrated database, set up the same way as pooled connections"""
+    conn = await asyncpg.connect(postgres_uri, connection_class=CatalogConnection)
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        for revision in get_revisions():
+            await conn.execute(revision.read_text("utf-8"))
+        await init(conn)
+        yield conn
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+
+@pytest.fixture
+def connection() -> FakeConnection:
+    return FakeConnection()
+
+
+@pytest.fixture
+def bot(connection: FakeConnection) -> SimpleNamespace:
+    """A bot with just enough attributes for the components under test"""
+    return SimpleNamespace(
+        metrics=MagicMock(),
+        logger=logging.getLogger("rodhaj.tests"),
+        pool=connection,
+    )
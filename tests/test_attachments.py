@@ -0,0 +1,145 @@
+import asyncio
+import io
+
+import aiohttp
+import pytest
+from utils.attachments import AttachmentPipeline
+
+
+class FakeResponse:
+    def __init__(self, session: "FakeSession", data: bytes):
+        self.session = session
+        self.data = data
+
+    async def __aenter__(self):
+        self.session.active += 1
+        self.session.peak = max(self.session.peak, self.session.active)
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.session.active -= 1
+
+    def raise_for_status(self) -> None:
+        pass
+
+    @property
+    def content(self):
+        return self
+
+    async def iter_chunked(self, size: int):
+        for idx in range(0, len(self.data), size):
+            yield self.data[idx : idx + size]
+
+
+class FakeSession:
+    def __init__(self):
+        self.errors: dict[str, BaseException] = {}
+        self.active = 0
+        self.peak = 0
+
+    def get(self, url: str) -> FakeResponse:
+        if url in self.errors:
+            raise self.errors[url]
+        name, size = url.split(":")
+        return FakeResponse(self, name.encode()[:1] * int(size))
+
+
+class FakeAttachment:
+    def __init__(self, name: str, size: int):
+        self.url = f"{name}:{size}"
+        self.filename = f"{name}.bin"
+        self.description = None
+        self.size = size
+
+    def is_spoiler(self) -> bool:
+        return False
+
+
+@pytest.fixture
+def pipeline(bot, tmp_path) -> AttachmentPipeline:
+    bot.session = FakeSession()
+    return AttachmentPipeline(
+        bot,
+        concurrency=2,
+        spool_threshold=1000,
+        spool_dir=str(tmp_path),
+        max_ticket_bytes=5000,
+    )
+
+
+async def test_fetch(pipeline):
+    attachments = [FakeAttachment("a", 500), FakeAttachment("b", 3000)]
+
+    with await pipeline.fetch(1, attachments) as spooled:  # type: ignore
+        assert [attachment.filename for attachment in spooled] == ["a.bin", "b.bin"]
+        assert spooled.skipped == []
+
+        small, large = spooled.attachments
+        assert large.size == 3000
+        # Only the larger attachment is moved out of memory
+        assert not small.fp._file._rolled
+        assert large.fp._file._rolled
+
+        # Files can be made again for retried uploads
+        for _ in range(2):
+            files = spooled.to_files()
+            assert isinstance(files[1].fp, io.IOBase)
+            assert files[1].fp.read() == b"b" * 3000
+
+    assert all(attachment.fp.closed for attachment in spooled)
+
+
+async def test_downloads_are_limited(pipeline):
+    attachments = [FakeAttachment(str(idx), 10) for idx in range(6)]
+
+    with await pipeline.fetch(1, attachments) as spooled:  # type: ignore
+        assert len(spooled) == 6
+    assert pipeline.bot.session.peak == 2
+
+
+async def test_ticket_budget(pipeline):
+    first = await pipeline.fetch(1, [FakeAttachment("a", 3000)])  # type: ignore
+
+    # The budget is per ticket, and only covers what is in flight
+    with await pipeline.fetch(1, [FakeAttachment("b", 3000)]) as spooled:  # type: ignore
+        assert len(spooled) == 0 and len(spooled.skipped) == 1
+    with await pipeline.fetch(2, [FakeAttachment("c", 3000)]) as spooled:  # type: ignore
+        assert len(spooled) == 1
+
+    first.close()
+    with await pipeline.fetch(1, [FakeAttachment("d", 3000)]) as spooled:  # type: ignore
+        assert len(spooled) == 1
+    assert pipeline._usage == {}
+
+
+async def test_upload_limit(pipeline):
+    attachments = [
+        FakeAttachment("a", 400),
+        FakeAttachment("b", 700),
+        FakeAttachment("c", 500),
+    ]
+
+    with await pipeline.fetch(1, attachments, limit=1000) as spooled:  # type: ignore
+        assert [attachment.filename for attachment in spooled] == ["a.bin", "c.bin"]
+        assert [attachment.filename for attachment in spooled.skipped] == ["b.bin"]
+        assert pipeline._usage == {1: 900}
+
+
+async def test_failed_downloads_are_skipped(pipeline):
+    attachments = [FakeAttachment("a", 100), FakeAttachment("b", 100)]
+    pipeline.bot.session.errors["a:100"] = aiohttp.ClientConnectionError()
+
+    with await pipeline.fetch(1, attachments) as spooled:  # type: ignore
+        assert [attachment.filename for attachment in spooled] == ["b.bin"]
+        assert [attachment.filename for attachment in spooled.skipped] == ["a.bin"]
+        assert pipeline._usage == {1: 100}
+
+
+async def test_unexpected_errors_are_raised(pipeline):
+    attachments = [FakeAttachment("a", 100), FakeAttachment("b", 100)]
+    pipeline.bot.session.errors["a:100"] = RuntimeError("unexpected")
+
+    with pytest.raises(RuntimeError):
+        await pipeline.fetch(1, attachments)  # type: ignore
+    assert pipeline._usage == {}
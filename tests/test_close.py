@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+from cogs.tickets import TicketIndex, Tickets
+from utils.queries import CLOSE_TICKET_BY_OWNER
+
+from .conftest import FakeOutbound, FakeRecord
+
+OWNER_ID = 1
+THREAD_ID = 100
+GUILD_ID = 10
+
+
+class RecordingOutbound(FakeOutbound):
+    def __init__(self, events: list[str]):
+        super().__init__()
+        self.events = events
+
+    async def send(self, route, factory, *, priority=None):
+        self.events.append(route[0])
+        return await super().send(route, factory)
+
+
+@pytest.fixture
+def events() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def thread(events):
+    thread = MagicMock(spec=discord.Thread)
+    thread.id = THREAD_ID
+    thread.archived = False
+    thread.applied_tags = []
+    thread.edit = AsyncMock(side_effect=lambda **kwargs: events.append("lock"))
+    return thread
+
+
+@pytest.fixture
+def owner():
+    return SimpleNamespace(id=OWNER_ID, name="owner", send=AsyncMock())
+
+
+@pytest.fixture
+def bot(bot, connection, events, thread, owner):
+    guild = SimpleNamespace(id=GUILD_ID)
+    thread.guild = guild
+    connection.results[CLOSE_TICKET_BY_OWNER.sql] = FakeRecord(
+        id=5, thread_id=THREAD_ID, owner_id=OWNER_ID, location_id=GUILD_ID, locked=False
+    )
+
+    bot.notifier = SimpleNamespace(target=("rodhaj", "origin"))
+    bot.ticket_index = TicketIndex(bot)
+    bot.counters = MagicMock()
+    bot.outbound = RecordingOutbound(events)
+    bot.forums = MagicMock()
+    bot.forums.get_metadata.return_value = None
+    bot.threads = MagicMock()
+    bot.threads.resolve = AsyncMock(return_value=thread)
+    bot.get_guild = MagicMock(return_value=guild)
+    bot.get_user = MagicMock(return_value=owner)
+    bot.fetch_user = AsyncMock()
+    bot.dispatch = MagicMock()
+    return bot
+
+
+@pytest.fixture
+def ctx(owner):
+    # Owners close their tickets by DMing the bot
+    return SimpleNamespace(
+        guild=None,
+        author=owner,
+        prefix="r>",
+        channel=MagicMock(id=200),
+        message=SimpleNamespace(add_reaction=AsyncMock()),
+        send=AsyncMock(),
+    )
+
+
+async def close(bot, ctx) -> None:
+    await Tickets.close.callback(Tickets(bot), ctx)  # type: ignore
+
+
+async def test_close(bot, ctx, connection, thread, owner, events):
+    await close(bot, ctx)
+
+    method, _, args = connection.calls[0]
+    assert (method, args) == ("fetchrow", (OWNER_ID, "rodhaj", "origin"))
+    assert OWNER_ID not in bot.ticket_index
+    assert bot.ticket_index.is_missing(OWNER_ID)
+    bot.counters.closed.assert_called_once_with(locked=False)
+
+    # The tick has to land before the thread is archived
+    assert events.index("reaction") < events.index("lock")
+    assert "dm" in events
+    thread.edit.assert_awaited_once()
+    assert thread.edit.await_args.kwargs["locked"] is True
+    owner.send.assert_awaited_once()
+    bot.dispatch.assert_called_once_with(
+        "ticket_close", thread.guild, owner, OWNER_ID, thread, None
+    )
+    bot.threads.invalidate.assert_called_once_with(THREAD_ID)
+
+
+async def test_close_without_ticket(bot, ctx, connection, events):
+    connection.results.clear()
+    await close(bot, ctx)
+
+    ctx.send.assert_awaited_once()
+    assert events == []
+
+
+async def test_close_when_owner_can_not_be_found(bot, ctx, thread, events):
+    bot.get_user.return_value = None
+    bot.fetch_user.side_effect = RuntimeError("unknown user")
+    await close(bot, ctx)
+
+    thread.edit.assert_awaited_once()
+    assert "dm" not in events
+    bot.metrics.closing.failures.labels.assert_called_with("owner")
+
+
+async def test_close_when_thread_can_not_be_found(bot, ctx, owner, events):
+    bot.threads.resolve.return_value = None
+    await close(bot, ctx)
+
+    owner.send.assert_awaited_once()
+    assert sorted(events) == ["dm", "reaction"]
+    bot.dispatch.assert_not_called()
+
+
+async def test_failed_stages_do_not_stop_the_others(bot, ctx, thread, owner):
+    owner.send.side_effect = RuntimeError("DMs closed")
+    await close(bot, ctx)
+
+    thread.edit.assert_awaited_once()
+    bot.metrics.closing.failures.labels.assert_called_with("notify")
@@ -0,0 +1,60 @@
+import pytest
+from utils.queries import CLOSE_TICKET_BY_OWNER, CLOSE_TICKET_BY_THREAD, CREATE_TICKET
+
+OWNER_ID = 1
+THREAD_ID = 100
+GUILD_ID = 10
+TARGET = ("rodhaj", "origin")
+
+
+@pytest.fixture
+async def ticket(database):
+    await database.execute("INSERT INTO guild_config (id) VALUES ($1);", GUILD_ID)
+    return await CREATE_TICKET.fetchrow(
+        database, THREAD_ID, OWNER_ID, GUILD_ID, *TARGET
+    )
+
+
+async def count_tickets(database) -> int:
+    return await database.fetchval("SELECT COUNT(*) FROM tickets;")
+
+
+async def test_close_by_owner(database, ticket):
+    row = await CLOSE_TICKET_BY_OWNER.fetchrow(database, OWNER_ID, *TARGET)
+
+    assert row is not None
+    assert (row["id"], row["thread_id"], row["location_id"]) == (
+        ticket["id"],
+        THREAD_ID,
+        GUILD_ID,
+    )
+    assert await count_tickets(database) == 0
+
+    # Closing it again finds nothing
+    assert await CLOSE_TICKET_BY_OWNER.fetchrow(database, OWNER_ID, *TARGET) is None
+
+
+async def test_close_by_thread(database, ticket):
+    row = await CLOSE_TICKET_BY_THREAD.fetchrow(database, THREAD_ID, GUILD_ID, *TARGET)
+
+    assert row is not None
+    assert row["owner_id"] == OWNER_ID
+    assert await count_tickets(database) == 0
+
+
+async def test_close_by_thread_of_another_guild(database, ticket):
+    row = await CLOSE_TICKET_BY_THREAD.fetchrow(
+        database, THREAD_ID, GUILD_ID + 1, *TARGET
+    )
+
+    assert row is None
+    assert await count_tickets(database) == 1
+
+
+async def test_close_returns_lock_state(database, ticket):
+    await database.execute(
+        "UPDATE tickets SET locked = TRUE WHERE id = $1;", ticket["id"]
+    )
+    row = await CLOSE_TICKET_BY_OWNER.fetchrow(database, OWNER_ID, *TARGET)
+
+    assert row is not None and row["locked"] is True
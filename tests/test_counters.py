@@ -0,0 +1,80 @@
+import pytest
+from utils.counters import TicketCounters
+from utils.queries import BLOCK_ENTITY, COUNT_TICKET_STATS, CREATE_TICKET
+
+from .conftest import FakeRecord
+
+
+def stats(active: int, locked: int, blocked: int) -> FakeRecord:
+    return FakeRecord(active=active, locked=locked, blocked=blocked)
+
+
+@pytest.fixture
+def counters(bot, connection) -> TicketCounters:
+    connection.results[COUNT_TICKET_STATS.sql] = stats(5, 2, 1)
+    return TicketCounters(bot)
+
+
+def counts(counters: TicketCounters) -> tuple[int, int, int]:
+    return counters.active, counters.locked, counters.blocked
+
+
+async def test_load(bot, counters):
+    await counters.load()
+
+    assert counts(counters) == (5, 2, 1)
+    bot.metrics.features.active_tickets.set.assert_called_with(5)
+    bot.metrics.features.locked_tickets.set.assert_called_with(2)
+    bot.metrics.features.blocked_users.set.assert_called_with(1)
+
+
+async def test_failed_load_is_raised(counters, connection):
+    connection.results[COUNT_TICKET_STATS.sql] = ConnectionError("gone")
+
+    with pytest.raises(ConnectionError):
+        await counters.load()
+
+
+async def test_incremental_updates(bot, counters):
+    await counters.load()
+
+    counters.opened()
+    assert counts(counters) == (6, 2, 1)
+
+    counters.closed(locked=True)
+    assert counts(counters) == (5, 1, 1)
+
+    counters.blocked_user(locked=1)
+    assert counts(counters) == (5, 2, 2)
+
+    counters.unblocked_user(unlocked=1)
+    assert counts(counters) == (5, 1, 1)
+    bot.metrics.features.locked_tickets.set.assert_called_with(1)
+
+
+def test_counts_never_go_negative(counters):
+    counters.closed(locked=True)
+    counters.unblocked_user(unlocked=3)
+
+    assert counts(counters) == (0, 0, 0)
+
+
+async def test_reconcile(counters, connection):
+    await counters.load()
+    counters.opened()
+
+    # Tickets closed by another process are picked up
+    connection.results[COUNT_TICKET_STATS.sql] = stats(3, 0, 1)
+    await counters.reconcile()
+    assert counts(counters) == (3, 0, 1)
+
+
+async def test_counts_match_database(bot, database):
+    await database.execute("INSERT INTO guild_config (id) VALUES (10);")
+    for owner_id in (1, 2, 3):
+        await CREATE_TICKET.fetchrow(database, owner_id * 100, owner_id, 10, "c", "o")
+    await BLOCK_ENTITY.execute(database, 10, 2)
+
+    counters = TicketCounters(bot)
+    await counters.load(database)
+    assert counts(counters) == (3, 1, 1)
@@ -0,0 +1,105 @@
+import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncpg
+import pytest
+from cogs.tickets import TicketIndex, Tickets, TicketThread
+from utils.queries import CREATE_TICKET
+
+from .conftest import FakeRecord
+
+OWNER_ID = 1
+THREAD_ID = 100
+GUILD_ID = 10
+TARGET = ("rodhaj", "origin")
+
+
+@pytest.fixture
+async def guild(database):
+    await database.execute("INSERT INTO guild_config (id) VALUES ($1);", GUILD_ID)
+    return GUILD_ID
+
+
+async def test_create_ticket_registers_owner(database, guild):
+    row = await CREATE_TICKET.fetchrow(database, THREAD_ID, OWNER_ID, guild, *TARGET)
+
+    assert row is not None
+    assert (row["thread_id"], row["owner_id"], row["location_id"]) == (
+        THREAD_ID,
+        OWNER_ID,
+        guild,
+    )
+    assert row["locked"] is False
+    assert await database.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM user_config WHERE id = $1);", OWNER_ID
+    )
+
+
+async def test_create_ticket_for_known_owner(database, guild):
+    await database.execute(
+        "INSERT INTO user_config (id, current_tickets) VALUES ($1, 3);", OWNER_ID
+    )
+    row = await CREATE_TICKET.fetchrow(database, THREAD_ID, OWNER_ID, guild, *TARGET)
+
+    assert row is not None
+    assert (
+        await database.fetchval(
+            "SELECT current_tickets FROM user_config WHERE id = $1;", OWNER_ID
+        )
+        == 3
+    )
+
+
+async def test_create_duplicate_ticket(database, guild):
+    await CREATE_TICKET.fetchrow(database, THREAD_ID, OWNER_ID, guild, *TARGET)
+
+    with pytest.raises(asyncpg.UniqueViolationError):
+        await CREATE_TICKET.fetchrow(database, THREAD_ID + 1, OWNER_ID, guild, *TARGET)
+
+
+@pytest.fixture
+def bot(bot, connection):
+    forum = SimpleNamespace(channel=MagicMock(), get_tags=lambda names: [])
+    forum.channel.create_thread = AsyncMock(
+        return_value=SimpleNamespace(thread=SimpleNamespace(id=THREAD_ID))
+    )
+    connection.results[CREATE_TICKET.sql] = FakeRecord(
+        id=5, thread_id=THREAD_ID, owner_id=OWNER_ID, location_id=GUILD_ID, locked=False
+    )
+
+    bot.notifier = SimpleNamespace(target=TARGET)
+    bot.ticket_index = TicketIndex(bot)
+    bot.counters = MagicMock()
+    bot.guild_configs = MagicMock()
+    bot.forums = MagicMock()
+    bot.forums.resolve = AsyncMock(return_value=forum)
+    return bot
+
+
+def make_ticket() -> TicketThread:
+    return TicketThread(
+        title="Help",
+        user=SimpleNamespace(  # type: ignore
+            id=OWNER_ID, display_name="owner", global_name="owner"
+        ),
+        location_id=GUILD_ID,
+        mention="@here",
+        content="Hello",
+        tags=[],
+        files=[],
+        created_at=datetime.datetime.now(datetime.timezone.utc),
+    )
+
+
+async def test_ticket_is_created_in_one_round_trip(bot, connection):
+    bot.ticket_index.mark_missing(OWNER_ID)
+    output = await Tickets(bot).create_ticket(make_ticket())
+
+    assert output is not None and output.status
+    assert [(method, args) for method, _, args in connection.calls] == [
+        ("fetchrow", (THREAD_ID, OWNER_ID, GUILD_ID, *TARGET))
+    ]
+    assert bot.ticket_index.get_by_thread(THREAD_ID).owner_id == OWNER_ID
+    assert not bot.ticket_index.is_missing(OWNER_ID)
+    bot.counters.opened.assert_called_once()
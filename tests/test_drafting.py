@@ -0,0 +1,127 @@
+import asyncio
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import rodhaj
+from cogs.tickets import MAX_DRAFT_LENGTH, DraftStore, PartialTicket, TicketIndex
+from rodhaj import Rodhaj
+
+from .conftest import FakeConnection, FakeOutbound, FakeRecord
+
+OWNER_ID = 1
+
+
+class YieldingConnection(FakeConnection):
+    # Lets other DMs run while a lookup is in flight, as an actual query would
+    async def fetchrow(self, sql: str, *args, timeout=None):
+        await asyncio.sleep(0)
+        return await super().fetchrow(sql, *args)
+
+
+@pytest.fixture
+def connection() -> YieldingConnection:
+    return YieldingConnection()
+
+
+@pytest.fixture
+def view(monkeypatch) -> MagicMock:
+    view = MagicMock()
+    monkeypatch.setattr(rodhaj, "TicketConfirmView", view)
+    return view
+
+
+@pytest.fixture
+def bot(bot, view):
+    bot.blocklist = set()
+    bot.get_context = AsyncMock(return_value=SimpleNamespace(command=None))
+    bot.ticket_index = TicketIndex(bot)
+    bot.drafts = DraftStore(bot)
+    bot.outbound = FakeOutbound()
+    bot.acknowledge_draft = partial(Rodhaj.acknowledge_draft, bot)
+    bot.get_cog = MagicMock()
+    bot.get_guild = MagicMock()
+    bot.transprogrammer_guild_id = 10
+    bot.threads = MagicMock()
+    bot.threads.resolve = AsyncMock()
+    bot.relay = MagicMock()
+    return bot
+
+
+@pytest.fixture
+def author():
+    return SimpleNamespace(id=OWNER_ID, bot=False, send=AsyncMock())
+
+
+def dm(author, content: str):
+    return SimpleNamespace(
+        author=author,
+        guild=None,
+        content=content,
+        attachments=[],
+        channel=SimpleNamespace(id=5),
+        add_reaction=AsyncMock(),
+    )
+
+
+async def on_message(bot, message) -> None:
+    await Rodhaj.on_message(bot, message)  # type: ignore
+
+
+async def test_concurrent_dms_prompt_once(bot, author, view):
+    first, second = dm(author, "hello"), dm(author, "world")
+    await asyncio.gather(on_message(bot, first), on_message(bot, second))
+
+    view.assert_called_once()
+    prompts = [call for call in author.send.await_args_list if "view" in call.kwargs]
+    assert len(prompts) == 1
+
+    # The other DM was added to the draft and acknowledged instead
+    session = bot.drafts.get(OWNER_ID)
+    assert session is not None and session.content == "hello\nworld"
+    assert first.add_reaction.await_count + second.add_reaction.await_count == 1
+
+
+async def test_full_drafts_are_reported(bot, author, view):
+    await on_message(bot, dm(author, "hello"))
+
+    follow_up = dm(author, "a" * MAX_DRAFT_LENGTH)
+    await on_message(bot, follow_up)
+
+    follow_up.add_reaction.assert_not_awaited()
+    assert "draft is full" in author.send.await_args.args[0]
+    view.assert_called_once()
+
+
+async def test_dms_during_confirmation_go_to_the_new_ticket(bot, author, view):
+    session, _ = bot.drafts.open(OWNER_ID)
+    bot.relay.submit.return_value = True
+
+    # Confirming holds the user's lock while the ticket is created
+    async with bot.drafts.lock(OWNER_ID):
+        task = asyncio.create_task(on_message(bot, dm(author, "are you there?")))
+        await asyncio.sleep(0.01)
+        assert not task.done()
+
+        bot.ticket_index.add(
+            PartialTicket(
+                FakeRecord(
+                    id=5, thread_id=100, owner_id=OWNER_ID, location_id=10, locked=False
+                )
+            )
+        )
+        bot.drafts.close(OWNER_ID, session, reason="confirmed")
+
+    await task
+    view.assert_not_called()
+    assert OWNER_ID not in bot.drafts
+    relayed = bot.relay.submit.call_args.args[0]
+    assert (relayed.ticket_id, relayed.content) == (5, "are you there?")
+
+
+async def test_locks_are_per_user(bot):
+    lock = bot.drafts.lock(OWNER_ID)
+
+    assert bot.drafts.lock(OWNER_ID) is lock
+    assert bot.drafts.lock(OWNER_ID + 1) is not lock
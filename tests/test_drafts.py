@@ -0,0 +1,141 @@
+import cogs.tickets
+import pytest
+from cogs.tickets import (
+    MAX_DRAFT_ATTACHMENTS,
+    MAX_DRAFT_LENGTH,
+    DraftSession,
+    DraftStore,
+)
+
+
+@pytest.fixture
+def drafts(bot, clock) -> DraftStore:
+    clock.install(cogs.tickets)
+    return DraftStore(bot, ttl=300.0, max_size=3)
+
+
+def closed(bot, reason: str) -> int:
+    return sum(
+        call.args == (reason,)
+        for call in bot.metrics.drafts.closed.labels.call_args_list
+    )
+
+
+def test_open(bot, drafts):
+    session, opened = drafts.open(1)
+    assert opened
+    assert drafts.get(1) is session
+    assert 1 in drafts and len(drafts) == 1
+
+    assert drafts.open(1) == (session, False)
+    bot.metrics.drafts.opened.inc.assert_called_once()
+    bot.metrics.drafts.active.set.assert_called_with(1)
+
+
+def test_drafts_expire(bot, drafts, clock):
+    session, _ = drafts.open(1)
+
+    clock.advance(300.0)
+    assert drafts.get(1) is session
+
+    clock.advance(0.1)
+    assert drafts.get(1) is None
+    assert closed(bot, "expired") == 1
+
+    # An expired draft is replaced by a new one
+    new_session, opened = drafts.open(1)
+    assert opened and new_session is not session
+
+
+def test_reopening_does_not_extend(drafts, clock):
+    session, _ = drafts.open(1)
+    clock.advance(200.0)
+    drafts.open(1)
+
+    clock.advance(100.1)
+    assert drafts.get(1) is None
+
+
+def test_extend(drafts, clock):
+    session, _ = drafts.open(1)
+    clock.advance(200.0)
+    drafts.extend(session)
+
+    clock.advance(200.0)
+    assert drafts.get(1) is session
+    assert session.expires_at == clock.now + 100.0
+
+
+def test_extended_drafts_expire_in_order(drafts, clock):
+    first, _ = drafts.open(1)
+    clock.advance(100.0)
+    second, _ = drafts.open(2)
+    clock.advance(100.0)
+    drafts.extend(first)
+
+    # The first draft now expires after the second one
+    clock.advance(200.1)
+    assert drafts.get(2) is None
+    assert drafts.get(1) is first
+
+
+def test_oldest_drafts_are_evicted(bot, drafts):
+    for owner_id in (1, 2, 3, 4):
+        drafts.open(owner_id)
+
+    assert 1 not in drafts
+    assert len(drafts) == 3
+    assert closed(bot, "evicted") == 1
+
+
+def test_close(bot, drafts):
+    drafts.open(1)
+    drafts.close(1, reason="confirmed")
+
+    assert 1 not in drafts
+    assert closed(bot, "confirmed") == 1
+
+    # Closing a draft that does not exist does nothing
+    drafts.close(1, reason="confirmed")
+    assert closed(bot, "confirmed") == 1
+
+
+def test_old_prompts_do_not_close_new_drafts(drafts, clock):
+    old, _ = drafts.open(1)
+    clock.advance(301.0)
+    new, _ = drafts.open(1)
+
+    drafts.close(1, old, reason="timeout")
+    drafts.extend(old)
+    assert drafts.get(1) is new
+    assert new.expires_at == clock.now + 300.0
+
+    drafts.close(1, new, reason="timeout")
+    assert 1 not in drafts
+
+
+def test_session_content():
+    session = DraftSession(1, 0.0)
+
+    assert session.append("hello", [])
+    assert session.append("world", ["a"])  # type: ignore
+    assert session.content == "hello\nworld"
+    assert session.attachments == ["a"]
+
+
+def test_session_limits():
+    # The first message is always taken, no matter how long it is
+    session = DraftSession(1, 0.0)
+    assert session.append("a" * (MAX_DRAFT_LENGTH + 10), [])
+    assert not session.append("b", [])
+
+    session = DraftSession(1, 0.0)
+    assert session.append("a", ["x"] * MAX_DRAFT_ATTACHMENTS)  # type: ignore
+    assert not session.append("b", ["y"])  # type: ignore
+    assert session.append("c", [])
+    assert session.content == "a\nc"
+
+    session = DraftSession(1, 0.0)
+    assert session.append("a" * (MAX_DRAFT_LENGTH - 2), [])
+    assert session.append("b", [])
+    assert not session.append("c", [])
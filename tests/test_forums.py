@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+from cogs.tickets import LOCKED_TAG, RESOLVED_TAG, ForumMetadataCache
+
+FORUM_ID = 100
+
+
+def make_forum(channel_id: int = FORUM_ID, *, guild_id: int = 1, tags=()):
+    forum = MagicMock(spec=discord.ForumChannel)
+    forum.id = channel_id
+    forum.guild = SimpleNamespace(id=guild_id)
+    forum.available_tags = [SimpleNamespace(name=name) for name in tags]
+    return forum
+
+
+@pytest.fixture
+def forum():
+    return make_forum(tags=["Question", "Serious", RESOLVED_TAG, LOCKED_TAG])
+
+
+@pytest.fixture
+def forums(bot, forum) -> ForumMetadataCache:
+    bot.get_channel = MagicMock(return_value=None)
+    bot.fetch_channel = AsyncMock(return_value=forum)
+    return ForumMetadataCache(bot)
+
+
+async def test_resolve(bot, forums, forum):
+    metadata = await forums.resolve(FORUM_ID)
+
+    assert metadata is not None and metadata.channel is forum
+    assert await forums.resolve(FORUM_ID) is metadata
+    bot.fetch_channel.assert_awaited_once_with(FORUM_ID)
+    assert FORUM_ID in forums and len(forums) == 1
+
+
+async def test_resolve_uses_the_channel_cache(bot, forums, forum):
+    bot.get_channel.return_value = forum
+
+    assert (await forums.resolve(FORUM_ID)).channel is forum
+    bot.fetch_channel.assert_not_awaited()
+
+
+async def test_resolve_other_channels(bot, forums):
+    bot.fetch_channel.return_value = MagicMock(spec=discord.TextChannel)
+
+    assert await forums.resolve(FORUM_ID) is None
+    assert FORUM_ID not in forums
+
+
+async def test_tags(forums):
+    metadata = await forums.resolve(FORUM_ID)
+
+    assert [
+        tag.name for tag in metadata.get_tags(["Serious", "Unknown", "Question"])
+    ] == [
+        "Serious",
+        "Question",
+    ]
+    assert metadata.resolved_tag.name == RESOLVED_TAG
+    assert metadata.locked_tag.name == LOCKED_TAG
+
+
+def test_missing_reserved_tags(forums):
+    metadata = forums.build(make_forum(tags=["Question"]))
+
+    assert metadata.resolved_tag is None
+    assert metadata.locked_tag is None
+
+
+def test_get_metadata(forums, forum):
+    metadata = forums.get_metadata(forum)
+
+    assert metadata is not None and forums.get(FORUM_ID) is metadata
+    assert forums.get_metadata(forum) is metadata
+    assert forums.get_metadata(MagicMock(spec=discord.TextChannel)) is None
+    assert forums.get_metadata(None) is None
+
+
+async def test_refresh(forums):
+    await forums.resolve(FORUM_ID)
+
+    forums.refresh(make_forum(tags=["Private"]))
+    assert list(forums.get(FORUM_ID).tags) == ["Private"]
+
+    # Only forums that have been resolved are kept
+    forums.refresh(make_forum(FORUM_ID + 1))
+    assert FORUM_ID + 1 not in forums
+
+
+async def test_refresh_drops_channels_that_are_no_longer_forums(forums):
+    await forums.resolve(FORUM_ID)
+
+    channel = MagicMock(spec=discord.TextChannel)
+    channel.id = FORUM_ID
+    forums.refresh(channel)
+    assert FORUM_ID not in forums
+
+
+def test_invalidate(forums):
+    forums.build(make_forum(1, guild_id=1))
+    forums.build(make_forum(2, guild_id=1))
+    forums.build(make_forum(3, guild_id=2))
+
+    forums.invalidate(3)
+    assert 3 not in forums
+
+    forums.build(make_forum(3, guild_id=2))
+    forums.invalidate_guild(1)
+    assert 1 not in forums and 2 not in forums
+    assert 3 in forums
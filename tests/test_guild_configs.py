@@ -0,0 +1,109 @@
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from cogs.config import GuildConfigStore, GuildSettings, PartialGuildSettings
+from utils.queries import GET_ALL_GUILD_CONFIGS, GET_GUILD_CONFIG
+
+from .conftest import FakeRecord
+
+
+def config_record(guild_id: int, **overrides) -> FakeRecord:
+    record = FakeRecord(
+        id=guild_id,
+        category_id=1,
+        ticket_channel_id=2,
+        logging_channel_id=3,
+        logging_broadcast_url="https://example.com/logging",
+        ticket_broadcast_url="https://example.com/ticket",
+        prefix=None,
+        account_age=datetime.timedelta(hours=2),
+        guild_age=datetime.timedelta(days=2),
+        settings=b"{}",
+    )
+    record.update(overrides)
+    return record
+
+
+@pytest.fixture
+def store(bot, connection) -> GuildConfigStore:
+    bot.webhooks = MagicMock()
+    bot.prefixes = MagicMock()
+    connection.results[GET_ALL_GUILD_CONFIGS.sql] = [
+        config_record(1, prefix=["!"]),
+        config_record(2, settings=b'{"anon_replies": true}'),
+    ]
+    return GuildConfigStore(bot)
+
+
+async def test_load(store):
+    await store.load()
+
+    assert len(store) == 2
+    assert 1 in store and 3 not in store
+    assert store.get(1).ticket_channel_id == 2
+    assert store.get_prefixes(1) == ["!"]
+    assert store.get_prefixes(2) == []
+    assert store.get_prefixes(3) == []
+
+
+async def test_settings(store):
+    await store.load()
+
+    assert store.get_partial_settings(2) == PartialGuildSettings(anon_replies=True)
+    assert store.get_settings(2) == GuildSettings(anon_replies=True)
+    assert store.get_settings(3) is None
+
+
+async def test_load_invalidates_derived_entries(bot, store, connection):
+    await store.load()
+    bot.webhooks.invalidate.reset_mock()
+
+    # Guild 1 left while the bot was down, so its entries have to be dropped too
+    connection.results[GET_ALL_GUILD_CONFIGS.sql] = [config_record(2)]
+    await store.load()
+
+    assert 1 not in store
+    invalidated = {call.args[0] for call in bot.webhooks.invalidate.call_args_list}
+    assert invalidated == {1, 2}
+
+
+async def test_failed_load_keeps_configs(store, connection):
+    await store.load()
+    connection.results[GET_ALL_GUILD_CONFIGS.sql] = ConnectionError("gone")
+
+    with pytest.raises(ConnectionError):
+        await store.load()
+    assert len(store) == 2
+
+
+async def test_update(bot, store):
+    await store.load()
+
+    config = store.update(1, prefix=["?"])
+    assert config is not None and store.get(1) is config
+    assert store.get_prefixes(1) == ["?"]
+    bot.prefixes.invalidate.assert_called_with(1)
+    bot.webhooks.invalidate.assert_called_with(1)
+
+    assert store.update(3, prefix=["?"]) is None
+
+
+async def test_remove(bot, store):
+    await store.load()
+    store.remove(1)
+
+    assert store.get(1) is None
+    bot.webhooks.invalidate.assert_called_with(1)
+
+
+async def test_refresh(store, connection):
+    await store.load()
+
+    connection.results[GET_GUILD_CONFIG.sql] = config_record(1, ticket_channel_id=4)
+    config = await store.refresh(1)
+    assert config is not None and store.get(1).ticket_channel_id == 4
+
+    connection.results[GET_GUILD_CONFIG.sql] = None
+    assert await store.refresh(1) is None
+    assert 1 not in store
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock
+
+import msgspec
+import pytest
+from cogs.config import GuildConfigStore, PartialGuildSettings
+
+GUILD_ID = 1
+
+
+@pytest.fixture
+def store(bot) -> GuildConfigStore:
+    bot.webhooks = MagicMock()
+    bot.prefixes = MagicMock()
+    return GuildConfigStore(bot)
+
+
+@pytest.fixture
+async def guild(database, store):
+    await database.execute(
+        "INSERT INTO guild_config (id, settings) VALUES ($1, $2);",
+        GUILD_ID,
+        {"mention": "@everyone", "anon_replies": True},
+    )
+    await store.refresh(GUILD_ID, database)
+    return GUILD_ID
+
+
+async def test_unknown_settings_are_rejected(store, connection):
+    with pytest.raises(ValueError, match="Unknown settings: other, unknown"):
+        await store.update_settings(GUILD_ID, {"unknown": True, "other": 1})
+    assert connection.calls == []
+
+
+async def test_update_merges_settings(database, store, guild):
+    settings = await store.update_settings(guild, {"anon_snippets": True}, database)
+
+    expected = PartialGuildSettings(
+        mention="@everyone", anon_replies=True, anon_snippets=True
+    )
+    assert settings == expected
+    assert store.get_partial_settings(guild) == expected
+
+    raw = await database.fetchval(
+        "SELECT settings FROM guild_config WHERE id = $1;", guild
+    )
+    assert msgspec.json.decode(raw, type=PartialGuildSettings) == expected
+
+
+async def test_updates_do_not_overwrite_each_other(database, store, guild):
+    # Another process changes a setting the store does not know about yet
+    await store.update_settings(guild, {"mention": "@here"}, database)
+    store.update(guild, settings=PartialGuildSettings())
+
+    settings = await store.update_settings(guild, {"anon_replies": False}, database)
+    assert settings == PartialGuildSettings(mention="@here", anon_replies=False)
+
+
+async def test_update_unknown_guild(database, store):
+    assert await store.update_settings(GUILD_ID, {"mention": "@here"}, database) is None
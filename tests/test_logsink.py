@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+from utils.logsink import MAX_EMBEDS, LogSink
+from utils.outbound import Priority
+
+from .conftest import FakeOutbound
+
+
+class FakeWebhooks:
+    def __init__(self):
+        self.webhooks: dict[int, SimpleNamespace] = {}
+
+    def add(self, guild_id: int, webhook_id: int) -> SimpleNamespace:
+        webhook = self.webhooks[guild_id] = SimpleNamespace(
+            id=webhook_id, send=AsyncMock()
+        )
+        return webhook
+
+    async def get_webhook(self, guild_id: int):
+        return self.webhooks.get(guild_id)
+
+
+@pytest.fixture
+def bot(bot):
+    bot.outbound = FakeOutbound()
+    bot.webhooks = FakeWebhooks()
+    return bot
+
+
+def sent_batches(webhook) -> list[list[discord.Embed]]:
+    return [call.kwargs["embeds"] for call in webhook.send.await_args_list]
+
+
+async def test_embeds_are_batched_per_guild(bot):
+    first = bot.webhooks.add(1, 10)
+    second = bot.webhooks.add(2, 20)
+    sink = LogSink(bot, window=0.01)
+
+    embeds = [discord.Embed(title=str(idx)) for idx in range(3)]
+    sink.submit(1, embeds[0])
+    sink.submit(2, embeds[1])
+    sink.submit(1, embeds[2])
+    first.send.assert_not_awaited()
+
+    await asyncio.sleep(0.05)
+    assert sent_batches(first) == [[embeds[0], embeds[2]]]
+    assert sent_batches(second) == [[embeds[1]]]
+    assert bot.outbound.routes == [
+        (("webhook", 10), Priority.LOW),
+        (("webhook", 20), Priority.LOW),
+    ]
+
+
+async def test_full_buffers_are_flushed_early(bot):
+    webhook = bot.webhooks.add(1, 10)
+    sink = LogSink(bot, window=60.0)
+
+    for idx in range(MAX_EMBEDS + 1):
+        sink.submit(1, discord.Embed(title=str(idx)))
+    await asyncio.sleep(0)
+
+    assert [len(batch) for batch in sent_batches(webhook)] == [MAX_EMBEDS]
+
+    await sink.flush()
+    assert [len(batch) for batch in sent_batches(webhook)] == [MAX_EMBEDS, 1]
+
+
+async def test_batches_stay_under_the_character_limit(bot):
+    webhook = bot.webhooks.add(1, 10)
+    sink = LogSink(bot, window=60.0)
+
+    for _ in range(3):
+        sink.submit(1, discord.Embed(description="a" * 2500))
+    sink.submit(1, discord.Embed(description="a" * 500))
+    await sink.flush()
+
+    assert [len(batch) for batch in sent_batches(webhook)] == [2, 2]
+
+
+async def test_guilds_without_webhook_are_dropped(bot):
+    sink = LogSink(bot, window=60.0)
+    sink.submit(1, discord.Embed(title="dropped"))
+    await sink.flush()
+
+    assert bot.outbound.routes == []
+
+
+async def test_failed_batches_do_not_stop_the_rest(bot):
+    webhook = bot.webhooks.add(1, 10)
+    response = SimpleNamespace(status=500, reason="")
+    webhook.send.side_effect = [discord.HTTPException(response, "error"), None]  # type: ignore
+    sink = LogSink(bot, window=60.0)
+
+    for _ in range(2):
+        sink.submit(1, discord.Embed(description="a" * 4000))
+    await sink.flush()
+
+    assert webhook.send.await_count == 2
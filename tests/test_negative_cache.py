@@ -0,0 +1,65 @@
+import cogs.tickets
+import pytest
+from cogs.tickets import TicketIndex, get_partial_ticket
+from utils.queries import GET_TICKET_BY_OWNER
+
+from .conftest import FakeRecord
+
+
+@pytest.fixture
+def index(bot, clock):
+    clock.install(cogs.tickets)
+    bot.ticket_index = TicketIndex(bot, max_missing=3, missing_ttl=30.0)
+    return bot.ticket_index
+
+
+def test_missing_expires_after_ttl(index, clock):
+    index.mark_missing(1)
+    assert index.is_missing(1)
+
+    clock.advance(30.0)
+    assert index.is_missing(1)
+
+    clock.advance(0.1)
+    assert not index.is_missing(1)
+    assert not index.is_missing(1)
+
+
+def test_missing_evicts_least_recent(index):
+    for owner_id in (1, 2, 3):
+        index.mark_missing(owner_id)
+
+    # Marking an owner again makes it the most recent
+    index.mark_missing(1)
+    index.mark_missing(4)
+
+    assert not index.is_missing(2)
+    assert all(index.is_missing(owner_id) for owner_id in (1, 3, 4))
+
+
+def test_adding_a_ticket_invalidates_missing(index):
+    index.mark_missing(1)
+    index.add(
+        cogs.tickets.PartialTicket(
+            FakeRecord(id=1, thread_id=100, owner_id=1, location_id=1, locked=False)
+        )
+    )
+
+    assert not index.is_missing(1)
+
+
+async def test_lookups_without_ticket_are_cached(bot, index, clock, connection):
+    assert (await get_partial_ticket(bot, 1)).id is None
+    assert (await get_partial_ticket(bot, 1)).id is None
+
+    assert len(connection.calls) == 1
+    bot.metrics.cache.negative_misses.inc.assert_called_once()
+    bot.metrics.cache.negative_hits.inc.assert_called_once()
+
+    # Once expired, the database is asked again and the new ticket is found
+    clock.advance(31.0)
+    connection.results[GET_TICKET_BY_OWNER.sql] = FakeRecord(
+        id=10, thread_id=100, owner_id=1, location_id=1, locked=False
+    )
+    assert (await get_partial_ticket(bot, 1)).id == 10
+    assert len(connection.calls) == 2
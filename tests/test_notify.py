@@ -0,0 +1,153 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncpg
+import msgspec
+import pytest
+from cogs.config import Blocklist
+from cogs.tickets import PartialTicket, TicketIndex
+from utils.notify import (
+    CHANNEL,
+    BlocklistChanged,
+    GuildConfigChanged,
+    InvalidationMessage,
+    InvalidationNotifier,
+    TicketChanged,
+)
+from utils.queries import NOTIFY
+
+from .conftest import FakeRecord
+
+OWNER_ID = 1
+THREAD_ID = 100
+
+
+@pytest.fixture
+def notifier(bot) -> InvalidationNotifier:
+    bot.blocklist = Blocklist(bot)
+    bot.ticket_index = TicketIndex(bot)
+    bot.ticket_index.add(
+        PartialTicket(
+            FakeRecord(
+                id=5,
+                thread_id=THREAD_ID,
+                owner_id=OWNER_ID,
+                location_id=1,
+                locked=False,
+            )
+        )
+    )
+    bot.threads = MagicMock()
+    bot.guild_configs = MagicMock()
+    bot.guild_configs.refresh = AsyncMock()
+    return InvalidationNotifier(bot, "postgresql://localhost/rodhaj")
+
+
+def notification(origin: str, event) -> str:
+    payload = msgspec.json.encode(InvalidationMessage(origin=origin, event=event))
+    return payload.decode()
+
+
+def test_blocklist_changes(bot, notifier):
+    notifier.apply(BlocklistChanged(guild_id=10, entity_id=OWNER_ID, blocked=True))
+    assert OWNER_ID in bot.blocklist
+    assert bot.ticket_index.get(OWNER_ID).locked is True
+
+    notifier.apply(BlocklistChanged(guild_id=10, entity_id=OWNER_ID, blocked=False))
+    assert OWNER_ID not in bot.blocklist
+    assert bot.ticket_index.get(OWNER_ID).locked is False
+
+
+def test_ticket_changes(bot, notifier):
+    bot.ticket_index.mark_missing(2)
+
+    notifier.apply(TicketChanged(owner_id=OWNER_ID))
+    notifier.apply(TicketChanged(owner_id=2))
+
+    assert OWNER_ID not in bot.ticket_index
+    bot.threads.invalidate.assert_called_once_with(THREAD_ID)
+    assert not bot.ticket_index.is_missing(2)
+
+
+async def test_guild_config_changes(bot, notifier):
+    notifier.apply(GuildConfigChanged(guild_id=10))
+    await asyncio.sleep(0)
+
+    bot.guild_configs.refresh.assert_awaited_once_with(10)
+
+
+def test_notifications_from_other_processes(bot, notifier):
+    notifier._on_notification(
+        None,  # type: ignore
+        0,
+        CHANNEL,
+        notification("other", BlocklistChanged(10, OWNER_ID, True)),
+    )
+
+    assert OWNER_ID in bot.blocklist
+
+
+def test_own_notifications_are_ignored(bot, notifier):
+    notifier._on_notification(
+        None,  # type: ignore
+        0,
+        CHANNEL,
+        notification(notifier.origin, BlocklistChanged(10, OWNER_ID, True)),
+    )
+
+    assert OWNER_ID not in bot.blocklist
+
+
+def test_malformed_notifications_are_ignored(bot, notifier):
+    notifier._on_notification(None, 0, CHANNEL, '{"origin": "other"}')  # type: ignore
+    notifier._on_notification(None, 0, CHANNEL, "not json")  # type: ignore
+
+    assert OWNER_ID in bot.ticket_index
+
+
+def test_ticket_events_built_in_sql_can_be_decoded(bot, notifier):
+    # Mirrors the json_build_object() call in the ticket statements
+    payload = '{"origin": "other", "event": {"type": "ticket", "owner_id": 1}}'
+    notifier._on_notification(None, 0, CHANNEL, payload)  # type: ignore
+
+    assert OWNER_ID not in bot.ticket_index
+
+
+async def test_publish(notifier, connection):
+    await notifier.publish(GuildConfigChanged(guild_id=10))
+
+    method, sql, (channel, payload) = connection.calls[0]
+    assert (method, sql, channel) == ("execute", NOTIFY.sql, CHANNEL)
+    message = msgspec.json.decode(payload, type=InvalidationMessage)
+    assert message == InvalidationMessage(notifier.origin, GuildConfigChanged(10))
+
+
+async def test_failed_publish_within_transaction_is_raised(notifier, connection):
+    connection.results[NOTIFY.sql] = asyncpg.PostgresError("aborted")
+
+    # Publishing through the pool is best effort
+    await notifier.publish(GuildConfigChanged(guild_id=10))
+
+    with pytest.raises(asyncpg.PostgresError):
+        await notifier.publish(GuildConfigChanged(guild_id=10), connection)
+
+
+async def test_notifications_are_delivered(bot, notifier, postgres_uri):
+    publisher = InvalidationNotifier(bot, postgres_uri)
+    received = asyncio.Event()
+
+    def on_notification(*args) -> None:
+        notifier._on_notification(*args)
+        received.set()
+
+    listener = await asyncpg.connect(postgres_uri)
+    connection = await asyncpg.connect(postgres_uri)
+    try:
+        await listener.add_listener(CHANNEL, on_notification)
+        await publisher.publish(TicketChanged(owner_id=OWNER_ID), connection)
+        await asyncio.wait_for(received.wait(), timeout=5)
+    finally:
+        await listener.close()
+        await connection.close()
+
+    assert OWNER_ID not in bot.ticket_index
@@ -0,0 +1,170 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+import utils.outbound
+from utils.outbound import OutboundDispatcher, Priority, TokenBucket
+
+
+@pytest.fixture
+def bucket(clock) -> TokenBucket:
+    clock.install(utils.outbound)
+    return TokenBucket(2, 1.0)
+
+
+@pytest.fixture
+async def dispatcher(bot, monkeypatch):
+    monkeypatch.setitem(utils.outbound.ROUTE_LIMITS, "slow", (1, 0.05))
+    dispatcher = OutboundDispatcher(bot, workers=1, max_retries=2)
+    yield dispatcher
+    await dispatcher.stop(timeout=1.0)
+
+
+def test_bucket_allows_bursts_up_to_its_limit(bucket):
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_bucket_refills_over_time(bucket, clock):
+    bucket.acquire()
+    bucket.acquire()
+
+    clock.advance(0.25)
+    assert bucket.acquire() == pytest.approx(0.25)
+    clock.advance(0.25)
+    assert bucket.acquire() == 0
+
+    # Tokens never go over the limit
+    clock.advance(10.0)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() > 0
+
+
+def test_blocked_bucket(bucket, clock):
+    bucket.block(3.0)
+    assert bucket.acquire() == pytest.approx(3.0)
+
+    # The route's limit has reset by the time the block is over
+    clock.advance(3.0)
+    assert bucket.acquire() == 0
+
+
+def test_buckets_are_per_route(bot):
+    dispatcher = OutboundDispatcher(bot)
+    webhook = dispatcher.get_bucket(("webhook", 1))
+
+    assert dispatcher.get_bucket(("webhook", 1)) is webhook
+    assert dispatcher.get_bucket(("webhook", 2)) is not webhook
+    assert (webhook.limit, webhook.per) == utils.outbound.ROUTE_LIMITS["webhook"]
+
+    unknown = dispatcher.get_bucket("unknown")
+    assert (unknown.limit, unknown.per) == utils.outbound.DEFAULT_ROUTE_LIMIT
+
+
+async def test_requests_are_served_by_priority(dispatcher):
+    sent: list[str] = []
+
+    def factory(name: str):
+        async def send() -> str:
+            sent.append(name)
+            return name
+
+        return send
+
+    requests = [
+        ("log-1", Priority.LOW),
+        ("reaction", Priority.NORMAL),
+        ("reply-1", Priority.HIGH),
+        ("log-2", Priority.LOW),
+        ("reply-2", Priority.HIGH),
+    ]
+    tasks = [
+        asyncio.create_task(
+            dispatcher.send(("webhook", idx), factory(name), priority=p)
+        )
+        for idx, (name, p) in enumerate(requests)
+    ]
+    # Everything is queued before the worker starts
+    await asyncio.sleep(0)
+    dispatcher.start()
+
+    assert await asyncio.gather(*tasks) == [name for name, _ in requests]
+    assert sent == ["reply-1", "reply-2", "reaction", "log-1", "log-2"]
+
+
+async def test_limited_routes_do_not_hold_up_others(dispatcher):
+    sent: list[str] = []
+
+    def factory(name: str):
+        async def send() -> None:
+            sent.append(name)
+
+        return send
+
+    dispatcher.start()
+    await asyncio.gather(
+        dispatcher.send(("slow", 1), factory("slow-1")),
+        dispatcher.send(("slow", 1), factory("slow-2")),
+        dispatcher.send(("webhook", 1), factory("webhook")),
+    )
+
+    assert sent == ["slow-1", "webhook", "slow-2"]
+
+
+async def test_rate_limited_requests_are_retried(bot, dispatcher):
+    attempts = 0
+
+    async def send() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise discord.RateLimited(0.01)
+        return "sent"
+
+    dispatcher.start()
+    assert await dispatcher.send(("slow", 1), send) == "sent"
+    assert attempts == 2
+    bot.metrics.outbound.retries.inc.assert_called_once()
+
+
+async def test_retries_are_limited(dispatcher):
+    attempts = 0
+
+    async def send() -> None:
+        nonlocal attempts
+        attempts += 1
+        raise discord.RateLimited(0.001)
+
+    dispatcher.start()
+    with pytest.raises(discord.RateLimited):
+        await dispatcher.send(("slow", 1), send)
+    assert attempts == 3
+
+
+async def test_other_errors_are_raised(dispatcher):
+    async def send() -> None:
+        raise ValueError("bad request")
+
+    dispatcher.start()
+    with pytest.raises(ValueError):
+        await dispatcher.send(("webhook", 1), send)
+
+
+@pytest.mark.parametrize(
+    ("status", "headers", "expected"),
+    [
+        (429, {"Retry-After": "2.5"}, 2.5),
+        (429, {"X-RateLimit-Reset-After": "1.5"}, 1.5),
+        (429, {"Retry-After": "soon"}, 1.0),
+        (429, {}, 1.0),
+        (500, {"Retry-After": "2.5"}, None),
+    ],
+)
+def test_retry_after_from_http_errors(bot, status, headers, expected):
+    response = SimpleNamespace(status=status, reason="", headers=headers)
+    error = discord.HTTPException(response, "error")  # type: ignore
+
+    assert OutboundDispatcher(bot)._retry_after(error) == expected
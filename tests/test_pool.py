@@ -0,0 +1,135 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from utils.pool import PoolSupervisor
+
+
+class FakePool:
+    def __init__(self, min_size: int = 2, max_size: int = 10):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.size = min_size
+        self.idle = min_size
+
+    def get_min_size(self) -> int:
+        return self.min_size
+
+    def get_max_size(self) -> int:
+        return self.max_size
+
+    def get_size(self) -> int:
+        return self.size
+
+    def get_idle_size(self) -> int:
+        return self.idle
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield object()
+
+
+@pytest.fixture
+def pool() -> FakePool:
+    return FakePool()
+
+
+async def test_fixed_limit(bot, pool):
+    supervisor = PoolSupervisor(bot, pool)  # type: ignore
+    assert supervisor.limit == pool.max_size
+
+    async with supervisor.acquire(), supervisor.acquire():
+        assert supervisor.in_use == 2
+    assert supervisor.in_use == 0
+    assert bot.metrics.pool.acquire_wait.labels.return_value.observe.call_count == 2
+
+
+async def test_adaptive_limit_is_enforced(bot, pool):
+    supervisor = PoolSupervisor(bot, pool, adaptive=True)  # type: ignore
+    assert supervisor.limit == pool.min_size
+
+    release = asyncio.Event()
+    acquired: list[int] = []
+
+    async def use(idx: int) -> None:
+        async with supervisor.acquire():
+            acquired.append(idx)
+            await release.wait()
+
+    tasks = [asyncio.create_task(use(idx)) for idx in range(3)]
+    await asyncio.sleep(0.01)
+    assert acquired == [0, 1]
+    assert supervisor.in_use == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert acquired == [0, 1, 2]
+    assert supervisor.in_use == 0
+
+
+async def test_growing_the_limit_wakes_waiters(bot, pool):
+    supervisor = PoolSupervisor(bot, pool, adaptive=True, step=2)  # type: ignore
+    release = asyncio.Event()
+    acquired: list[int] = []
+
+    async def use(idx: int) -> None:
+        async with supervisor.acquire():
+            acquired.append(idx)
+            await release.wait()
+
+    tasks = [asyncio.create_task(use(idx)) for idx in range(3)]
+    await asyncio.sleep(0.01)
+
+    supervisor._record_wait(1.0)
+    await supervisor._adjust(idle=0)
+    await asyncio.sleep(0.01)
+    assert supervisor.limit == 4
+    assert acquired == [0, 1, 2]
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.parametrize(
+    ("limit", "wait", "idle", "expected"),
+    [
+        # Acquisitions are waiting, so the limit grows up to the pool's size
+        (4, 0.1, 0, 6),
+        (9, 0.1, 0, 10),
+        # Connections sit idle, so it shrinks down to the pool's minimum size
+        (6, 0.0, 4, 4),
+        (3, 0.0, 4, 2),
+        # Neither waiting much, nor idle enough
+        (6, 0.01, 4, 6),
+        (6, 0.0, 3, 6),
+    ],
+)
+async def test_adjust(bot, pool, limit, wait, idle, expected):
+    supervisor = PoolSupervisor(bot, pool, adaptive=True, grow_wait=0.05, step=2)  # type: ignore
+    supervisor._limit = limit
+    supervisor._record_wait(wait)
+
+    await supervisor._adjust(idle)
+    assert supervisor.limit == expected
+
+
+async def test_waits_are_reset_after_adjusting(bot, pool):
+    supervisor = PoolSupervisor(bot, pool, adaptive=True)  # type: ignore
+    supervisor._record_wait(1.0)
+    await supervisor._adjust(idle=0)
+
+    # Nothing waited since, and nothing is idle
+    await supervisor._adjust(idle=0)
+    assert supervisor.limit == 4
+
+
+def test_sample(bot, pool):
+    pool.size = 8
+    pool.idle = 3
+    supervisor = PoolSupervisor(bot, pool)  # type: ignore
+
+    assert supervisor.sample() == 3
+    metrics = bot.metrics.pool
+    metrics.size.labels.return_value.set.assert_called_with(8)
+    metrics.in_use.labels.return_value.set.assert_called_with(5)
+    metrics.limit.labels.return_value.set.assert_called_with(10)
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+from utils.prefix import PrefixResolver, get_prefix
+
+
+class FakeGuildConfigs:
+    def __init__(self, prefixes: dict[int, list[str]]):
+        self.prefixes = prefixes
+        self.lookups = 0
+
+    def get_prefixes(self, guild_id: int) -> list[str]:
+        self.lookups += 1
+        return self.prefixes.get(guild_id, [])
+
+
+@pytest.fixture
+def bot(bot):
+    bot.user = SimpleNamespace(id=42)
+    bot.default_prefix = "r>"
+    bot.guild_configs = FakeGuildConfigs({1: ["!", "!!", "?"]})
+    bot.prefixes = PrefixResolver(bot)
+    return bot
+
+
+def message(guild_id, content: str):
+    guild = SimpleNamespace(id=guild_id) if guild_id is not None else None
+    return SimpleNamespace(guild=guild, content=content)
+
+
+def test_get_includes_base_and_guild_prefixes(bot):
+    assert bot.prefixes.get(1) == ["<@!42> ", "<@42> ", "r>", "!", "!!", "?"]
+    assert bot.prefixes.get(None) == ["<@!42> ", "<@42> ", "r>"]
+
+
+def test_get_is_cached_until_invalidated(bot):
+    bot.prefixes.get(1)
+    bot.prefixes.get(1)
+    assert bot.guild_configs.lookups == 1
+
+    bot.guild_configs.prefixes[1] = ["$"]
+    bot.prefixes.invalidate(1)
+    assert bot.prefixes.get(1)[-1] == "$"
+    assert bot.prefixes.match(1, "$help") == "$"
+    assert bot.prefixes.match(1, "!help") is None
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        ("!!help", "!!"),
+        ("!help", "!"),
+        ("?help", "?"),
+        ("r>help", "r>"),
+        ("<@42> help", "<@42> "),
+        ("<@!42> help", "<@!42> "),
+        ("help !", None),
+        ("hello", None),
+    ],
+)
+def test_match_prefers_longest_prefix(bot, content, expected):
+    assert bot.prefixes.match(1, content) == expected
+
+
+def test_match_escapes_prefixes(bot):
+    bot.guild_configs.prefixes[2] = [".*"]
+
+    assert bot.prefixes.match(2, ".*help") == ".*"
+    assert bot.prefixes.match(2, "help") is None
+
+
+def test_get_prefix(bot):
+    assert get_prefix(bot, message(1, "!!help")) == "!!"
+    assert get_prefix(bot, message(None, "!help")) == ["<@!42> ", "<@42> ", "r>"]
@@ -0,0 +1,133 @@
+import asyncpg
+import pytest
+from utils.queries import COUNT_TICKET_STATS, QueryCatalog, catalog, count_rows
+
+from .conftest import FakeConnection
+
+
+class FakeStatement:
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls: list[tuple[str, tuple]] = []
+
+    async def _run(self, method: str, args: tuple):
+        self.calls.append((method, args))
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    async def fetch(self, *args):
+        return await self._run("fetch", args)
+
+    async def fetchrow(self, *args):
+        return await self._run("fetchrow", args)
+
+    async def fetchval(self, *args):
+        return await self._run("fetchval", args)
+
+    def get_statusmsg(self) -> str:
+        return "UPDATE 2"
+
+
+class PreparingConnection(FakeConnection):
+    def __init__(self, failing: set[str] = frozenset()):
+        super().__init__()
+        self.failing = failing
+        self.statements: dict[str, FakeStatement] = {}
+
+    async def prepare(self, sql: str) -> FakeStatement:
+        if sql in self.failing:
+            raise asyncpg.UndefinedTableError("missing")
+        return FakeStatement()
+
+
+@pytest.fixture
+def queries() -> QueryCatalog:
+    return QueryCatalog()
+
+
+def test_register(queries):
+    query = queries.register("get_one", "SELECT 1;")
+
+    assert queries.get("get_one") is query
+    assert list(queries) == [query]
+    assert len(queries) == 1
+    with pytest.raises(ValueError, match="already registered"):
+        queries.register("get_one", "SELECT 2;")
+
+
+@pytest.mark.parametrize(
+    ("method", "result", "expected"),
+    [
+        ("fetch", [1, 2, 3], 3),
+        ("fetch", [], 0),
+        ("fetchrow", object(), 1),
+        ("fetchrow", None, 0),
+        ("fetchval", None, 0),
+        ("execute", "UPDATE 3", 3),
+        ("execute", "INSERT 0 1", 1),
+        ("execute", "CREATE TABLE", 0),
+    ],
+)
+def test_count_rows(method, result, expected):
+    assert count_rows(method, result) == expected
+
+
+async def test_prepare(queries):
+    queries.register("get_one", "SELECT 1;")
+    queries.register("broken", "SELECT * FROM missing;")
+    connection = PreparingConnection({"SELECT * FROM missing;"})
+
+    await queries.prepare(connection)  # type: ignore
+
+    assert set(connection.statements) == {"get_one"}
+
+
+async def test_prepared_statements_are_used(queries):
+    query = queries.register("get_one", "SELECT $1;")
+    connection = PreparingConnection()
+    statement = connection.statements["get_one"] = FakeStatement(result=1)
+
+    assert await query.fetchval(connection, 5) == 1
+    assert statement.calls == [("fetchval", (5,))]
+    assert connection.calls == []
+    assert query.calls == 1
+
+
+async def test_prepared_statements_report_their_status(queries):
+    query = queries.register("update", "UPDATE tickets SET locked = $1;")
+    connection = PreparingConnection()
+    statement = connection.statements["update"] = FakeStatement()
+
+    assert await query.execute(connection, True) == "UPDATE 2"
+    assert statement.calls == [("fetch", (True,))]
+
+
+async def test_invalidated_statements_fall_back(queries):
+    query = queries.register("get_one", "SELECT $1;")
+    connection = PreparingConnection()
+    connection.default = 2
+    connection.statements["get_one"] = FakeStatement(
+        error=asyncpg.InvalidCachedStatementError("schema changed")
+    )
+
+    assert await query.fetchval(connection, 5) == 2
+    assert connection.calls == [("fetchval", "SELECT $1;", (5,))]
+    assert "get_one" not in connection.statements
+
+
+async def test_unprepared_connections(queries, connection):
+    query = queries.register("get_one", "SELECT $1;")
+    connection.default = 1
+
+    assert await query.fetchval(connection, 5) == 1
+    assert connection.calls == [("fetchval", "SELECT $1;", (5,))]
+
+
+async def test_catalog_prepares_on_database(database):
+    # Every statement has to be valid against the migrated schema
+    assert set(database.statements) == {query.name for query in catalog}
+
+    row = await COUNT_TICKET_STATS.fetchrow(database)
+    assert row is not None and tuple(row) == (0, 0, 0)
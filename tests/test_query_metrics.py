@@ -0,0 +1,93 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import asyncpg
+import pytest
+import utils.queries
+from utils.queries import QueryCatalog
+
+from .conftest import FakeConnection
+
+
+class SlowConnection(FakeConnection):
+    def __init__(self, clock, elapsed: float):
+        super().__init__()
+        self.clock = clock
+        self.elapsed = elapsed
+
+    def _result(self, method: str, sql: str, args: tuple):
+        self.clock.advance(self.elapsed)
+        return super()._result(method, sql, args)
+
+
+@pytest.fixture
+def queries(clock) -> QueryCatalog:
+    clock.install(utils.queries)
+    queries = QueryCatalog()
+    queries.collector = MagicMock()
+    return queries
+
+
+@pytest.fixture
+def connection(clock) -> SlowConnection:
+    return SlowConnection(clock, 0.25)
+
+
+async def test_latency_and_rows(queries, connection):
+    query = queries.register("get_tickets", "SELECT * FROM tickets;")
+    connection.default = [1, 2, 3]
+
+    await query.fetch(connection)
+    await query.fetch(connection)
+
+    collector = queries.collector
+    collector.latency.labels.assert_called_with("get_tickets")
+    collector.latency.labels.return_value.observe.assert_called_with(0.25)
+    collector.rows.labels.return_value.observe.assert_called_with(3)
+    assert query.calls == 2
+    assert query.mean_time == pytest.approx(0.25)
+
+
+async def test_affected_rows(queries, connection):
+    query = queries.register("lock", "UPDATE tickets SET locked = TRUE;")
+    connection.default = "UPDATE 4"
+
+    await query.execute(connection)
+    queries.collector.rows.labels.return_value.observe.assert_called_once_with(4)
+
+
+async def test_errors(queries, connection):
+    query = queries.register("broken", "SELECT * FROM missing;")
+    connection.default = asyncpg.UndefinedTableError("missing")
+
+    with pytest.raises(asyncpg.UndefinedTableError):
+        await query.fetch(connection)
+
+    collector = queries.collector
+    collector.errors.labels.assert_called_once_with("broken", "UndefinedTableError")
+    collector.errors.labels.return_value.inc.assert_called_once()
+    collector.latency.labels.return_value.observe.assert_called_once_with(0.25)
+    collector.rows.labels.assert_not_called()
+    collector.timeouts.labels.assert_not_called()
+
+
+async def test_timeouts(queries, connection):
+    query = queries.register("slow", "SELECT pg_sleep(60);")
+    connection.default = asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await query.fetchval(connection)
+
+    collector = queries.collector
+    collector.timeouts.labels.assert_called_once_with("slow")
+    collector.errors.labels.assert_not_called()
+    assert query.calls == 1
+
+
+async def test_without_collector(queries, connection):
+    queries.collector = None
+    query = queries.register("get_one", "SELECT 1;")
+    connection.default = 1
+
+    assert await query.fetchval(connection) == 1
+    assert query.total_time == pytest.approx(0.25)
@@ -0,0 +1,203 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+from utils.relay import RelayMessage, RelayScheduler
+
+
+def make_message(ticket_id: int, content: str, *, author_id: int = 1, attachments=()):
+    return RelayMessage(
+        ticket_id=ticket_id,
+        thread=None,  # type: ignore
+        author=SimpleNamespace(id=author_id),  # type: ignore
+        content=content,
+        attachments=list(attachments),
+    )
+
+
+class Recorder:
+    def __init__(self):
+        self.relayed: list[RelayMessage] = []
+
+    async def __call__(self, message: RelayMessage) -> None:
+        self.relayed.append(message)
+
+    def contents(self, ticket_id: int) -> list[str]:
+        return [
+            message.content
+            for message in self.relayed
+            if message.ticket_id == ticket_id
+        ]
+
+
+@pytest.fixture
+def recorder() -> Recorder:
+    return Recorder()
+
+
+async def test_messages_of_a_ticket_stay_in_order(bot):
+    active: set[int] = set()
+    relayed: dict[int, list[str]] = {1: [], 2: [], 3: []}
+
+    async def handler(message: RelayMessage) -> None:
+        # A ticket must never be relayed by two workers at once
+        assert message.ticket_id not in active
+        active.add(message.ticket_id)
+        await asyncio.sleep(random.uniform(0, 0.002))
+        relayed[message.ticket_id].append(message.content)
+        active.discard(message.ticket_id)
+
+    scheduler = RelayScheduler(bot, handler, workers=4)
+    scheduler.start()
+    for idx in range(20):
+        for ticket_id in relayed:
+            assert scheduler.submit(make_message(ticket_id, str(idx)))
+    await scheduler.stop()
+
+    for contents in relayed.values():
+        assert contents == [str(idx) for idx in range(20)]
+    assert scheduler.pending == 0
+
+
+async def test_tickets_are_relayed_concurrently(bot, recorder):
+    blocked = asyncio.Event()
+
+    async def handler(message: RelayMessage) -> None:
+        if message.ticket_id == 1:
+            await blocked.wait()
+        await recorder(message)
+
+    scheduler = RelayScheduler(bot, handler, workers=2)
+    scheduler.start()
+    scheduler.submit(make_message(1, "slow"))
+    scheduler.submit(make_message(2, "fast"))
+
+    await asyncio.sleep(0.01)
+    assert recorder.contents(2) == ["fast"]
+    assert recorder.contents(1) == []
+
+    blocked.set()
+    await scheduler.stop()
+    assert recorder.contents(1) == ["slow"]
+
+
+async def test_backpressure(bot, recorder):
+    scheduler = RelayScheduler(bot, recorder, max_queue_size=2, max_pending=3)
+
+    assert scheduler.submit(make_message(1, "a"))
+    assert scheduler.submit(make_message(1, "b"))
+    assert not scheduler.submit(make_message(1, "c"))
+    assert scheduler.submit(make_message(2, "d"))
+    assert not scheduler.submit(make_message(3, "e"))
+
+    assert scheduler.pending == 3
+    assert bot.metrics.relay.rejected.inc.call_count == 2
+
+
+async def test_failed_relays_do_not_stop_workers(bot, recorder):
+    async def handler(message: RelayMessage) -> None:
+        if message.content == "fail":
+            raise RuntimeError(message.content)
+        await recorder(message)
+
+    scheduler = RelayScheduler(bot, handler, workers=1)
+    scheduler.start()
+    scheduler.submit(make_message(1, "fail"))
+    scheduler.submit(make_message(1, "ok"))
+    await scheduler.stop()
+
+    assert recorder.contents(1) == ["ok"]
+
+
+async def test_stop_waits_for_pending_relays(bot):
+    relayed: list[str] = []
+
+    async def handler(message: RelayMessage) -> None:
+        await asyncio.sleep(0.01)
+        relayed.append(message.content)
+
+    scheduler = RelayScheduler(bot, handler, workers=1)
+    scheduler.start()
+    scheduler.submit(make_message(1, "a"))
+    scheduler.submit(make_message(2, "b"))
+    await scheduler.stop()
+
+    assert relayed == ["a", "b"]
+
+
+async def relay_burst(scheduler: RelayScheduler, messages: list[RelayMessage]):
+    scheduler.start()
+    for message in messages:
+        assert scheduler.submit(message)
+    await scheduler.stop()
+
+
+async def test_bursts_are_coalesced(bot, recorder):
+    scheduler = RelayScheduler(bot, recorder, coalesce_window=0.01)
+    await relay_burst(
+        scheduler,
+        [
+            make_message(1, "a", attachments=["x"]),
+            make_message(1, ""),
+            make_message(1, "b", attachments=["y"]),
+        ],
+    )
+
+    assert len(recorder.relayed) == 1
+    assert recorder.relayed[0].content == "a\nb"
+    assert recorder.relayed[0].attachments == ["x", "y"]
+    bot.metrics.relay.coalesced.inc.assert_called_once_with(2)
+    assert scheduler.pending == 0
+
+
+async def test_coalescing_stops_at_another_author(bot, recorder):
+    scheduler = RelayScheduler(bot, recorder, coalesce_window=0.01)
+    await relay_burst(
+        scheduler,
+        [
+            make_message(1, "a"),
+            make_message(1, "b"),
+            make_message(1, "c", author_id=2),
+            make_message(1, "d"),
+        ],
+    )
+
+    assert recorder.contents(1) == ["a\nb", "c", "d"]
+
+
+async def test_coalescing_limits(bot, recorder):
+    scheduler = RelayScheduler(
+        bot,
+        recorder,
+        coalesce_window=0.01,
+        coalesce_max_messages=3,
+        coalesce_max_length=5,
+    )
+    await relay_burst(
+        scheduler,
+        [make_message(1, "a") for _ in range(4)] + [make_message(1, "long")],
+    )
+
+    # "a\na\na" fills up the messages, and "a\nlong" would be too long
+    assert recorder.contents(1) == ["a\na\na", "a", "long"]
+
+
+async def test_coalescing_respects_attachment_limit(bot, recorder):
+    scheduler = RelayScheduler(bot, recorder, coalesce_window=0.01)
+    await relay_burst(
+        scheduler,
+        [
+            make_message(1, "a", attachments=range(6)),
+            make_message(1, "b", attachments=range(5)),
+        ],
+    )
+
+    assert recorder.contents(1) == ["a", "b"]
+
+
+async def test_messages_are_not_coalesced_by_default(bot, recorder):
+    scheduler = RelayScheduler(bot, recorder)
+    await relay_burst(scheduler, [make_message(1, "a"), make_message(1, "b")])
+
+    assert recorder.contents(1) == ["a", "b"]
@@ -0,0 +1,164 @@
+import asyncio
+
+import asyncpg
+import pytest
+from utils.queries import (
+    GET_ALL_GUILD_CONFIGS,
+    GET_ALL_TICKETS,
+    GET_BLOCKLIST,
+    GET_GUILD_CONFIG,
+    GET_TICKET_BY_OWNER,
+    GET_TICKET_BY_THREAD,
+    QueryCatalog,
+    QueryKind,
+)
+from utils.replicas import Replica, ReplicaRouter, is_pinned, pin
+
+from .conftest import FakeConnection
+
+
+class FakePool(asyncpg.Pool):
+    """A pool that answers through a `FakeConnection`"""
+
+    def __init__(self, name: str, default=None):
+        self.name = name
+        self.connection = FakeConnection(default=default)
+
+    async def fetch(self, query: str, *args, timeout=None):
+        return await self.connection.fetch(query, *args)
+
+    async def fetchrow(self, query: str, *args, timeout=None, record_class=None):
+        return await self.connection.fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args, column=0, timeout=None):
+        return await self.connection.fetchval(query, *args)
+
+    async def execute(self, query: str, *args, timeout=None):
+        return await self.connection.execute(query, *args)
+
+    def __repr__(self) -> str:
+        return f"<FakePool name={self.name!r}>"
+
+
+def in_task(func, *args):
+    # Each command runs in its own task, so pinning does not leak between them
+    return asyncio.get_running_loop().create_task(func(*args))
+
+
+@pytest.fixture
+def primary() -> FakePool:
+    return FakePool("primary", default="primary")
+
+
+@pytest.fixture
+def replicas() -> list[Replica]:
+    replicas = [
+        Replica(f"replica-{idx}", FakePool(f"replica-{idx}", default=f"replica-{idx}"))
+        for idx in range(2)
+    ]
+    for replica in replicas:
+        replica.healthy = True
+    return replicas
+
+
+@pytest.fixture
+def router(bot, primary, replicas) -> ReplicaRouter:
+    return ReplicaRouter(bot, primary, replicas, max_lag=5.0)
+
+
+@pytest.fixture
+def queries(router) -> QueryCatalog:
+    queries = QueryCatalog()
+    queries.router = router
+    return queries
+
+
+async def test_reads_are_spread_over_healthy_replicas(router, primary, replicas):
+    assert [router.route(primary) for _ in range(4)] == replicas * 2
+
+    replicas[0].healthy = False
+    assert [router.route(primary) for _ in range(2)] == [replicas[1]] * 2
+
+    replicas[1].healthy = False
+    assert router.route(primary) is None
+
+
+async def test_reads_on_other_pools_are_not_routed(router, replicas):
+    assert router.route(replicas[0].pool) is None
+
+
+async def test_pinned_tasks_stay_on_the_primary(router, primary):
+    async def pinned():
+        pin()
+        return is_pinned(), router.route(primary)
+
+    assert await in_task(pinned) == (True, None)
+    assert not is_pinned()
+    assert router.route(primary) is not None
+
+
+@pytest.mark.parametrize(
+    ("lag", "healthy"), [(0, True), (None, True), (5.0, True), (5.5, False)]
+)
+async def test_lag_checks(router, replicas, lag, healthy):
+    replica = replicas[0]
+    replica.healthy = not healthy
+    replica.pool.connection.default = lag
+
+    await router.check(replica)
+    assert replica.healthy is healthy
+    assert replica.lag == float(lag or 0)
+
+
+async def test_unreachable_replicas_are_unhealthy(router, replicas):
+    replica = replicas[0]
+    replica.pool.connection.default = OSError("unreachable")
+
+    await router.check(replica)
+    assert not replica.healthy
+
+
+async def test_queries_are_routed_by_kind(queries, primary):
+    read = queries.register("read", "SELECT 1;", kind=QueryKind.READ)
+    cached = queries.register("cached", "SELECT 2;", kind=QueryKind.PRIMARY)
+
+    async def run():
+        return [await read.fetchval(primary), await cached.fetchval(primary)]
+
+    assert await in_task(run) == ["replica-0", "primary"]
+
+
+async def test_reads_after_writes_use_the_primary(queries, primary):
+    read = queries.register("read", "SELECT 1;", kind=QueryKind.READ)
+    write = queries.register("write", "UPDATE tickets SET locked = TRUE;")
+
+    async def run():
+        before = await read.fetchval(primary)
+        await write.execute(primary)
+        return [before, await read.fetchval(primary)]
+
+    assert await in_task(run) == ["replica-0", "primary"]
+
+
+async def test_failed_replicas_fall_back_to_the_primary(queries, primary, replicas):
+    read = queries.register("read", "SELECT 1;", kind=QueryKind.READ)
+    replicas[0].pool.connection.default = ConnectionResetError()
+
+    assert await in_task(read.fetchval, primary) == "primary"
+    assert not replicas[0].healthy
+    assert await in_task(read.fetchval, primary) == "replica-1"
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        GET_TICKET_BY_OWNER,
+        GET_TICKET_BY_THREAD,
+        GET_ALL_TICKETS,
+        GET_ALL_GUILD_CONFIGS,
+        GET_GUILD_CONFIG,
+        GET_BLOCKLIST,
+    ],
+)
+def test_cached_lookups_are_read_from_the_primary(query):
+    assert query.kind is QueryKind.PRIMARY
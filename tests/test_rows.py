@@ -0,0 +1,101 @@
+import datetime
+from typing import Optional
+
+import msgspec
+import pytest
+from cogs.config import (
+    BLOCKLIST_ROWS,
+    GUILD_CONFIG_ROWS,
+    BlocklistEntity,
+    GuildConfig,
+    PartialGuildSettings,
+)
+from utils.queries import BLOCK_ENTITY, GET_ALL_GUILD_CONFIGS, GET_BLOCKLIST
+from utils.rows import RowDecoder
+
+from .conftest import FakeRecord
+
+
+class Options(msgspec.Struct, frozen=True):
+    enabled: bool = False
+
+
+class Entry(msgspec.Struct, frozen=True):
+    id: int
+    name: str
+    options: Options = msgspec.field(default_factory=Options)
+    note: Optional[str] = None
+
+
+@pytest.fixture
+def decoder() -> RowDecoder[Entry]:
+    return RowDecoder(Entry)
+
+
+def test_decode(decoder):
+    record = FakeRecord(id=1, name="a", options=b'{"enabled": true}', note="b")
+
+    assert decoder.decode(record) == Entry(1, "a", Options(enabled=True), "b")
+
+
+def test_decode_from_memoryview(decoder):
+    # The jsonb codec hands over a view of the raw JSON
+    record = FakeRecord(id=1, name="a", options=memoryview(b'{"enabled": true}'))
+
+    assert decoder.decode(record).options == Options(enabled=True)
+
+
+def test_missing_trailing_columns_use_defaults(decoder):
+    assert decoder.decode(FakeRecord(id=1, name="a")) == Entry(1, "a")
+
+
+def test_columns_must_match_fields(decoder):
+    with pytest.raises(TypeError, match="do not match the fields of Entry"):
+        decoder.decode(FakeRecord(name="a", id=1))
+
+
+def test_decode_all(decoder):
+    records = [
+        FakeRecord(id=1, name="a", options=b"{}"),
+        FakeRecord(id=2, name="b", options=b'{"enabled": true}'),
+    ]
+
+    assert decoder.decode_all(records) == [
+        Entry(1, "a"),
+        Entry(2, "b", Options(enabled=True)),
+    ]
+    assert decoder.decode_all([]) == []
+    with pytest.raises(TypeError):
+        decoder.decode_all([FakeRecord(name="a", id=1)])
+
+
+async def test_decode_guild_configs_from_database(database):
+    await database.execute(
+        """
+        INSERT INTO guild_config (id, ticket_channel_id, prefix, settings)
+        VALUES (1, 2, '{"!"}', '{"anon_replies": true}');
+        """
+    )
+    rows = await GET_ALL_GUILD_CONFIGS.fetch(database)
+
+    assert GUILD_CONFIG_ROWS.decode_all(rows) == [
+        GuildConfig(
+            id=1,
+            category_id=None,  # type: ignore
+            ticket_channel_id=2,
+            logging_channel_id=None,  # type: ignore
+            logging_broadcast_url=None,  # type: ignore
+            ticket_broadcast_url=None,  # type: ignore
+            prefix=["!"],
+            account_age=datetime.timedelta(hours=2),
+            guild_age=datetime.timedelta(days=2),
+            settings=PartialGuildSettings(anon_replies=True),
+        )
+    ]
+
+
+async def test_decode_blocklist_from_database(database):
+    await BLOCK_ENTITY.execute(database, 1, 2)
+    rows = await GET_BLOCKLIST.fetch(database)
+
+    assert BLOCKLIST_ROWS.decode_all(rows) == [BlocklistEntity(guild_id=1, entity_id=2)]
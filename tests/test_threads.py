@@ -0,0 +1,135 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+from cogs.tickets import ThreadResolver, Tickets
+
+THREAD_ID = 100
+
+
+def make_thread(*, archived: bool = False, locked: bool = False):
+    thread = MagicMock(spec=discord.Thread)
+    thread.id = THREAD_ID
+    thread.archived = archived
+    thread.locked = locked
+    thread.applied_tags = []
+    thread.parent = None
+    return thread
+
+
+def http_error(cls, status: int):
+    return cls(SimpleNamespace(status=status, reason=""), "error")
+
+
+@pytest.fixture
+def guild():
+    guild = MagicMock()
+    guild.get_thread.return_value = None
+    guild.fetch_channel = AsyncMock()
+    return guild
+
+
+@pytest.fixture
+def threads(bot) -> ThreadResolver:
+    return ThreadResolver(bot)
+
+
+async def test_active_threads(threads, guild):
+    thread = guild.get_thread.return_value = make_thread()
+
+    assert await threads.resolve(guild, THREAD_ID) is thread
+    guild.get_thread.return_value = None
+    assert await threads.resolve(guild, THREAD_ID) is thread
+    guild.fetch_channel.assert_not_awaited()
+
+
+async def test_archived_threads_are_fetched_once(threads, guild):
+    thread = make_thread(archived=True)
+
+    async def fetch_channel(thread_id: int):
+        await asyncio.sleep(0.01)
+        return thread
+
+    guild.fetch_channel.side_effect = fetch_channel
+    resolved = await asyncio.gather(
+        *(threads.resolve(guild, THREAD_ID) for _ in range(3))
+    )
+
+    assert resolved == [thread] * 3
+    guild.fetch_channel.assert_awaited_once_with(THREAD_ID)
+    assert THREAD_ID in threads and len(threads) == 1
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        http_error(discord.NotFound, 404),
+        http_error(discord.HTTPException, 500),
+        MagicMock(spec=discord.TextChannel),
+    ],
+)
+async def test_missing_threads(threads, guild, result):
+    if isinstance(result, Exception):
+        guild.fetch_channel.side_effect = result
+    else:
+        guild.fetch_channel.return_value = result
+
+    assert await threads.resolve(guild, THREAD_ID) is None
+    assert THREAD_ID not in threads
+
+
+async def test_unarchive(threads, guild):
+    archived = guild.get_thread.return_value = make_thread(archived=True)
+    unarchived = make_thread()
+    archived.edit = AsyncMock(return_value=unarchived)
+
+    assert await threads.resolve(guild, THREAD_ID) is archived
+    assert await threads.resolve(guild, THREAD_ID, unarchive=True) is unarchived
+    archived.edit.assert_awaited_once_with(archived=False)
+    assert await threads.resolve(guild, THREAD_ID) is unarchived
+
+
+async def test_locked_threads_are_not_unarchived(threads, guild):
+    thread = guild.get_thread.return_value = make_thread(archived=True, locked=True)
+
+    assert await threads.resolve(guild, THREAD_ID, unarchive=True) is thread
+    thread.edit.assert_not_called()
+
+
+async def test_failing_to_unarchive(threads, guild):
+    thread = guild.get_thread.return_value = make_thread(archived=True)
+    thread.edit = AsyncMock(side_effect=http_error(discord.Forbidden, 403))
+
+    assert await threads.resolve(guild, THREAD_ID, unarchive=True) is thread
+
+
+async def test_refresh_and_invalidate(threads, guild):
+    guild.get_thread.return_value = make_thread()
+    await threads.resolve(guild, THREAD_ID)
+
+    updated = make_thread(archived=True)
+    threads.refresh(updated)
+    assert await threads.resolve(guild, THREAD_ID) is updated
+
+    threads.invalidate(THREAD_ID)
+    assert THREAD_ID not in threads
+
+    # Threads that were never resolved are not kept
+    threads.refresh(updated)
+    assert THREAD_ID not in threads
+
+
+async def test_closing_archived_threads_unarchives_them_first(bot):
+    bot.forums = MagicMock()
+    bot.forums.get_metadata.return_value = None
+    thread = make_thread(archived=True)
+    thread.edit = AsyncMock(return_value=thread)
+
+    await Tickets(bot).lock_ticket(thread)
+
+    first, second = thread.edit.await_args_list
+    assert first.kwargs["archived"] is False
+    assert second.kwargs["archived"] is True
+    assert second.kwargs["locked"] is True
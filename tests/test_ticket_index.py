@@ -0,0 +1,118 @@
+import pytest
+from cogs.tickets import PartialTicket, TicketIndex, get_partial_ticket
+from utils.queries import GET_ALL_TICKETS, GET_TICKET_BY_OWNER
+
+from .conftest import FakeRecord
+
+
+def make_ticket(owner_id: int, thread_id: int, *, locked: bool = False):
+    return PartialTicket(
+        FakeRecord(
+            id=owner_id * 10,
+            thread_id=thread_id,
+            owner_id=owner_id,
+            location_id=1,
+            locked=locked,
+        )
+    )
+
+
+@pytest.fixture
+def index(bot):
+    bot.ticket_index = TicketIndex(bot)
+    return bot.ticket_index
+
+
+def test_lookup_by_owner_and_thread(index):
+    ticket = make_ticket(1, 100)
+    index.add(ticket)
+
+    assert index.get(1) is ticket
+    assert index.get_by_thread(100) is ticket
+    assert 1 in index
+    assert len(index) == 1
+    assert index.get(2) is None
+    assert index.get_by_thread(200) is None
+
+
+def test_add_replaces_stale_thread(index):
+    index.add(make_ticket(1, 100))
+    ticket = make_ticket(1, 101)
+    index.add(ticket)
+
+    assert index.get(1) is ticket
+    assert index.get_by_thread(100) is None
+    assert index.get_by_thread(101) is ticket
+    assert len(index) == 1
+
+
+def test_remove(index):
+    ticket = make_ticket(1, 100)
+    index.add(ticket)
+
+    assert index.remove(1) is ticket
+    assert index.get(1) is None
+    assert index.get_by_thread(100) is None
+    assert index.remove(1) is None
+
+
+def test_set_locked(index):
+    index.add(make_ticket(1, 100))
+
+    index.set_locked(1, True)
+    assert index.get(1).locked is True
+
+    # Unknown owners are ignored
+    index.set_locked(2, True)
+    assert 2 not in index
+
+
+def test_replace_drops_previous_entries(index):
+    index.add(make_ticket(1, 100))
+    index.replace([make_ticket(2, 200), make_ticket(3, 300)])
+
+    assert 1 not in index
+    assert index.get_by_thread(100) is None
+    assert index.get_by_thread(300).owner_id == 3
+    assert len(index) == 2
+
+
+async def test_load(index, connection):
+    connection.results[GET_ALL_TICKETS.sql] = [
+        FakeRecord(id=1, thread_id=100, owner_id=1, location_id=1, locked=False),
+        FakeRecord(id=2, thread_id=200, owner_id=2, location_id=1, locked=True),
+    ]
+    await index.load()
+
+    assert len(index) == 2
+    assert index.get(2).locked is True
+
+
+async def test_failed_load_keeps_index(index, connection):
+    index.add(make_ticket(1, 100))
+    connection.results[GET_ALL_TICKETS.sql] = ConnectionError("gone")
+
+    with pytest.raises(ConnectionError):
+        await index.load()
+    assert index.get(1) is not None
+
+
+async def test_partial_ticket_served_from_index(bot, index, connection):
+    ticket = make_ticket(1, 100)
+    index.add(ticket)
+
+    assert await get_partial_ticket(bot, 1) is ticket
+    assert connection.calls == []
+
+
+async def test_partial_ticket_indexed_after_lookup(bot, index, connection):
+    connection.results[GET_TICKET_BY_OWNER.sql] = FakeRecord(
+        id=10, thread_id=100, owner_id=1, location_id=1, locked=False
+    )
+
+    ticket = await get_partial_ticket(bot, 1)
+    assert ticket.thread_id == 100
+    assert index.get_by_thread(100) is ticket
+
+    await get_partial_ticket(bot, 1)
+    assert len(connection.calls) == 1
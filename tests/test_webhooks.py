@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+from cogs.config import GuildConfig, GuildConfigStore, WebhookPurpose, WebhookRegistry
+
+TOKEN = "a" * 68
+LOGGING_ID = 100000000000000001
+TICKET_ID = 100000000000000002
+
+
+def make_config(
+    guild_id: int, *, logging_id: int = LOGGING_ID, ticket_id: int = TICKET_ID
+):
+    return GuildConfig(
+        id=guild_id,
+        category_id=10,
+        ticket_channel_id=20,
+        logging_channel_id=30,
+        logging_broadcast_url=f"https://discord.com/api/webhooks/{logging_id}/{TOKEN}",
+        ticket_broadcast_url=f"https://discord.com/api/webhooks/{ticket_id}/{TOKEN}",
+    )
+
+
+@pytest.fixture
+async def bot(bot):
+    async with aiohttp.ClientSession() as session:
+        bot.session = session
+        bot.prefixes = MagicMock()
+        bot.guild_configs = GuildConfigStore(bot)
+        bot.webhooks = WebhookRegistry(bot)
+        yield bot
+
+
+async def test_webhooks_are_built_per_purpose(bot):
+    bot.guild_configs._replace(1, make_config(1))
+
+    logging = await bot.webhooks.get_webhook(1)
+    ticket = await bot.webhooks.get_ticket_webhook(1)
+
+    assert logging is not None and logging.id == LOGGING_ID
+    assert ticket is not None and ticket.id == TICKET_ID
+    assert logging.session is bot.session
+
+
+async def test_webhooks_are_reused(bot):
+    bot.guild_configs._replace(1, make_config(1))
+
+    webhook = await bot.webhooks.get(1, WebhookPurpose.TICKET)
+    assert await bot.webhooks.get(1, WebhookPurpose.TICKET) is webhook
+
+
+async def test_config_changes_rebuild_webhooks(bot):
+    bot.guild_configs._replace(1, make_config(1))
+    await bot.webhooks.get_ticket_webhook(1)
+
+    bot.guild_configs._replace(1, make_config(1, ticket_id=TICKET_ID + 1))
+    webhook = await bot.webhooks.get_ticket_webhook(1)
+    assert webhook is not None and webhook.id == TICKET_ID + 1
+
+    bot.guild_configs.remove(1)
+    assert await bot.webhooks.get_ticket_webhook(1) is None
+
+
+async def test_unknown_guild_has_no_webhooks(bot):
+    assert await bot.webhooks.get_webhook(1) is None